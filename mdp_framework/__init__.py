@@ -0,0 +1,61 @@
+# mdp_framework/__init__.py
+
+"""
+MDPFramework: Erzeugen, Speichern und Lösen von zufälligen MDPs (diskret und stetig).
+
+Die Top-Level-Namen werden erst beim ersten Zugriff importiert (PEP 562), damit
+"import mdp_framework" und die CLI-Skripte schnell starten; schwere Abhängigkeiten
+(matplotlib, networkx, scipy) werden nur in den Funktionen geladen, die sie brauchen.
+"""
+
+import importlib
+
+__version__ = "0.1.0"
+
+# Öffentlicher Name -> Modul, aus dem er stammt
+_LAZY_EXPORTS = {
+    "DiscreteMDP": "mdp_framework.core.discrete",
+    "ContinuousMDP": "mdp_framework.core.continuous",
+    "SparseTransitions": "mdp_framework.core.sparse",
+    "VectorDiscreteMDP": "mdp_framework.core.vector",
+    "VectorContinuousMDP": "mdp_framework.core.vector",
+    "SharedDiscreteMDP": "mdp_framework.core.shared",
+    "EnvPool": "mdp_framework.core.pool",
+    "random_discrete_mdp": "mdp_framework.generators.discrete_generator",
+    "random_continuous_mdp": "mdp_framework.generators.continuous_generator",
+    "random_sparse_discrete_mdp": "mdp_framework.generators.structured_generator",
+    "grid_world_mdp": "mdp_framework.generators.structured_generator",
+    "chain_mdp": "mdp_framework.generators.structured_generator",
+    "block_mdp": "mdp_framework.generators.structured_generator",
+    "save_mdp_to_json": "mdp_framework.io.json_io",
+    "load_mdp_from_json": "mdp_framework.io.json_io",
+    "save_mdp_to_pickle": "mdp_framework.io.pickle_io",
+    "load_mdp_from_pickle": "mdp_framework.io.pickle_io",
+    "save_mdp_to_binary": "mdp_framework.io.binary_io",
+    "load_mdp_from_binary": "mdp_framework.io.binary_io",
+    "value_iteration": "mdp_framework.solvers.dynamic_programming",
+    "policy_iteration": "mdp_framework.solvers.dynamic_programming",
+    "modified_policy_iteration": "mdp_framework.solvers.dynamic_programming",
+    "evaluate_policy": "mdp_framework.solvers.evaluation",
+    "IncrementalSolver": "mdp_framework.solvers.incremental",
+    "SolutionCache": "mdp_framework.solvers.cache",
+    "cached_solve": "mdp_framework.solvers.cache",
+    "rollout": "mdp_framework.utils.rollout",
+    "estimate_returns": "mdp_framework.utils.monte_carlo",
+    "GridDiscretizer": "mdp_framework.utils.discretizer",
+    "set_global_seed": "mdp_framework.config",
+}
+
+__all__ = sorted(_LAZY_EXPORTS)
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    # Im Modul-Namespace ablegen, damit weitere Zugriffe __getattr__ nicht mehr aufrufen
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
@@ -8,6 +8,10 @@ DATA_ROOT = os.path.abspath(
 )
 DISCRETE_DATA_PATH = os.path.join(DATA_ROOT, "discrete")
 CONTINUOUS_DATA_PATH = os.path.join(DATA_ROOT, "continuous")
+# Plattenstufe des Lösungs-Caches (siehe mdp_framework.solvers.cache)
+CACHE_PATH = os.path.join(DATA_ROOT, "cache")
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+CACHE_MEMORY_ENTRIES = 32
 
 # Standard-Parameter für MDP-Erzeugung
 DEFAULT_N_STATES = 5
@@ -21,12 +25,15 @@ GLOBAL_RANDOM_SEED = None
 
 def set_global_seed(seed):
     """
-    Setzt den globalen Zufallsseed für numpy.
+    Setzt den globalen Zufallsseed für numpy (Legacy-np.random und den globalen
+    Generator, den alle MDPs, Dynamiken und Generatoren ohne eigenes rng verwenden).
     """
     global GLOBAL_RANDOM_SEED
     GLOBAL_RANDOM_SEED = seed
     import numpy as np
+    from mdp_framework.utils.sampling import seed_global_rng
     np.random.seed(seed)
+    seed_global_rng(seed)
 
 # Mini-Test
 if __name__ == "__main__":
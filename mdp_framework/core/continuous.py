@@ -1,29 +1,147 @@
 # mdp_framework/core/continuous.py
 
+import importlib
 import numpy as np
 from .base import BaseMDP
+from mdp_framework.utils.sampling import get_rng
+
+# Serialisierbare Dynamik-/Reward-Klassen: Name ("kind") -> Klasse oder "modul:Klasse"
+# (eingebaute Klassen werden erst beim Laden importiert). Eigene Klassen werden mit
+# @register_function("name") eingetragen und brauchen to_dict() (Parameter, Arrays als numpy-Arrays)
+# und from_dict(data, rng).
+FUNCTION_REGISTRY = {
+    "random_linear_dynamics": "mdp_framework.generators.continuous_generator:RandomLinearDynamics",
+    "random_linear_reward": "mdp_framework.generators.continuous_generator:RandomRewardFunction",
+}
+
+def register_function(kind):
+    """
+    Klassendekorator: trägt eine Dynamik-/Reward-Klasse unter kind in FUNCTION_REGISTRY ein.
+    """
+    def decorator(cls):
+        cls.kind = kind
+        FUNCTION_REGISTRY[kind] = cls
+        return cls
+    return decorator
+
+def _registered_class(kind):
+    entry = FUNCTION_REGISTRY.get(kind)
+    if entry is None:
+        raise ValueError(f"Unbekannte Funktion: {kind!r} (registriert: {sorted(FUNCTION_REGISTRY)})")
+    if isinstance(entry, str):
+        module_name, class_name = entry.split(":")
+        entry = getattr(importlib.import_module(module_name), class_name)
+    return entry
+
+def is_serializable(func):
+    """
+    True, wenn func eine registrierte Klasse ist und als Parameter gespeichert werden kann.
+    """
+    kind = getattr(func, "kind", None)
+    return kind in FUNCTION_REGISTRY and hasattr(func, "to_dict")
+
+def function_to_dict(func):
+    """
+    Parameter einer registrierten Funktion als dict {"kind", ...} (Arrays als numpy-Arrays).
+    """
+    if not is_serializable(func):
+        raise TypeError(f"{type(func).__name__} ist nicht als serialisierbare Funktion registriert.")
+    return dict(func.to_dict(), kind=func.kind)
+
+def function_from_dict(params, rng=None):
+    """
+    Erzeugt eine registrierte Funktion aus ihren Parametern (Listen oder Arrays).
+    """
+    params = dict(params)
+    return _registered_class(params.pop("kind")).from_dict(params, rng=rng)
 
 class ContinuousMDP(BaseMDP):
     """
     Stetiges MDP mit kontinuierlichem Zustands- und Aktionsraum.
     Die Dynamik und die Reward-Funktion werden als Funktionen übergeben.
+
+    Gebündeltes Protokoll: Funktionen mit Attribut batched = True akzeptieren zusätzlich
+    Arrays (N, state_dim) und (N, action_dim) und liefern (N, state_dim) bzw. (N,).
+    Eine optionale fusionierte Funktion dynamics_and_reward(states, actions) liefert
+    (next_states, rewards) in einem Durchgang (ebenfalls für einzelne und gebündelte Eingaben).
     """
 
-    def __init__(self, state_dim, action_dim, dynamics_func, reward_func, gamma):
+    def __init__(self, state_dim, action_dim, dynamics_func, reward_func, gamma, rng=None,
+                 dynamics_and_reward=None):
         """
         state_dim: Dimensionalität des Zustandsraums
         action_dim: Dimensionalität des Aktionsraums
         dynamics_func: Funktion (state, action) -> next_state
         reward_func: Funktion (state, action) -> reward
         gamma: Diskontierungsfaktor
+        rng: Seed oder np.random.Generator für reset/sample_* (None = globaler Generator)
+        dynamics_and_reward: Optional, fusionierte Funktion (states, actions) -> (next_states, rewards);
+            ohne Angabe wird dynamics_func.fuse_with(reward_func) verwendet, falls vorhanden
         """
         self.state_dim = int(state_dim)
         self.action_dim = int(action_dim)
         self.dynamics_func = dynamics_func
         self.reward_func = reward_func
+        if dynamics_and_reward is not None:
+            self.dynamics_and_reward = dynamics_and_reward
         self.gamma = float(gamma)
+        self.rng = get_rng(rng)
         self.state = self.reset()
 
+    # Die fusionierte Funktion ist abgeleiteter Zustand: Sie wird bei Bedarf aus
+    # dynamics_func.fuse_with(reward_func) gebildet und verworfen, sobald dynamics_func oder
+    # reward_func neu gesetzt werden (auch eine explizit gesetzte fusionierte Funktion).
+    _UNSET = object()
+
+    @property
+    def dynamics_func(self):
+        return self._dynamics_func
+
+    @dynamics_func.setter
+    def dynamics_func(self, value):
+        self._dynamics_func = value
+        self._dynamics_and_reward = ContinuousMDP._UNSET
+
+    @property
+    def reward_func(self):
+        return self._reward_func
+
+    @reward_func.setter
+    def reward_func(self, value):
+        self._reward_func = value
+        self._dynamics_and_reward = ContinuousMDP._UNSET
+
+    @property
+    def dynamics_and_reward(self):
+        """
+        Fusionierte Funktion (states, actions) -> (next_states, rewards) oder None.
+        Zuweisen von None schaltet die Fusion ab, bis dynamics_func/reward_func neu gesetzt werden.
+        """
+        if self._dynamics_and_reward is ContinuousMDP._UNSET:
+            fuse_with = getattr(self._dynamics_func, "fuse_with", None)
+            self._dynamics_and_reward = None if fuse_with is None else fuse_with(self._reward_func)
+        return self._dynamics_and_reward
+
+    @dynamics_and_reward.setter
+    def dynamics_and_reward(self, value):
+        self._dynamics_and_reward = value
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if state.get("_dynamics_and_reward") is ContinuousMDP._UNSET:
+            state["_dynamics_and_reward"] = None
+            state["_fusion_unset"] = True
+        return state
+
+    def __setstate__(self, state):
+        # Ältere Pickles speichern die Funktionen ohne führenden Unterstrich
+        for name in ("dynamics_func", "reward_func", "dynamics_and_reward"):
+            if name in state:
+                state["_" + name] = state.pop(name)
+        if state.pop("_fusion_unset", False) or "_dynamics_and_reward" not in state:
+            state["_dynamics_and_reward"] = ContinuousMDP._UNSET
+        self.__dict__.update(state)
+
     def reset(self):
         """
         Setzt das MDP auf einen zufälligen Startzustand zurück.
@@ -35,40 +153,93 @@ class ContinuousMDP(BaseMDP):
         """
         Führt die Aktion aus, gibt (nächster Zustand, Reward) zurück.
         """
-        next_state = self.dynamics_func(self.state, action)
-        reward = self.reward_func(self.state, action)
+        if self.dynamics_and_reward is not None:
+            next_state, reward = self.dynamics_and_reward(self.state, action)
+        else:
+            next_state = self.dynamics_func(self.state, action)
+            reward = self.reward_func(self.state, action)
         self.state = next_state
         return next_state, reward
 
+    def evaluate_batch(self, states, actions):
+        """
+        Berechnet (Folgezustände (N, state_dim), Rewards (N,)) für N Zustands-Aktions-Paare,
+        ohne den internen Zustand zu verändern. Nutzt die fusionierte bzw. gebündelte
+        Variante, falls vorhanden, sonst einen Aufruf pro Zeile.
+        """
+        states = np.asarray(states, dtype=np.float64)
+        actions = np.asarray(actions, dtype=np.float64)
+        if self.dynamics_and_reward is not None:
+            next_states, rewards = self.dynamics_and_reward(states, actions)
+        else:
+            next_states = apply_batched(self.dynamics_func, states, actions)
+            rewards = apply_batched(self.reward_func, states, actions)
+        return np.asarray(next_states, dtype=np.float64), np.asarray(rewards, dtype=np.float64)
+
     def sample_state(self):
         """
         Gibt einen zufälligen Zustand zurück (hier: uniform im Intervall [-1, 1]).
         """
-        return np.random.uniform(-1, 1, size=self.state_dim)
+        return self.rng.uniform(-1, 1, size=self.state_dim)
 
     def sample_action(self):
         """
         Gibt eine zufällige Aktion zurück (hier: uniform im Intervall [-1, 1]).
         """
-        return np.random.uniform(-1, 1, size=self.action_dim)
+        return self.rng.uniform(-1, 1, size=self.action_dim)
+
+    @property
+    def is_serializable(self):
+        """
+        True, wenn Dynamik und Reward registrierte Funktionen sind (siehe FUNCTION_REGISTRY).
+        """
+        return is_serializable(self.dynamics_func) and is_serializable(self.reward_func)
 
     def to_dict(self):
         """
         Gibt eine serialisierbare Repräsentation zurück.
-        Die Funktionsobjekte werden nicht serialisiert!
+        Registrierte Funktionen (z.B. RandomLinearDynamics) werden über ihre Parameter
+        gespeichert, beliebige andere Funktionsobjekte nicht (dynamics/reward = None).
         """
+        def params(func):
+            if not is_serializable(func):
+                return None
+            return {key: value.tolist() if isinstance(value, np.ndarray) else value
+                    for key, value in function_to_dict(func).items()}
         return {
             "type": "continuous",
             "state_dim": self.state_dim,
             "action_dim": self.action_dim,
             "gamma": self.gamma,
             "has_dynamics_func": self.dynamics_func is not None,
-            "has_reward_func": self.reward_func is not None
+            "has_reward_func": self.reward_func is not None,
+            "dynamics": params(self.dynamics_func),
+            "reward": params(self.reward_func)
         }
 
     @classmethod
-    def from_dict(cls, data):
+    def from_dict(cls, data, rng=None):
         """
-        Kann nicht sinnvoll die Funktionen rekonstruieren.
+        Erzeugt eine MDP-Instanz aus serialisierten Daten; Dynamik und Reward werden über
+        FUNCTION_REGISTRY rekonstruiert (die Fusion ergibt sich wie im Konstruktor).
         """
-        raise NotImplementedError("Funktionen können nicht automatisch aus dict rekonstruiert werden. Bitte init mit eigenen Funktionen verwenden.")
+        if not data.get("dynamics") or not data.get("reward"):
+            raise NotImplementedError("Funktionen können nicht automatisch aus dict rekonstruiert werden. Bitte init mit eigenen Funktionen verwenden.")
+        rng = get_rng(rng)
+        return cls(
+            state_dim=data["state_dim"],
+            action_dim=data["action_dim"],
+            dynamics_func=function_from_dict(data["dynamics"], rng=rng),
+            reward_func=function_from_dict(data["reward"], rng=rng),
+            gamma=data["gamma"],
+            rng=rng
+        )
+
+def apply_batched(func, states, actions):
+    """
+    Ruft func einmal mit (N, dim)-Arrays auf, falls es das gebündelte Protokoll
+    unterstützt (batched = True), sonst zeilenweise.
+    """
+    if getattr(func, "batched", False):
+        return func(states, actions)
+    return np.array([func(s, a) for s, a in zip(states, actions)])
@@ -2,30 +2,185 @@
 
 import numpy as np
 from .base import BaseMDP
+from .sparse import SparseTransitions
+from mdp_framework.utils.sampling import CategoricalTable, get_rng, sampling_table_for
+from mdp_framework.utils.validators import validate_discrete_mdp
 
 class DiscreteMDP(BaseMDP):
     """
     Diskretes MDP mit endlicher Zustands- und Aktionsmenge.
     """
 
-    def __init__(self, n_states, n_actions, P, R, gamma):
+    def __init__(self, n_states, n_actions, P, R, gamma, copy=True, rng=None, validate=False):
         """
-        P: Übergangswahrscheinlichkeiten (n_states, n_actions, n_states)
+        P: Übergangswahrscheinlichkeiten (n_states, n_actions, n_states),
+           dicht als Array oder dünn besetzt als SparseTransitions
         R: Rewards (n_states, n_actions)
         gamma: Diskontierungsfaktor
+        copy: Wenn False, werden P und R ohne Kopie übernommen (z.B. für np.memmap)
+        rng: Seed oder np.random.Generator für reset/step/sample_* (None = globaler Generator)
+        validate: Wenn True, werden P, R und gamma vollständig geprüft (siehe validate());
+                  bei Fehlern wird MDPValidationError ausgelöst
         """
         self.n_states = int(n_states)
         self.n_actions = int(n_actions)
-        self.P = np.array(P)  # shape: (n_states, n_actions, n_states)
-        self.R = np.array(R)  # shape: (n_states, n_actions)
+        if isinstance(P, SparseTransitions):
+            self.P = P
+        else:
+            self.P = np.array(P) if copy else np.asanyarray(P)  # shape: (n_states, n_actions, n_states)
+        self.R = np.array(R) if copy else np.asanyarray(R)  # shape: (n_states, n_actions)
         self.gamma = float(gamma)
+        if validate:
+            self.validate()
+        self.rng = get_rng(rng)
         self.state = self.reset()
 
+    def validate(self, atol=1e-8, raise_on_error=True, rtol=1e-5):
+        """
+        Prüft P, R und gamma blockweise (auch für np.memmap und SparseTransitions)
+        und gibt einen ValidationReport mit den fehlerhaften (s, a)-Paaren zurück.
+        Zeilensummen gelten bei |Summe - 1| <= atol + rtol als korrekt.
+        """
+        return validate_discrete_mdp(self.P, self.R, self.gamma, self.n_states, self.n_actions,
+                                     atol=atol, raise_on_error=raise_on_error, rtol=rtol)
+
+    @property
+    def P(self):
+        return self._P
+
+    @P.setter
+    def P(self, value):
+        self._P = value
+        self._sampling_table = None
+        self._dirty_rows = None  # None = alles geändert
+
+    @property
+    def sampling_table(self):
+        """
+        Vorberechnete CDF-Tabelle mit einer Zeile pro (s, a), wird bei Bedarf gebaut
+        (bei dichtem P als np.memmap oder sehr großem P ein DenseRowSampler ohne Tabelle).
+        Nach Zuweisung eines neuen P wird sie automatisch neu aufgebaut; nach
+        In-place-Änderungen an P muss invalidate_sampling_table() aufgerufen werden.
+        """
+        if self._sampling_table is None:
+            if self.is_sparse:
+                self._sampling_table = CategoricalTable.from_csr(self.P.indptr, self.P.indices, self.P.data)
+            else:
+                self._sampling_table = sampling_table_for(self.P)
+        return self._sampling_table
+
+    def invalidate_sampling_table(self):
+        """
+        Verwirft die CDF-Tabelle, z.B. nach In-place-Änderungen an P.
+        """
+        self._sampling_table = None
+
+    def set_sampling_table(self, table):
+        """
+        Übernimmt eine bereits gebaute Ziehtabelle (CategoricalTable oder DenseRowSampler) für P,
+        z.B. aus geteiltem Speicher, statt sie beim ersten Ziehen neu aufzubauen.
+        Der Aufrufer stellt sicher, dass sie zum aktuellen P passt.
+        """
+        if table.n_rows != self.n_states * self.n_actions:
+            raise ValueError(f"Ziehtabelle muss {self.n_states * self.n_actions} Zeilen haben, hat aber {table.n_rows}")
+        self._sampling_table = table
+
+    def set_transitions(self, state, action, probs, next_states=None):
+        """
+        Ersetzt die Übergangsverteilung von (state, action).
+        probs: Wahrscheinlichkeiten über alle n_states Folgezustände oder, falls
+               next_states angegeben ist, über genau diese Folgezustände
+        Die Zeile wird als geändert markiert (siehe pop_dirty_rows).
+        """
+        probs = np.asarray(probs, dtype=np.float64)
+        if next_states is None:
+            if probs.shape != (self.n_states,):
+                raise ValueError(f"probs muss Shape {(self.n_states,)} haben, hat aber {probs.shape}")
+            next_states = np.flatnonzero(probs)
+            values = probs[next_states]
+        else:
+            next_states = np.asarray(next_states, dtype=np.int64)
+            values = probs
+            if next_states.shape != values.shape:
+                raise ValueError("next_states und probs müssen gleich lang sein.")
+            if next_states.size and (next_states.min() < 0 or next_states.max() >= self.n_states):
+                raise ValueError(f"Folgezustände müssen im Bereich [0, {self.n_states}) liegen.")
+        if (values < 0).any() or not np.isclose(values.sum(), 1.0):
+            raise ValueError("probs muss eine Wahrscheinlichkeitsverteilung sein (nicht-negativ, Summe 1).")
+        if self.is_sparse:
+            order = np.argsort(next_states, kind="stable")
+            self._P.set_row(state, action, next_states[order], values[order])
+        else:
+            self._P[state, action] = 0.0
+            np.add.at(self._P[state, action], next_states, values)
+        self._sampling_table = None
+        self.mark_dirty(state, action)
+
+    def set_reward(self, state, action, reward):
+        """
+        Setzt R[state, action] und markiert die Zeile als geändert.
+        """
+        self.R[state, action] = reward
+        self.mark_dirty(state, action)
+
+    def mark_dirty(self, states, actions=None):
+        """
+        Markiert (s, a)-Zeilen als geändert, z.B. nach direkten In-place-Änderungen an P oder R
+        (dann zusätzlich invalidate_sampling_table() aufrufen). actions=None markiert alle
+        Aktionen der Zustände states.
+        """
+        if getattr(self, "_dirty_rows", None) is None:
+            return
+        states = np.atleast_1d(np.asarray(states, dtype=np.int64))
+        if actions is None:
+            rows = (states[:, None] * self.n_actions + np.arange(self.n_actions)).ravel()
+        else:
+            rows = states * self.n_actions + np.atleast_1d(np.asarray(actions, dtype=np.int64))
+        self._dirty_rows.update(rows.tolist())
+
+    def pop_dirty_rows(self):
+        """
+        Gibt die seit dem letzten Aufruf geänderten (s, a)-Zeilen (Index s * n_actions + a,
+        sortiert) zurück und setzt die Markierung zurück. None bedeutet, dass P seit
+        dem letzten Aufruf vollständig ersetzt wurde (bzw. noch nie abgefragt wurde).
+        """
+        dirty = getattr(self, "_dirty_rows", None)
+        self._dirty_rows = set()
+        if dirty is None:
+            return None
+        return np.array(sorted(dirty), dtype=np.int64)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_sampling_table"] = None
+        return state
+
+    @property
+    def is_sparse(self):
+        """
+        True, wenn P als SparseTransitions (CSR) gespeichert ist.
+        """
+        return isinstance(self.P, SparseTransitions)
+
+    def to_sparse(self, tol=0.0):
+        """
+        Gibt eine Kopie des MDP mit dünn besetztem P zurück.
+        """
+        P = self.P.copy() if self.is_sparse else SparseTransitions.from_dense(self.P, tol=tol)
+        return DiscreteMDP(self.n_states, self.n_actions, P, self.R, self.gamma, rng=self.rng)
+
+    def to_dense(self):
+        """
+        Gibt eine Kopie des MDP mit dichtem P zurück.
+        """
+        P = self.P.to_dense() if self.is_sparse else self.P
+        return DiscreteMDP(self.n_states, self.n_actions, P, self.R, self.gamma, rng=self.rng)
+
     def reset(self):
         """
         Setzt das MDP auf einen zufälligen Startzustand zurück.
         """
-        self.state = np.random.randint(self.n_states)
+        self.state = int(self.rng.integers(self.n_states))
         return self.state
 
     def step(self, action):
@@ -33,8 +188,7 @@ class DiscreteMDP(BaseMDP):
         Führt die Aktion aus, gibt (nächster Zustand, Reward) zurück.
         """
         assert 0 <= action < self.n_actions
-        probs = self.P[self.state, action]
-        next_state = np.random.choice(self.n_states, p=probs)
+        next_state = self.sampling_table.sample_one(self.state * self.n_actions + action, rng=self.rng)
         reward = self.R[self.state, action]
         self.state = next_state
         return next_state, reward
@@ -43,23 +197,24 @@ class DiscreteMDP(BaseMDP):
         """
         Gibt einen zufälligen Zustand zurück.
         """
-        return np.random.randint(self.n_states)
+        return int(self.rng.integers(self.n_states))
 
     def sample_action(self):
         """
         Gibt eine zufällige Aktion zurück.
         """
-        return np.random.randint(self.n_actions)
+        return int(self.rng.integers(self.n_actions))
 
     def to_dict(self):
         """
         Gibt eine serialisierbare Repräsentation zurück.
+        Dünn besetztes P wird als CSR-Dict ({"format": "csr", ...}) abgelegt.
         """
         return {
             "type": "discrete",
             "n_states": self.n_states,
             "n_actions": self.n_actions,
-            "P": self.P.tolist(),
+            "P": self.P.to_dict() if self.is_sparse else self.P.tolist(),
             "R": self.R.tolist(),
             "gamma": self.gamma
         }
@@ -69,10 +224,14 @@ class DiscreteMDP(BaseMDP):
         """
         Erzeugt eine MDP-Instanz aus serialisierten Daten.
         """
+        if isinstance(data["P"], dict):
+            P = SparseTransitions.from_dict(data["P"], data["n_states"], data["n_actions"])
+        else:
+            P = np.array(data["P"])
         return cls(
             n_states=data["n_states"],
             n_actions=data["n_actions"],
-            P=np.array(data["P"]),
+            P=P,
             R=np.array(data["R"]),
             gamma=data["gamma"]
         )
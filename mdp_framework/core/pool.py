@@ -0,0 +1,272 @@
+# mdp_framework/core/pool.py
+
+import asyncio
+import inspect
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
+from .continuous import ContinuousMDP
+
+BACKENDS = ("thread", "process", "asyncio")
+# Höchstzahl gleichzeitig ausstehender Anfragen je Worker (Standard für max_pending)
+PENDING_PER_WORKER = 4
+
+# Im Worker-Prozess gehaltene Umgebungen {env_id: ContinuousMDP} (siehe _init_worker)
+_WORKER_ENVS = {}
+
+def _apply(env, op, arg):
+    if op == "reset":
+        return env.reset()
+    return env.step(arg)
+
+def _init_worker(envs):
+    global _WORKER_ENVS
+    _WORKER_ENVS = envs
+
+def _run_in_worker(env_id, op, arg):
+    return _apply(_WORKER_ENVS[env_id], op, arg)
+
+def _is_async(func):
+    return inspect.iscoroutinefunction(func) or inspect.iscoroutinefunction(getattr(func, "__call__", None))
+
+async def _call(func, executor, *args):
+    """
+    Ruft func auf: Coroutine-Funktionen werden direkt erwartet, alle anderen laufen
+    im Thread-Pool, damit sie die Event-Loop nicht blockieren.
+    """
+    if _is_async(func):
+        return await func(*args)
+    return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+
+async def _apply_async(env, op, arg, executor):
+    if op == "reset":
+        return env.reset()
+    fused = env.dynamics_and_reward
+    if not (_is_async(fused) or _is_async(env.dynamics_func) or _is_async(env.reward_func)):
+        return await _call(env.step, executor, arg)
+    if fused is not None:
+        next_state, reward = await _call(fused, executor, env.state, arg)
+    else:
+        next_state, reward = await asyncio.gather(_call(env.dynamics_func, executor, env.state, arg),
+                                                  _call(env.reward_func, executor, env.state, arg))
+    env.state = next_state
+    return next_state, reward
+
+class EnvPool:
+    """
+    Führt mehrere ContinuousMDP-Instanzen nebenläufig aus, z.B. wenn dynamics_func bzw.
+    reward_func langsame Simulatoren aufrufen, die den GIL freigeben oder auf I/O warten.
+
+    Backends:
+    - "thread": Umgebungen werden auf max_workers Threads verteilt (env_id % max_workers)
+    - "process": wie "thread", aber in Prozessen; die Umgebungen werden einmal pro Worker
+      übertragen (müssen picklebar sein), der Zustand lebt danach nur im Worker
+    - "asyncio": eigene Event-Loop in einem Hintergrund-Thread; Coroutine-Funktionen
+      (async def) als Dynamik/Reward werden direkt erwartet, alle anderen laufen in
+      einem Thread-Pool mit max_workers Threads
+
+    Anfragen derselben Umgebung werden in Einreichungsreihenfolge ausgeführt; verschiedene
+    Umgebungen laufen parallel. Höchstens max_pending Anfragen sind gleichzeitig offen,
+    submit blockiert darüber hinaus (begrenzte Warteschlange).
+
+    Bei "thread" und "asyncio" sollten sich die Umgebungen keinen np.random.Generator
+    teilen (siehe from_factory), da Generatoren nicht threadsicher sind.
+    """
+
+    def __init__(self, envs, backend="thread", max_workers=None, max_pending=None):
+        """
+        envs: Liste von ContinuousMDP
+        backend: "thread", "process" oder "asyncio"
+        max_workers: Anzahl Worker (Standard: Anzahl CPUs, höchstens len(envs))
+        max_pending: Höchstzahl offener Anfragen (Standard: PENDING_PER_WORKER * max_workers)
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unbekanntes Backend: {backend}")
+        self.envs = list(envs)
+        if not all(isinstance(env, ContinuousMDP) for env in self.envs):
+            raise TypeError("EnvPool erwartet ContinuousMDP-Instanzen.")
+        if not self.envs:
+            raise ValueError("EnvPool benötigt mindestens eine Umgebung.")
+        self.backend = backend
+        self.max_workers = int(max_workers or min(len(self.envs), os.cpu_count() or 1))
+        self.max_pending = int(max_pending or PENDING_PER_WORKER * self.max_workers)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._closed = False
+        if backend == "asyncio":
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+            self._thread.start()
+            self._locks = [None] * len(self.envs)
+        else:
+            # Ein Worker je Shard: FIFO pro Shard garantiert die Reihenfolge pro Umgebung
+            self._shards = []
+            for shard in range(self.max_workers):
+                if backend == "thread":
+                    self._shards.append(ThreadPoolExecutor(max_workers=1))
+                else:
+                    envs_in_shard = {i: env for i, env in enumerate(self.envs) if i % self.max_workers == shard}
+                    self._shards.append(ProcessPoolExecutor(max_workers=1, initializer=_init_worker,
+                                                            initargs=(envs_in_shard,)))
+
+    @classmethod
+    def from_factory(cls, make_env, n_envs, rng=None, **kwargs):
+        """
+        Erzeugt n_envs Umgebungen mit make_env(rng), jede mit eigenem, aus rng
+        abgeleitetem Zufallsgenerator.
+        """
+        from mdp_framework.utils.sampling import get_rng
+        return cls([make_env(env_rng) for env_rng in get_rng(rng).spawn(n_envs)], **kwargs)
+
+    @property
+    def n_envs(self):
+        return len(self.envs)
+
+    async def _run_async(self, env_id, op, arg):
+        # Locks werden in der Event-Loop angelegt; asyncio.Lock bedient Wartende in FIFO-Reihenfolge
+        if self._locks[env_id] is None:
+            self._locks[env_id] = asyncio.Lock()
+        async with self._locks[env_id]:
+            return await _apply_async(self.envs[env_id], op, arg, self._executor)
+
+    def _submit(self, env_id, op, arg=None, acquired=False):
+        """
+        Reiht op ein; acquired=True heißt, der Aufrufer hat den Slot bereits belegt (siehe astep).
+        """
+        try:
+            if self._closed:
+                raise RuntimeError("EnvPool wurde bereits geschlossen.")
+            if not 0 <= env_id < len(self.envs):
+                raise IndexError(f"env_id {env_id} außerhalb von [0, {len(self.envs)})")
+        except BaseException:
+            if acquired:
+                self._slots.release()
+            raise
+        if not acquired:
+            self._slots.acquire()
+        try:
+            if self.backend == "asyncio":
+                future = asyncio.run_coroutine_threadsafe(self._run_async(env_id, op, arg), self._loop)
+            elif self.backend == "thread":
+                future = self._shards[env_id % self.max_workers].submit(_apply, self.envs[env_id], op, arg)
+            else:
+                future = self._shards[env_id % self.max_workers].submit(_run_in_worker, env_id, op, arg)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def submit(self, env_id, action):
+        """
+        Reiht einen Schritt von Umgebung env_id ein und gibt ein concurrent.futures.Future
+        mit (nächster Zustand, Reward) zurück. Blockiert, solange max_pending Anfragen offen sind.
+        """
+        return self._submit(env_id, "step", np.asarray(action, dtype=np.float64))
+
+    def submit_reset(self, env_id):
+        """
+        Reiht ein reset() von Umgebung env_id ein (geordnet mit deren Schritten).
+        """
+        return self._submit(env_id, "reset")
+
+    async def _acquire_slot(self):
+        """
+        Belegt einen Slot, ohne die Event-Loop des Aufrufers zu blockieren: ist keiner frei,
+        wird in einem Thread des Standard-Executors gewartet.
+        """
+        if self._slots.acquire(blocking=False):
+            return
+        acquire = asyncio.get_running_loop().run_in_executor(None, self._slots.acquire)
+        try:
+            await asyncio.shield(acquire)
+        except asyncio.CancelledError:
+            # Der Thread bekommt den Slot trotzdem noch: dann sofort wieder freigeben
+            def release(f):
+                if not f.cancelled() and f.exception() is None:
+                    self._slots.release()
+            acquire.add_done_callback(release)
+            raise
+
+    async def astep(self, env_id, action):
+        """
+        Wie submit, aber als awaitable für Aufrufer in einer eigenen Event-Loop. Sind
+        max_pending Anfragen offen, wartet astep, ohne die Event-Loop zu blockieren.
+        """
+        action = np.asarray(action, dtype=np.float64)
+        await self._acquire_slot()
+        return await asyncio.wrap_future(self._submit(env_id, "step", action, acquired=True))
+
+    def reset(self, env_ids=None):
+        """
+        Setzt die Umgebungen env_ids (Standard: alle) zurück, gibt die Startzustände (N, state_dim) zurück.
+        """
+        env_ids = range(len(self.envs)) if env_ids is None else env_ids
+        futures = [self.submit_reset(i) for i in env_ids]
+        return np.array([f.result() for f in futures], dtype=np.float64)
+
+    def step(self, actions, env_ids=None):
+        """
+        Führt je eine Aktion für die Umgebungen env_ids (Standard: alle) nebenläufig aus
+        und gibt (nächste Zustände (N, state_dim), Rewards (N,)) zurück.
+        """
+        env_ids = range(len(self.envs)) if env_ids is None else env_ids
+        futures = [self.submit(i, a) for i, a in zip(env_ids, actions)]
+        results = [f.result() for f in futures]
+        return (np.array([r[0] for r in results], dtype=np.float64),
+                np.array([r[1] for r in results], dtype=np.float64))
+
+    def close(self):
+        """
+        Wartet auf offene Anfragen und beendet alle Worker.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self.backend == "asyncio":
+            # Offene Anfragen abwarten: alle Slots belegen heißt, nichts ist mehr ausstehend
+            for _ in range(self.max_pending):
+                self._slots.acquire()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._executor.shutdown()
+        else:
+            for shard in self._shards:
+                shard.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# Mini-Test
+if __name__ == "__main__":
+    import time
+    from mdp_framework.generators.continuous_generator import random_continuous_mdp
+
+    class SlowDynamics:
+        """
+        Simuliert einen langsamen Simulator, der den GIL freigibt.
+        """
+
+        def __init__(self, inner):
+            self.inner = inner
+
+        def __call__(self, state, action):
+            time.sleep(0.01)
+            return self.inner(state, action)
+
+    def make_env(rng):
+        mdp = random_continuous_mdp(4, 2, rng=rng)
+        return ContinuousMDP(4, 2, SlowDynamics(mdp.dynamics_func), mdp.reward_func, mdp.gamma, rng=rng)
+
+    for backend, workers in (("thread", 1), ("thread", 8), ("asyncio", 8)):
+        with EnvPool.from_factory(make_env, 8, rng=0, backend=backend, max_workers=workers) as pool:
+            pool.reset()
+            start = time.perf_counter()
+            for _ in range(10):
+                states, rewards = pool.step(np.zeros((8, 2)))
+            print(f"{backend} ({workers} Worker): 80 Schritte in {time.perf_counter() - start:.2f}s")
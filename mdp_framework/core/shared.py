@@ -0,0 +1,155 @@
+# mdp_framework/core/shared.py
+
+from multiprocessing import shared_memory
+import numpy as np
+from .discrete import DiscreteMDP
+from .sparse import SparseTransitions
+from mdp_framework.utils.sampling import CategoricalTable, get_rng
+
+def _discrete_arrays(mdp):
+    if mdp.is_sparse:
+        arrays = {"P_indptr": mdp.P.indptr, "P_indices": mdp.P.indices, "P_data": mdp.P.data, "R": mdp.R}
+    else:
+        arrays = {"P": mdp.P, "R": mdp.R}
+    table = mdp.sampling_table
+    # Nur echte CDF-Tabellen werden geteilt (DenseRowSampler liest direkt aus P);
+    # die Werte einer CSR-Tabelle sind P_indices und werden nicht doppelt abgelegt
+    if isinstance(table, CategoricalTable):
+        arrays.update(table_cdf=table.cdf, table_starts=table.starts, table_lengths=table.lengths)
+    return arrays
+
+def _build_mdp(meta, arrays):
+    if meta["P_format"] == "csr":
+        P = SparseTransitions(meta["n_states"], meta["n_actions"],
+                              arrays["P_indptr"], arrays["P_indices"], arrays["P_data"])
+    else:
+        P = arrays["P"]
+    mdp = DiscreteMDP(meta["n_states"], meta["n_actions"], P, arrays["R"], meta["gamma"], copy=False)
+    if "table_cdf" in arrays:
+        values = arrays["P_indices"] if meta["P_format"] == "csr" else None
+        mdp.set_sampling_table(CategoricalTable(arrays["table_cdf"], arrays["table_starts"],
+                                                arrays["table_lengths"], values=values))
+    return mdp
+
+def _open_block(name):
+    # Ab Python 3.13 lässt sich die Registrierung beim resource_tracker abschalten;
+    # davor teilen sich Kindprozesse den Tracker des Erzeugers, der auch aufräumt.
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+class SharedMDPHandle:
+    """
+    Kleine, picklebare Beschreibung eines geteilten diskreten MDPs (Metadaten plus
+    Namen der Shared-Memory-Blöcke bzw. Pfad der Binärdatei). Wird statt des MDPs an
+    Worker geschickt; attach() blendet P, R und die Ziehtabelle dort ohne Kopie ein.
+    """
+
+    def __init__(self, meta, blocks=None, filepath=None):
+        """
+        meta: n_states, n_actions, gamma, P_format und Layout (dtype, shape) der Arrays
+        blocks: Name des Shared-Memory-Blocks je Array
+        filepath: alternativ Pfad einer Binärdatei (io.binary_io), die per np.memmap geladen wird
+        """
+        self.meta = meta
+        self.blocks = blocks
+        self.filepath = filepath
+
+    def attach(self, rng=None):
+        """
+        Gibt ein DiscreteMDP zurück, dessen P und R direkt auf dem geteilten Speicher liegen
+        (nur lesbar). Bei Shared Memory liegt auch die CDF-Tabelle (sampling_table) dort,
+        der Worker baut sie nicht erneut. Die Blöcke bleiben geöffnet, solange das MDP lebt.
+        """
+        if self.filepath is not None:
+            from mdp_framework.io.binary_io import load_mdp_from_binary
+            mdp = load_mdp_from_binary(self.filepath, mmap_mode="r")
+        else:
+            shms = {name: _open_block(block) for name, block in self.blocks.items()}
+            arrays = {}
+            for name, info in self.meta["arrays"].items():
+                arr = np.ndarray(tuple(info["shape"]), dtype=np.dtype(info["dtype"]), buffer=shms[name].buf)
+                arr.flags.writeable = False
+                arrays[name] = arr
+            mdp = _build_mdp(self.meta, arrays)
+            mdp._shared_blocks = shms
+        if rng is not None:
+            mdp.rng = get_rng(rng)
+        return mdp
+
+    @classmethod
+    def from_binary(cls, filepath):
+        """
+        Handle auf eine mit io.binary_io.save_mdp_to_binary geschriebene Datei; Worker
+        teilen sich P und R über den Page-Cache des Betriebssystems.
+        """
+        from mdp_framework.io.binary_io import read_binary_header
+        header, _ = read_binary_header(filepath)
+        return cls(header, filepath=filepath)
+
+class SharedDiscreteMDP:
+    """
+    Legt P, R und die CDF-Tabelle (sampling_table) eines diskreten MDPs einmalig in
+    multiprocessing.shared_memory ab.
+    Worker erhalten nur das kleine handle und hängen sich per handle.attach() ohne Kopie an,
+    statt jeweils eine gepickelte Kopie des gesamten Tensors zu bekommen.
+    Der Erzeuger gibt den Speicher mit close() bzw. am Ende eines with-Blocks wieder frei.
+    """
+
+    def __init__(self, mdp):
+        arrays = {name: np.ascontiguousarray(arr) for name, arr in _discrete_arrays(mdp).items()}
+        meta = {
+            "type": "discrete",
+            "n_states": mdp.n_states,
+            "n_actions": mdp.n_actions,
+            "gamma": mdp.gamma,
+            "P_format": "csr" if mdp.is_sparse else "dense",
+            "arrays": {name: {"dtype": arr.dtype.str, "shape": list(arr.shape)} for name, arr in arrays.items()}
+        }
+        self._shms = {}
+        try:
+            for name, arr in arrays.items():
+                # Größe 0 ist nicht erlaubt, daher mindestens ein Byte
+                shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+                self._shms[name] = shm
+                np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+        except BaseException:
+            self.close()
+            raise
+        self.handle = SharedMDPHandle(meta, blocks={name: shm.name for name, shm in self._shms.items()})
+
+    @property
+    def nbytes(self):
+        return sum(shm.size for shm in self._shms.values())
+
+    def close(self):
+        """
+        Schließt und entfernt alle Shared-Memory-Blöcke. Angehängte MDPs im eigenen
+        Prozess müssen vorher freigegeben sein.
+        """
+        for shm in self._shms.values():
+            shm.close()
+            shm.unlink()
+        self._shms = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# Mini-Test
+if __name__ == "__main__":
+    from concurrent.futures import ProcessPoolExecutor
+    from mdp_framework.generators.discrete_generator import random_discrete_mdp
+
+    def _worker_sum(handle):
+        mdp = handle.attach()
+        return float(mdp.P.sum())
+
+    mdp = random_discrete_mdp(200, 4)
+    with SharedDiscreteMDP(mdp) as shared:
+        print(f"Geteilt: {shared.nbytes} Bytes")
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            print("Zeilensummen je Worker:", list(pool.map(_worker_sum, [shared.handle] * 2)))
@@ -0,0 +1,187 @@
+# mdp_framework/core/sparse.py
+
+import numpy as np
+
+class SparseTransitions:
+    """
+    Dünn besetzte Übergangswahrscheinlichkeiten im CSR-Format.
+    Jede Zeile entspricht einem Paar (s, a) mit Zeilenindex s * n_actions + a,
+    die Spalten sind die Folgezustände s'. Der Speicherbedarf skaliert mit der
+    Anzahl der Nicht-Null-Einträge statt mit n_states² · n_actions.
+    """
+
+    def __init__(self, n_states, n_actions, indptr, indices, data):
+        """
+        indptr: Zeilenzeiger, Länge n_states * n_actions + 1
+        indices: Folgezustände der Nicht-Null-Einträge
+        data: Wahrscheinlichkeiten der Nicht-Null-Einträge
+        """
+        self.n_states = int(n_states)
+        self.n_actions = int(n_actions)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.data = np.asarray(data, dtype=np.float64)
+        n_rows = self.n_states * self.n_actions
+        if self.indptr.shape != (n_rows + 1,):
+            raise ValueError(f"indptr muss Länge {n_rows + 1} haben, hat aber {self.indptr.shape[0]}")
+        if self.indices.shape != self.data.shape:
+            raise ValueError("indices und data müssen gleich lang sein.")
+        if self.indptr[-1] != self.data.shape[0]:
+            raise ValueError("indptr[-1] muss der Anzahl der Nicht-Null-Einträge entsprechen.")
+        self._row_ids = None
+
+    @property
+    def shape(self):
+        return (self.n_states, self.n_actions, self.n_states)
+
+    @property
+    def nnz(self):
+        return int(self.data.shape[0])
+
+    def row(self, state, action):
+        """
+        Gibt (Folgezustände, Wahrscheinlichkeiten) für das Paar (state, action) zurück.
+        """
+        r = state * self.n_actions + action
+        start, end = self.indptr[r], self.indptr[r + 1]
+        return self.indices[start:end], self.data[start:end]
+
+    def row_ids(self):
+        """
+        Zeilenindex (s * n_actions + a) für jeden Nicht-Null-Eintrag (wird zwischengespeichert).
+        """
+        if self._row_ids is None:
+            self._row_ids = np.repeat(np.arange(self.n_states * self.n_actions), np.diff(self.indptr))
+        return self._row_ids
+
+    def row_sums(self):
+        """
+        Zeilensummen als Array der Shape (n_states, n_actions).
+        """
+        sums = np.bincount(self.row_ids(), weights=self.data, minlength=self.n_states * self.n_actions)
+        return sums.reshape(self.n_states, self.n_actions)
+
+    def dot(self, values):
+        """
+        Erwartungswert sum_s' P[s, a, s'] * values[s'] für alle (s, a), Shape (n_states, n_actions).
+        """
+        values = np.asarray(values, dtype=np.float64)
+        out = np.bincount(self.row_ids(), weights=self.data * values[self.indices],
+                          minlength=self.n_states * self.n_actions)
+        return out.reshape(self.n_states, self.n_actions)
+
+    def _row_positions(self, rows):
+        """
+        Positionen der Einträge der Zeilen rows in indices/data und die zugehörige
+        Zeilennummer innerhalb von rows.
+        """
+        starts = self.indptr[rows]
+        lengths = self.indptr[rows + 1] - starts
+        offsets = np.cumsum(lengths) - lengths
+        pos = np.repeat(starts - offsets, lengths) + np.arange(lengths.sum())
+        return np.repeat(np.arange(rows.shape[0]), lengths), pos
+
+    def dot_rows(self, rows, values):
+        """
+        Wie dot, aber nur für die (s, a)-Zeilen rows (Zeilenindex s * n_actions + a).
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        owner, pos = self._row_positions(rows)
+        values = np.asarray(values, dtype=np.float64)
+        return np.bincount(owner, weights=self.data[pos] * values[self.indices[pos]], minlength=rows.shape[0])
+
+    def set_row(self, state, action, indices, data):
+        """
+        Ersetzt die Zeile (state, action) durch die Einträge (indices, data).
+        Die CSR-Arrays werden dabei neu zusammengesetzt (O(nnz)).
+        """
+        r = state * self.n_actions + action
+        indices = np.asarray(indices, dtype=np.int64)
+        data = np.asarray(data, dtype=np.float64)
+        start, end = self.indptr[r], self.indptr[r + 1]
+        self.indices = np.concatenate([self.indices[:start], indices, self.indices[end:]])
+        self.data = np.concatenate([self.data[:start], data, self.data[end:]])
+        indptr = np.array(self.indptr)
+        indptr[r + 1:] += indices.shape[0] - (end - start)
+        self.indptr = indptr
+        self._row_ids = None
+
+    def policy_matrix(self, policy):
+        """
+        Übergangsmatrix P_pi einer deterministischen Policy (Array der Länge n_states)
+        als SparseTransitions mit einer einzigen Aktion.
+        """
+        rows = np.arange(self.n_states) * self.n_actions + np.asarray(policy, dtype=np.int64)
+        _, pos = self._row_positions(rows)
+        indptr = np.zeros(self.n_states + 1, dtype=np.int64)
+        np.cumsum(self.indptr[rows + 1] - self.indptr[rows], out=indptr[1:])
+        return SparseTransitions(self.n_states, 1, indptr, self.indices[pos], self.data[pos])
+
+    def to_dense(self):
+        """
+        Wandelt in ein dichtes Array der Shape (n_states, n_actions, n_states) um.
+        """
+        P = np.zeros((self.n_states * self.n_actions, self.n_states))
+        P[self.row_ids(), self.indices] = self.data
+        return P.reshape(self.shape)
+
+    @classmethod
+    def from_dense(cls, P, tol=0.0):
+        """
+        Erzeugt die CSR-Darstellung aus einem dichten Array; Einträge <= tol werden verworfen.
+        """
+        P = np.asarray(P)
+        n_states, n_actions, _ = P.shape
+        flat = P.reshape(n_states * n_actions, n_states)
+        rows, cols = np.nonzero(flat > tol)
+        indptr = np.zeros(n_states * n_actions + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n_states * n_actions), out=indptr[1:])
+        return cls(n_states, n_actions, indptr, cols, flat[rows, cols])
+
+    @classmethod
+    def from_coo(cls, n_states, n_actions, rows, cols, probs):
+        """
+        Erzeugt die CSR-Darstellung aus Tripeln (Zeile, Folgezustand, Wahrscheinlichkeit).
+        Doppelte Einträge werden aufsummiert.
+        """
+        rows = np.asarray(rows, dtype=np.int64).ravel()
+        cols = np.asarray(cols, dtype=np.int64).ravel()
+        probs = np.asarray(probs, dtype=np.float64).ravel()
+        keys, inverse = np.unique(rows * n_states + cols, return_inverse=True)
+        data = np.bincount(inverse, weights=probs, minlength=keys.shape[0])
+        indptr = np.zeros(n_states * n_actions + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys // n_states, minlength=n_states * n_actions), out=indptr[1:])
+        return cls(n_states, n_actions, indptr, keys % n_states, data)
+
+    def copy(self):
+        return SparseTransitions(self.n_states, self.n_actions,
+                                 self.indptr.copy(), self.indices.copy(), self.data.copy())
+
+    def to_dict(self):
+        """
+        Gibt eine serialisierbare Repräsentation zurück.
+        """
+        return {
+            "format": "csr",
+            "indptr": self.indptr.tolist(),
+            "indices": self.indices.tolist(),
+            "data": self.data.tolist()
+        }
+
+    @classmethod
+    def from_dict(cls, data, n_states, n_actions):
+        """
+        Erzeugt die CSR-Darstellung aus serialisierten Daten.
+        """
+        if data.get("format") != "csr":
+            raise ValueError(f"Unbekanntes Format für dünn besetztes P: {data.get('format')}")
+        return cls(n_states, n_actions, data["indptr"], data["indices"], data["data"])
+
+# Mini-Test
+if __name__ == "__main__":
+    P = np.zeros((3, 2, 3))
+    P[:, :, 0] = 0.5
+    P[:, :, 2] = 0.5
+    sp = SparseTransitions.from_dense(P)
+    print("nnz:", sp.nnz, "Zeilensummen:", sp.row_sums().ravel())
+    print("Zurück in dicht identisch:", np.allclose(sp.to_dense(), P))
@@ -0,0 +1,157 @@
+# mdp_framework/core/vector.py
+
+import numpy as np
+from mdp_framework.utils.sampling import get_rng
+from .discrete import DiscreteMDP
+from .continuous import ContinuousMDP
+
+class VectorDiscreteMDP:
+    """
+    Führt N Kopien eines DiscreteMDP gleichzeitig aus.
+    Die Zustände liegen als Array vor, ein step-Aufruf bewegt alle N Umgebungen
+    mit Array-Operationen; P und R des zugrunde liegenden MDP werden wiederverwendet.
+    """
+
+    def __init__(self, mdp, horizon=None, rng=None):
+        """
+        mdp: DiscreteMDP, dessen P/R genutzt werden
+        horizon: Optional, nach so vielen Schritten wird eine Umgebung automatisch zurückgesetzt
+        rng: Seed oder np.random.Generator (None = Generator des MDP)
+        """
+        if not isinstance(mdp, DiscreteMDP):
+            raise TypeError("VectorDiscreteMDP erwartet ein DiscreteMDP.")
+        self.mdp = mdp
+        self.rng = mdp.rng if rng is None else get_rng(rng)
+        self.horizon = None if horizon is None else int(horizon)
+        self.n_envs = 0
+        self.states = np.zeros(0, dtype=np.int64)
+        self.t = np.zeros(0, dtype=np.int64)
+
+    def reset(self, n_envs=None):
+        """
+        Setzt alle (bzw. n_envs neue) Umgebungen auf zufällige Startzustände zurück.
+        """
+        if n_envs is not None:
+            self.n_envs = int(n_envs)
+        self.states = self.sample_states(self.n_envs)
+        self.t = np.zeros(self.n_envs, dtype=np.int64)
+        return self.states.copy()
+
+    def step(self, actions):
+        """
+        Führt je eine Aktion pro Umgebung aus.
+        Gibt (nächste Zustände, Rewards, dones) zurück. dones markiert Umgebungen,
+        die den Horizont erreicht haben; diese starten intern bereits neu, die
+        zurückgegebenen Zustände sind aber die tatsächlichen Folgezustände.
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        if actions.shape != (self.n_envs,):
+            raise ValueError(f"actions muss Shape {(self.n_envs,)} haben, hat aber {actions.shape}")
+        if actions.size and (actions.min() < 0 or actions.max() >= self.mdp.n_actions):
+            raise ValueError(f"Aktionen müssen im Bereich [0, {self.mdp.n_actions}) liegen.")
+        rewards = self.mdp.R[self.states, actions]
+        next_states = self._sample_next_states(self.states, actions)
+        self.t += 1
+        dones = self._auto_reset(next_states)
+        return next_states, rewards, dones
+
+    def _sample_next_states(self, states, actions):
+        return self.mdp.sampling_table.sample(states * self.mdp.n_actions + actions, rng=self.rng)
+
+    def _auto_reset(self, next_states):
+        self.states = next_states.copy()
+        if self.horizon is None:
+            return np.zeros(self.n_envs, dtype=bool)
+        dones = self.t >= self.horizon
+        if dones.any():
+            self.states[dones] = self.sample_states(int(dones.sum()))
+            self.t[dones] = 0
+        return dones
+
+    def sample_states(self, n):
+        """
+        Gibt n zufällige Zustände zurück.
+        """
+        return self.rng.integers(self.mdp.n_states, size=n)
+
+    def sample_actions(self):
+        """
+        Gibt je eine zufällige Aktion pro Umgebung zurück.
+        """
+        return self.rng.integers(self.mdp.n_actions, size=self.n_envs)
+
+class VectorContinuousMDP:
+    """
+    Führt N Kopien eines ContinuousMDP gleichzeitig aus.
+    Zustände und Aktionen liegen als Arrays (N, state_dim) bzw. (N, action_dim) vor.
+    Ausgewertet wird über ContinuousMDP.evaluate_batch, d.h. fusioniert bzw. gebündelt,
+    falls die Funktionen das unterstützen, sonst zeilenweise.
+    """
+
+    def __init__(self, mdp, horizon=None, rng=None):
+        """
+        mdp: ContinuousMDP, dessen dynamics_func/reward_func genutzt werden
+        horizon: Optional, nach so vielen Schritten wird eine Umgebung automatisch zurückgesetzt
+        rng: Seed oder np.random.Generator (None = Generator des MDP)
+        """
+        if not isinstance(mdp, ContinuousMDP):
+            raise TypeError("VectorContinuousMDP erwartet ein ContinuousMDP.")
+        self.mdp = mdp
+        self.rng = mdp.rng if rng is None else get_rng(rng)
+        self.horizon = None if horizon is None else int(horizon)
+        self.n_envs = 0
+        self.states = np.zeros((0, mdp.state_dim))
+        self.t = np.zeros(0, dtype=np.int64)
+
+    def reset(self, n_envs=None):
+        """
+        Setzt alle (bzw. n_envs neue) Umgebungen auf zufällige Startzustände zurück.
+        """
+        if n_envs is not None:
+            self.n_envs = int(n_envs)
+        self.states = self.sample_states(self.n_envs)
+        self.t = np.zeros(self.n_envs, dtype=np.int64)
+        return self.states.copy()
+
+    def step(self, actions):
+        """
+        Führt je eine Aktion pro Umgebung aus, gibt (nächste Zustände, Rewards, dones) zurück.
+        """
+        actions = np.asarray(actions, dtype=np.float64)
+        if actions.shape != (self.n_envs, self.mdp.action_dim):
+            raise ValueError(f"actions muss Shape {(self.n_envs, self.mdp.action_dim)} haben, hat aber {actions.shape}")
+        next_states, rewards = self.mdp.evaluate_batch(self.states, actions)
+        self.t += 1
+        dones = self._auto_reset(next_states)
+        return next_states, rewards, dones
+
+    def _auto_reset(self, next_states):
+        self.states = next_states.copy()
+        if self.horizon is None:
+            return np.zeros(self.n_envs, dtype=bool)
+        dones = self.t >= self.horizon
+        if dones.any():
+            self.states[dones] = self.sample_states(int(dones.sum()))
+            self.t[dones] = 0
+        return dones
+
+    def sample_states(self, n):
+        """
+        Gibt n zufällige Zustände zurück (uniform im Intervall [-1, 1]).
+        """
+        return self.rng.uniform(-1, 1, size=(n, self.mdp.state_dim))
+
+    def sample_actions(self):
+        """
+        Gibt je eine zufällige Aktion pro Umgebung zurück (uniform im Intervall [-1, 1]).
+        """
+        return self.rng.uniform(-1, 1, size=(self.n_envs, self.mdp.action_dim))
+
+# Mini-Test
+if __name__ == "__main__":
+    from mdp_framework.generators.discrete_generator import random_discrete_mdp
+    venv = VectorDiscreteMDP(random_discrete_mdp(6, 2), horizon=3)
+    print("Startzustände:", venv.reset(4))
+    for _ in range(4):
+        s_next, r, done = venv.step(venv.sample_actions())
+        print("Folgezustände:", s_next, "Rewards:", np.round(r, 2), "dones:", done)
@@ -1,39 +1,111 @@
 # mdp_framework/generators/continuous_generator.py
 
 import numpy as np
-from mdp_framework.core.continuous import ContinuousMDP
+from mdp_framework.core.continuous import ContinuousMDP, register_function
+from mdp_framework.utils.sampling import get_rng
 
+@register_function("random_linear_dynamics")
 class RandomLinearDynamics:
-    def __init__(self, state_dim, action_dim, noise_std=0.01):
-        self.A = np.random.randn(state_dim, state_dim)
-        self.B = np.random.randn(state_dim, action_dim)
+    # Unterstützt das gebündelte Protokoll: state (state_dim,) oder (N, state_dim)
+    batched = True
+
+    def __init__(self, state_dim, action_dim, noise_std=0.01, rng=None):
+        self.rng = get_rng(rng)
+        self.A = self.rng.standard_normal((state_dim, state_dim))
+        self.B = self.rng.standard_normal((state_dim, action_dim))
         self.noise_std = noise_std
         self.state_dim = state_dim
 
     def __call__(self, state, action):
         state = np.asarray(state)
         action = np.asarray(action)
-        noise = np.random.randn(self.state_dim) * self.noise_std
-        return self.A @ state + self.B @ action + noise
+        noise = self.rng.standard_normal(state.shape) * self.noise_std
+        return state @ self.A.T + action @ self.B.T + noise
+
+    def to_dict(self):
+        """
+        Vollständige Beschreibung als dict mit numpy-Arrays: A, B und noise_std.
+        """
+        return {"A": self.A, "B": self.B, "noise_std": self.noise_std}
+
+    @classmethod
+    def from_dict(cls, data, rng=None):
+        """
+        Erzeugt die Dynamik aus gespeicherten Parametern (ohne neue Zufallsziehung).
+        """
+        self = cls.__new__(cls)
+        self.rng = get_rng(rng)
+        self.A = np.array(data["A"], dtype=np.float64)
+        self.B = np.array(data["B"], dtype=np.float64)
+        self.noise_std = float(data["noise_std"])
+        self.state_dim = self.A.shape[0]
+        return self
+
+    def fuse_with(self, reward_func):
+        """
+        Gibt eine fusionierte Dynamik+Reward-Funktion zurück, falls reward_func linear ist.
+        """
+        if isinstance(reward_func, RandomRewardFunction):
+            return LinearDynamicsAndReward(self, reward_func)
+        return None
 
+@register_function("random_linear_reward")
 class RandomRewardFunction:
-    def __init__(self, state_dim, action_dim):
-        self.w_s = np.random.randn(state_dim)
-        self.w_a = np.random.randn(action_dim)
+    batched = True
+
+    def __init__(self, state_dim, action_dim, rng=None):
+        rng = get_rng(rng)
+        self.w_s = rng.standard_normal(state_dim)
+        self.w_a = rng.standard_normal(action_dim)
+
+    def __call__(self, state, action):
+        state = np.asarray(state)
+        action = np.asarray(action)
+        reward = state @ self.w_s + action @ self.w_a
+        return float(reward) if np.ndim(reward) == 0 else reward
+
+    def to_dict(self):
+        return {"w_s": self.w_s, "w_a": self.w_a}
+
+    @classmethod
+    def from_dict(cls, data, rng=None):
+        self = cls.__new__(cls)
+        self.w_s = np.array(data["w_s"], dtype=np.float64)
+        self.w_a = np.array(data["w_a"], dtype=np.float64)
+        return self
+
+class LinearDynamicsAndReward:
+    """
+    Fusionierte lineare Dynamik und Reward: s' = A s + B a (+ Rauschen), r = w_s s + w_a a.
+    Beide Größen entstehen in einem Aufruf aus denselben (einmal konvertierten) Eingaben.
+    A, B, w_s und w_a werden bei jedem Aufruf aus dynamics bzw. reward gelesen, spätere
+    Änderungen daran wirken also sofort.
+    """
+    batched = True
+
+    def __init__(self, dynamics, reward):
+        self.dynamics = dynamics
+        self.reward = reward
 
     def __call__(self, state, action):
         state = np.asarray(state)
         action = np.asarray(action)
-        return float(self.w_s @ state + self.w_a @ action)
+        dynamics, reward = self.dynamics, self.reward
+        next_state = state @ dynamics.A.T + action @ dynamics.B.T
+        next_state += dynamics.rng.standard_normal(next_state.shape) * dynamics.noise_std
+        r = state @ reward.w_s + action @ reward.w_a
+        return next_state, (float(r) if np.ndim(r) == 0 else r)
 
 def random_continuous_mdp(
         state_dim,
         action_dim,
         gamma=0.99,
-        noise_std=0.01):
-    dynamics_func = RandomLinearDynamics(state_dim, action_dim, noise_std=noise_std)
-    reward_func = RandomRewardFunction(state_dim, action_dim)
-    mdp = ContinuousMDP(state_dim, action_dim, dynamics_func, reward_func, gamma)
+        noise_std=0.01,
+        rng=None):
+    rng = get_rng(rng)
+    dynamics_func = RandomLinearDynamics(state_dim, action_dim, noise_std=noise_std, rng=rng)
+    reward_func = RandomRewardFunction(state_dim, action_dim, rng=rng)
+    mdp = ContinuousMDP(state_dim, action_dim, dynamics_func, reward_func, gamma, rng=rng)
     return mdp
 
 # Mini-Test
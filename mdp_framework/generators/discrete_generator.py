@@ -2,13 +2,15 @@
 
 import numpy as np
 from mdp_framework.core.discrete import DiscreteMDP
+from mdp_framework.utils.sampling import get_rng
 
 def random_discrete_mdp(
     n_states,
     n_actions,
     gamma=0.99,
     reward_std=1.0,
-    random_start_state=True
+    random_start_state=True,
+    rng=None
 ):
     """
     Erstellt ein zufälliges diskretes MDP.
@@ -18,18 +20,19 @@ def random_discrete_mdp(
     - gamma: Diskontierungsfaktor
     - reward_std: Standardabweichung für Rewards
     - random_start_state: Wenn True, wird bei reset ein zufälliger Startzustand gewählt
+    - rng: Seed oder np.random.Generator (wird auch vom erzeugten MDP verwendet)
     """
+    rng = get_rng(rng)
 
-    # Übergangswahrscheinlichkeiten P[s, a, s'] mit Dirichlet für Stochastizität
-    P = np.zeros((n_states, n_actions, n_states))
-    for s in range(n_states):
-        for a in range(n_actions):
-            P[s, a] = np.random.dirichlet(np.ones(n_states))
+    # Übergangswahrscheinlichkeiten P[s, a, s'] ~ Dirichlet(1, ..., 1):
+    # alle Gamma-Variablen auf einmal ziehen und zeilenweise normieren
+    P = rng.standard_gamma(1.0, size=(n_states, n_actions, n_states))
+    P /= P.sum(axis=2, keepdims=True)
 
     # Rewards (normalverteilt)
-    R = np.random.normal(loc=0.0, scale=reward_std, size=(n_states, n_actions))
+    R = rng.normal(loc=0.0, scale=reward_std, size=(n_states, n_actions))
 
-    mdp = DiscreteMDP(n_states, n_actions, P, R, gamma)
+    mdp = DiscreteMDP(n_states, n_actions, P, R, gamma, copy=False, rng=rng)
     if not random_start_state:
         mdp.state = 0
     return mdp
@@ -0,0 +1,134 @@
+# mdp_framework/generators/structured_generator.py
+
+import numpy as np
+from mdp_framework.core.discrete import DiscreteMDP
+from mdp_framework.core.sparse import SparseTransitions
+from mdp_framework.utils.sampling import get_rng
+
+# Bewegungsrichtungen der Grid-World: (dx, dy) für hoch, runter, links, rechts
+GRID_MOVES = np.array([[0, -1], [0, 1], [-1, 0], [1, 0]])
+
+def _dirichlet_rows(n_rows, k, rng):
+    """
+    Zieht n_rows Dirichlet(1, ..., 1)-Verteilungen der Länge k auf einmal.
+    """
+    probs = rng.standard_gamma(1.0, size=(n_rows, k))
+    probs /= probs.sum(axis=1, keepdims=True)
+    return probs
+
+def _distinct_successors(n_rows, k, n_states, rng):
+    """
+    k verschiedene, aufsteigend sortierte Zustände aus [0, n_states) je Zeile:
+    sortierte Ziehung mit Zurücklegen aus [0, n_states - k] plus (0, 1, ..., k-1).
+    """
+    draws = np.sort(rng.integers(n_states - k + 1, size=(n_rows, k)), axis=1)
+    return draws + np.arange(k)
+
+def random_sparse_discrete_mdp(
+    n_states,
+    n_actions,
+    n_successors=3,
+    gamma=0.99,
+    reward_std=1.0,
+    rng=None
+):
+    """
+    Erstellt ein zufälliges diskretes MDP mit genau n_successors Folgezuständen pro (s, a).
+    P wird direkt im CSR-Format erzeugt, der dichte Tensor wird nie angelegt.
+    """
+    rng = get_rng(rng)
+    n_rows = n_states * n_actions
+    k = min(int(n_successors), n_states)
+    successors = _distinct_successors(n_rows, k, n_states, rng)
+    indptr = np.arange(n_rows + 1, dtype=np.int64) * k
+    P = SparseTransitions(n_states, n_actions, indptr, successors.ravel(), _dirichlet_rows(n_rows, k, rng).ravel())
+    R = rng.normal(loc=0.0, scale=reward_std, size=(n_states, n_actions))
+    return DiscreteMDP(n_states, n_actions, P, R, gamma, rng=rng)
+
+def grid_world_mdp(width, height, slip=0.1, gamma=0.99, goal=None, step_reward=-1.0, rng=None):
+    """
+    Grid-World mit Zuständen s = y * width + x und Aktionen hoch, runter, links, rechts.
+    Mit Wahrscheinlichkeit 1 - slip wird die gewählte Richtung ausgeführt, sonst eine der
+    anderen drei; Bewegungen gegen den Rand bleiben stehen. Der Zielzustand (Standard:
+    rechts unten) ist absorbierend mit Reward 0, alle anderen Schritte kosten step_reward.
+    """
+    n_states = width * height
+    n_actions = len(GRID_MOVES)
+    goal = n_states - 1 if goal is None else int(goal)
+    states = np.arange(n_states)
+    x, y = states % width, states // width
+    tx = np.clip(x[:, None] + GRID_MOVES[:, 0], 0, width - 1)
+    ty = np.clip(y[:, None] + GRID_MOVES[:, 1], 0, height - 1)
+    targets = ty * width + tx  # (n_states, Richtungen)
+    targets[goal] = goal
+    # move_probs[a, d]: Wahrscheinlichkeit, bei Aktion a in Richtung d zu gehen
+    move_probs = np.full((n_actions, n_actions), slip / (n_actions - 1))
+    np.fill_diagonal(move_probs, 1.0 - slip)
+    rows = np.broadcast_to((states[:, None] * n_actions + np.arange(n_actions))[:, :, None],
+                           (n_states, n_actions, n_actions))
+    cols = np.broadcast_to(targets[:, None, :], (n_states, n_actions, n_actions))
+    probs = np.broadcast_to(move_probs[None], (n_states, n_actions, n_actions))
+    P = SparseTransitions.from_coo(n_states, n_actions, rows, cols, probs)
+    R = np.full((n_states, n_actions), float(step_reward))
+    R[goal] = 0.0
+    return DiscreteMDP(n_states, n_actions, P, R, gamma, rng=rng)
+
+def chain_mdp(n_states, slip=0.1, gamma=0.99, ring=False, rng=None):
+    """
+    Kette (bzw. Ring bei ring=True) mit Aktionen links (0) und rechts (1).
+    Mit Wahrscheinlichkeit slip wird in die Gegenrichtung gegangen.
+    Reward 1 gibt es im letzten Zustand, sonst 0.
+    """
+    states = np.arange(n_states)
+    if ring:
+        left, right = (states - 1) % n_states, (states + 1) % n_states
+    else:
+        left, right = np.maximum(states - 1, 0), np.minimum(states + 1, n_states - 1)
+    rows = np.stack([states * 2, states * 2, states * 2 + 1, states * 2 + 1], axis=1)
+    cols = np.stack([left, right, right, left], axis=1)
+    probs = np.broadcast_to([1.0 - slip, slip, 1.0 - slip, slip], (n_states, 4))
+    P = SparseTransitions.from_coo(n_states, 2, rows, cols, probs)
+    R = np.zeros((n_states, 2))
+    R[n_states - 1] = 1.0
+    return DiscreteMDP(n_states, 2, P, R, gamma, rng=rng)
+
+def block_mdp(
+    n_blocks,
+    block_size,
+    n_actions,
+    n_successors=3,
+    p_leave=0.05,
+    gamma=0.99,
+    reward_std=1.0,
+    rng=None
+):
+    """
+    Block-strukturiertes MDP: Zustände sind in n_blocks Blöcke der Größe block_size eingeteilt.
+    Jedes (s, a) hat n_successors zufällige Folgezustände im eigenen Block und mit
+    Wahrscheinlichkeit p_leave einen Übergang in einen zufälligen Zustand eines anderen Blocks.
+    """
+    rng = get_rng(rng)
+    n_states = n_blocks * block_size
+    n_rows = n_states * n_actions
+    k = min(int(n_successors), block_size)
+    block_start = (np.arange(n_rows) // n_actions) // block_size * block_size
+    cols = block_start[:, None] + _distinct_successors(n_rows, k, block_size, rng)
+    probs = _dirichlet_rows(n_rows, k, rng)
+    if n_blocks > 1 and p_leave > 0:
+        # Zufälliger Zustand außerhalb des eigenen Blocks
+        outside = (block_start + block_size + rng.integers(n_states - block_size, size=n_rows)) % n_states
+        cols = np.concatenate([cols, outside[:, None]], axis=1)
+        probs = np.concatenate([probs * (1.0 - p_leave), np.full((n_rows, 1), p_leave)], axis=1)
+    rows = np.broadcast_to(np.arange(n_rows)[:, None], cols.shape)
+    P = SparseTransitions.from_coo(n_states, n_actions, rows, cols, probs)
+    R = rng.normal(loc=0.0, scale=reward_std, size=(n_states, n_actions))
+    return DiscreteMDP(n_states, n_actions, P, R, gamma, rng=rng)
+
+# Mini-Test
+if __name__ == "__main__":
+    for mdp in (random_sparse_discrete_mdp(100000, 4, n_successors=3),
+                grid_world_mdp(10, 10),
+                chain_mdp(20, ring=True),
+                block_mdp(10, 50, 3)):
+        print(f"{mdp.n_states} Zustände, {mdp.n_actions} Aktionen, nnz={mdp.P.nnz}, "
+              f"Zeilensummen ok: {np.allclose(mdp.P.row_sums(), 1)}")
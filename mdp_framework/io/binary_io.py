@@ -0,0 +1,141 @@
+# mdp_framework/io/binary_io.py
+
+import json
+import os
+import struct
+import numpy as np
+from mdp_framework.core.discrete import DiscreteMDP
+from mdp_framework.core.continuous import ContinuousMDP, function_to_dict
+from mdp_framework.core.sparse import SparseTransitions
+from mdp_framework.utils.instrumentation import instrument_io
+
+# Dateiaufbau: MAGIC | Header-Länge (uint64, little endian) | JSON-Header | Arrays
+# Header und jedes Array beginnen auf einer ALIGNMENT-Grenze, damit die Arrays
+# direkt per np.memmap eingeblendet werden können.
+MAGIC = b"MDPBIN01"
+ALIGNMENT = 64
+
+def _align(n):
+    return (n + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+def _discrete_arrays(mdp):
+    if mdp.is_sparse:
+        return {"P_indptr": mdp.P.indptr, "P_indices": mdp.P.indices, "P_data": mdp.P.data, "R": mdp.R}
+    return {"P": mdp.P, "R": mdp.R}
+
+@instrument_io("binary", "write")
+def save_mdp_to_binary(mdp, filepath):
+    """
+    Speichert ein MDP im Binärformat (.mdp): kleiner JSON-Header plus rohe Arrays.
+    Stetige MDPs werden über die Parameter ihrer registrierten Dynamik-/Reward-Funktionen
+    gespeichert; für beliebige andere Funktionen wird ein Fehler ausgelöst.
+    """
+    if isinstance(mdp, DiscreteMDP):
+        arrays = {name: np.asarray(arr) for name, arr in _discrete_arrays(mdp).items()}
+        header = {
+            "type": "discrete",
+            "n_states": mdp.n_states,
+            "n_actions": mdp.n_actions,
+            "gamma": mdp.gamma,
+            "P_format": "csr" if mdp.is_sparse else "dense",
+        }
+    elif isinstance(mdp, ContinuousMDP):
+        if not mdp.is_serializable:
+            raise NotImplementedError("ContinuousMDP kann nur mit registrierten Dynamik-/Reward-Funktionen im Binärformat gespeichert werden.")
+        header = {
+            "type": "continuous",
+            "state_dim": mdp.state_dim,
+            "action_dim": mdp.action_dim,
+            "gamma": mdp.gamma,
+        }
+        # Skalare Parameter (inkl. kind) in den Header, Arrays als "<teil>.<name>" in den Datenbereich
+        arrays = {}
+        for part, func in (("dynamics", mdp.dynamics_func), ("reward", mdp.reward_func)):
+            params = function_to_dict(func)
+            header[part] = {key: value for key, value in params.items() if not isinstance(value, np.ndarray)}
+            arrays.update({f"{part}.{key}": value for key, value in params.items() if isinstance(value, np.ndarray)})
+    else:
+        raise TypeError("Unbekannter MDP-Typ.")
+
+    # Offsets relativ zum Beginn des Datenbereichs
+    offset = 0
+    header["arrays"] = {}
+    for name, arr in arrays.items():
+        header["arrays"][name] = {"dtype": arr.dtype.str, "shape": list(arr.shape), "offset": offset}
+        offset = _align(offset + arr.nbytes)
+    header_bytes = json.dumps(header).encode("utf-8")
+    data_start = _align(len(MAGIC) + 8 + len(header_bytes))
+
+    with open(filepath, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header_bytes)))
+        f.write(header_bytes)
+        for name, arr in arrays.items():
+            f.seek(data_start + header["arrays"][name]["offset"])
+            f.write(memoryview(np.ascontiguousarray(arr)).cast("B"))
+
+def read_binary_header(filepath):
+    """
+    Liest den JSON-Header einer Binärdatei und gibt (header, Beginn des Datenbereichs) zurück.
+    """
+    with open(filepath, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError("Datei ist keine gültige MDP-Binärdatei.")
+        (header_len,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_len).decode("utf-8"))
+    return header, _align(len(MAGIC) + 8 + header_len)
+
+def _load_array(filepath, info, data_start, mmap_mode):
+    dtype = np.dtype(info["dtype"])
+    shape = tuple(info["shape"])
+    count = int(np.prod(shape))
+    if count == 0:
+        return np.zeros(shape, dtype=dtype)
+    offset = data_start + info["offset"]
+    if mmap_mode is None:
+        return np.fromfile(filepath, dtype=dtype, count=count, offset=offset).reshape(shape)
+    return np.memmap(filepath, dtype=dtype, mode=mmap_mode, offset=offset, shape=shape)
+
+@instrument_io("binary", "read")
+def load_mdp_from_binary(filepath, mmap_mode="r", validate=False):
+    """
+    Lädt ein MDP aus einer Binärdatei.
+    mmap_mode: "r" (nur lesen) oder "c" (copy-on-write) blendet P und R per np.memmap ein,
+    sodass nur tatsächlich berührte Seiten gelesen werden; None lädt alles in den Speicher.
+    validate: Wenn True, wird ein diskretes MDP blockweise geprüft (siehe DiscreteMDP.validate).
+    """
+    header, data_start = read_binary_header(filepath)
+    if header.get("type") == "discrete":
+        arrays = {name: _load_array(filepath, info, data_start, mmap_mode)
+                  for name, info in header["arrays"].items()}
+        if header["P_format"] == "csr":
+            P = SparseTransitions(header["n_states"], header["n_actions"],
+                                  arrays["P_indptr"], arrays["P_indices"], arrays["P_data"])
+        else:
+            P = arrays["P"]
+        return DiscreteMDP(header["n_states"], header["n_actions"], P, arrays["R"], header["gamma"], copy=False,
+                           validate=validate)
+    elif header.get("type") == "continuous":
+        data = dict(header)
+        for part in ("dynamics", "reward"):
+            data[part] = dict(header[part])
+        for name, info in header["arrays"].items():
+            part, key = name.split(".", 1)
+            # Kleine Parameter-Arrays direkt einlesen statt einblenden
+            data[part][key] = _load_array(filepath, info, data_start, None)
+        return ContinuousMDP.from_dict(data)
+    else:
+        raise ValueError("Unbekannter oder nicht unterstützter MDP-Typ in Datei.")
+
+# Mini-Test
+if __name__ == "__main__":
+    from mdp_framework.generators.discrete_generator import random_discrete_mdp
+    mdp = random_discrete_mdp(4, 2)
+    save_path = "test_mdp.mdp"
+    save_mdp_to_binary(mdp, save_path)
+    print(f"MDP als {save_path} gespeichert ({os.path.getsize(save_path)} Bytes).")
+
+    loaded_mdp = load_mdp_from_binary(save_path)
+    print("Geladenes MDP, P gemappt:", isinstance(loaded_mdp.P, np.memmap), "erster Zustand:", loaded_mdp.reset())
+    del loaded_mdp
+    os.remove(save_path)
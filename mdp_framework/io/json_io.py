@@ -1,35 +1,339 @@
 # mdp_framework/io/json_io.py
 
+import gzip
 import json
 import os
+import numpy as np
 from mdp_framework.core.discrete import DiscreteMDP
-# ContinuousMDP wird importiert, aber nur für Typprüfung und Error-Handling
-from mdp_framework.core.continuous import ContinuousMDP
+from mdp_framework.core.continuous import ContinuousMDP, function_to_dict
+from mdp_framework.core.sparse import SparseTransitions
+from mdp_framework.utils.instrumentation import instrument_io
 
-def save_mdp_to_json(mdp, filepath):
+GZIP_MAGIC = b"\x1f\x8b"
+# Elemente pro geschriebenem Block bei langen 1-D-Arrays (z.B. CSR-Daten)
+WRITE_CHUNK = 8192
+READ_CHUNK = 1 << 20
+
+def _open_text(filepath, mode, compress):
+    if compress:
+        return gzip.open(filepath, mode + "t", encoding="utf-8")
+    return open(filepath, mode, encoding="utf-8")
+
+def _is_gzip(filepath):
+    with open(filepath, "rb") as f:
+        return f.read(2) == GZIP_MAGIC
+
+def _discrete_fields(mdp, precision=None):
+    """
+    Felder wie in DiscreteMDP.to_dict, aber mit numpy-Arrays statt Listen.
+    Skalare stehen vorne, damit der Leser die Arrays vorab allokieren kann.
+    precision wird mitgeschrieben, damit der Leser die Rundung bei der Validierung berücksichtigt.
+    """
+    if mdp.is_sparse:
+        P = {"format": "csr", "indptr": mdp.P.indptr, "indices": mdp.P.indices, "data": mdp.P.data}
+    else:
+        P = mdp.P
+    fields = {
+        "type": "discrete",
+        "n_states": mdp.n_states,
+        "n_actions": mdp.n_actions,
+        "gamma": mdp.gamma,
+    }
+    if precision is not None:
+        fields["precision"] = int(precision)
+    fields.update(P=P, R=mdp.R)
+    return fields
+
+def _rounding_atol(data):
+    """
+    Toleranz für Zeilensummen einer mit precision Nachkommastellen gespeicherten Datei:
+    jeder der höchstens n_states Einträge einer Zeile ist um bis zu 0.5 * 10^-precision gerundet.
+    """
+    if data.get("precision") is None:
+        return 1e-8
+    return max(1e-8, data["n_states"] * 0.5 * 10.0 ** -data["precision"])
+
+def _continuous_fields(mdp):
+    """
+    Felder wie in ContinuousMDP.to_dict (nur registrierte Funktionen), mit numpy-Arrays.
+    """
+    return {
+        "type": "continuous",
+        "state_dim": mdp.state_dim,
+        "action_dim": mdp.action_dim,
+        "gamma": mdp.gamma,
+        "dynamics": function_to_dict(mdp.dynamics_func),
+        "reward": function_to_dict(mdp.reward_func)
+    }
+
+class _StreamWriter:
+    """
+    Schreibt verschachtelte dicts/Arrays zeilenweise, ohne sie vorher in Listen umzuwandeln.
+    """
+
+    def __init__(self, f, indent, precision):
+        self.f = f
+        self.indent = indent
+        self.precision = precision
+
+    def _newline(self, level):
+        if self.indent is None:
+            return ""
+        return "\n" + " " * (self.indent * level)
+
+    def _format_flat(self, arr):
+        if self.precision is not None and np.issubdtype(arr.dtype, np.floating):
+            arr = np.round(arr, self.precision)
+        return json.dumps(arr.tolist())[1:-1]
+
+    def write_value(self, value, level):
+        if isinstance(value, dict):
+            self.write_object(value, level)
+        elif isinstance(value, np.ndarray):
+            self.write_array(value, level)
+        else:
+            self.f.write(json.dumps(value))
+
+    def write_object(self, obj, level):
+        self.f.write("{")
+        for i, (key, value) in enumerate(obj.items()):
+            self.f.write(("," if i else "") + self._newline(level + 1) + json.dumps(key) + ": ")
+            self.write_value(value, level + 1)
+        self.f.write(self._newline(level) + "}")
+
+    def write_array(self, arr, level):
+        if arr.ndim <= 1:
+            # Innerste Zeile in Blöcken schreiben, damit nie das ganze Array als Liste existiert
+            self.f.write("[")
+            for start in range(0, arr.shape[0], WRITE_CHUNK):
+                self.f.write((", " if start else "") + self._format_flat(np.asarray(arr[start:start + WRITE_CHUNK])))
+            self.f.write("]")
+            return
+        self.f.write("[")
+        for i in range(arr.shape[0]):
+            self.f.write(("," if i else "") + self._newline(level + 1))
+            self.write_array(arr[i], level + 1)
+        self.f.write(self._newline(level) + "]")
+
+class _ArrayBuilder:
+    """
+    Sammelt Zahlen in einem wachsenden numpy-Puffer (exakt vorab allokiert, falls die Größe bekannt ist).
+    """
+
+    def __init__(self, capacity=0):
+        self.capacity = int(capacity)
+        self.buf = None
+        self.n = 0
+
+    def extend(self, values):
+        if self.buf is None:
+            self.buf = np.empty(max(self.capacity, len(values), 1), dtype=values.dtype)
+        elif values.dtype.kind == "f" and self.buf.dtype.kind != "f":
+            self.buf = self.buf.astype(np.float64)
+        end = self.n + len(values)
+        if end > self.buf.shape[0]:
+            grown = np.empty(max(2 * self.buf.shape[0], end), dtype=self.buf.dtype)
+            grown[:self.n] = self.buf[:self.n]
+            self.buf = grown
+        self.buf[self.n:end] = values
+        self.n = end
+
+    def result(self):
+        if self.buf is None:
+            return np.zeros(0)
+        return self.buf if self.n == self.buf.shape[0] else self.buf[:self.n].copy()
+
+class _StreamReader:
+    """
+    Inkrementeller JSON-Parser: Zahlen-Arrays werden zeilenweise direkt in numpy-Puffer
+    gelesen, alle übrigen Werte per json.JSONDecoder.raw_decode.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        chunk = self.f.read(READ_CHUNK)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Ungültiges JSON: '{char}' erwartet an Position {self.pos}.")
+        self.pos += 1
+
+    def parse_scalar(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+                # Zahl am Pufferende könnte abgeschnitten sein
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+    def parse_value(self, size_hint=0):
+        char = self.peek()
+        if char == "{":
+            return self.parse_object()
+        if char == "[":
+            return self.parse_array(size_hint)
+        return self.parse_scalar()
+
+    def parse_object(self, size_hints=None):
+        self.expect("{")
+        obj = {}
+        if self.peek() == "}":
+            self.pos += 1
+            return obj
+        while True:
+            key = self.parse_scalar()
+            self.expect(":")
+            hint = size_hints(key, obj) if size_hints is not None else 0
+            obj[key] = self.parse_value(hint)
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("}")
+            return obj
+
+    def _parse_numbers(self, segment):
+        if not segment.strip():
+            return np.zeros(0)
+        return np.asarray(json.loads("[" + segment + "]"))
+
+    def _parse_flat(self, builder):
+        # Position steht direkt hinter '['; lange Zeilen werden blockweise an ',' zerlegt
+        start_n = builder.n
+        while True:
+            end = self.buf.find("]", self.pos)
+            if end >= 0:
+                builder.extend(self._parse_numbers(self.buf[self.pos:end]))
+                self.pos = end + 1
+                return builder.n - start_n
+            cut = self.buf.rfind(",", self.pos)
+            if cut >= 0:
+                builder.extend(self._parse_numbers(self.buf[self.pos:cut]))
+                self.pos = cut + 1
+            if not self._fill():
+                raise ValueError("Ungültiges JSON: Array nicht abgeschlossen.")
+
+    def parse_array(self, size_hint=0):
+        """
+        Liest ein (verschachteltes, rechteckiges) Zahlen-Array als numpy-Array.
+        """
+        builder = _ArrayBuilder(size_hint)
+        shape = {}
+
+        def parse_level(level):
+            self.expect("[")
+            if self.peek() != "[":
+                length = self._parse_flat(builder)
+                _check_dim(shape, level, length)
+                return
+            count = 0
+            while True:
+                parse_level(level + 1)
+                count += 1
+                if self.peek() == ",":
+                    self.pos += 1
+                    continue
+                self.expect("]")
+                break
+            _check_dim(shape, level, count)
+
+        parse_level(0)
+        return builder.result().reshape([shape[level] for level in range(len(shape))])
+
+def _check_dim(shape, level, length):
+    if level not in shape:
+        shape[level] = length
+    elif shape[level] != length:
+        raise ValueError("Ungültiges Array: Zeilen haben unterschiedliche Längen.")
+
+def _size_hints(key, parsed):
+    n_states, n_actions = parsed.get("n_states"), parsed.get("n_actions")
+    if n_states is None or n_actions is None:
+        return 0
+    if key == "P":
+        return n_states * n_actions * n_states
+    if key == "R":
+        return n_states * n_actions
+    return 0
+
+@instrument_io("json", "write")
+def save_mdp_to_json(mdp, filepath, indent=2, precision=None, compress=None):
     """
     Speichert ein diskretes MDP als JSON-Datei.
-    Für stetige MDPs wird ein Fehler ausgelöst (da Funktionen nicht serialisierbar).
+    P und R werden zeilenweise (eine (s, a)-Zeile nach der anderen) geschrieben,
+    ohne das MDP vorher vollständig in Python-Listen umzuwandeln.
+    Stetige MDPs werden über die Parameter ihrer registrierten Dynamik-/Reward-Funktionen
+    gespeichert; für beliebige andere Funktionen wird ein Fehler ausgelöst.
+
+    - indent: Einrückung je Ebene (None = kompakt in einer Zeile)
+    - precision: Optional, Anzahl Nachkommastellen für Gleitkommazahlen
+    - compress: gzip-komprimiert schreiben; None = automatisch bei Endung ".gz"
     """
     if isinstance(mdp, DiscreteMDP):
-        data = mdp.to_dict()
-        with open(filepath, "w") as f:
-            json.dump(data, f, indent=2)
+        if compress is None:
+            compress = str(filepath).endswith(".gz")
+        with _open_text(filepath, "w", compress) as f:
+            _StreamWriter(f, indent, precision).write_object(_discrete_fields(mdp, precision), 0)
+            f.write("\n")
     elif isinstance(mdp, ContinuousMDP):
-        raise NotImplementedError("ContinuousMDP kann nicht als JSON gespeichert werden (Funktionen sind nicht serialisierbar).")
+        if not mdp.is_serializable:
+            raise NotImplementedError("ContinuousMDP kann nur mit registrierten Dynamik-/Reward-Funktionen als JSON gespeichert werden.")
+        if compress is None:
+            compress = str(filepath).endswith(".gz")
+        with _open_text(filepath, "w", compress) as f:
+            _StreamWriter(f, indent, precision).write_object(_continuous_fields(mdp), 0)
+            f.write("\n")
     else:
         raise TypeError("Unbekannter MDP-Typ.")
 
-def load_mdp_from_json(filepath):
+@instrument_io("json", "read")
+def load_mdp_from_json(filepath, validate=False):
     """
-    Lädt ein diskretes MDP aus einer JSON-Datei.
+    Lädt ein MDP aus einer (optional gzip-komprimierten) JSON-Datei.
+    P und R werden zeilenweise direkt in numpy-Arrays eingelesen.
+    validate: Wenn True, wird ein diskretes MDP vollständig geprüft (siehe DiscreteMDP.validate);
+              bei mit precision gespeicherten Dateien wächst die Toleranz der Zeilensummen
+              entsprechend der Rundung.
     """
-    with open(filepath, "r") as f:
-        data = json.load(f)
+    with _open_text(filepath, "r", _is_gzip(filepath)) as f:
+        data = _StreamReader(f).parse_object(size_hints=_size_hints)
     if data.get("type") == "discrete":
-        return DiscreteMDP.from_dict(data)
+        if isinstance(data["P"], dict):
+            P = SparseTransitions.from_dict(data["P"], data["n_states"], data["n_actions"])
+        else:
+            P = data["P"].astype(np.float64, copy=False)
+        mdp = DiscreteMDP(data["n_states"], data["n_actions"], P, data["R"], data["gamma"], copy=False)
+        if validate:
+            mdp.validate(atol=_rounding_atol(data))
+        return mdp
     elif data.get("type") == "continuous":
-        raise NotImplementedError("ContinuousMDP kann nicht aus JSON geladen werden (Funktionen fehlen).")
+        return ContinuousMDP.from_dict(data)
     else:
         raise ValueError("Unbekannter oder nicht unterstützter MDP-Typ in Datei.")
 
@@ -44,3 +348,7 @@ if __name__ == "__main__":
     loaded_mdp = load_mdp_from_json(save_path)
     print("Geladenes MDP, erster Zustand:", loaded_mdp.reset())
     os.remove(save_path)
+
+    save_mdp_to_json(mdp, save_path + ".gz", indent=None, precision=4)
+    print("Komprimiert:", os.path.getsize(save_path + ".gz"), "Bytes")
+    os.remove(save_path + ".gz")
@@ -4,7 +4,9 @@ import pickle
 import os
 from mdp_framework.core.discrete import DiscreteMDP
 from mdp_framework.core.continuous import ContinuousMDP
+from mdp_framework.utils.instrumentation import instrument_io
 
+@instrument_io("pickle", "write")
 def save_mdp_to_pickle(mdp, filepath):
     """
     Speichert beliebige MDP-Objekte (diskret oder stetig) als Pickle-Datei.
@@ -14,14 +16,18 @@ def save_mdp_to_pickle(mdp, filepath):
     with open(filepath, "wb") as f:
         pickle.dump(mdp, f)
 
-def load_mdp_from_pickle(filepath):
+@instrument_io("pickle", "read")
+def load_mdp_from_pickle(filepath, validate=False):
     """
     Lädt beliebige MDP-Objekte (diskret oder stetig) aus einer Pickle-Datei.
+    validate: Wenn True, wird ein diskretes MDP vollständig geprüft (siehe DiscreteMDP.validate).
     """
     with open(filepath, "rb") as f:
         mdp = pickle.load(f)
     if not isinstance(mdp, (DiscreteMDP, ContinuousMDP)):
         raise TypeError("Geladenes Objekt ist kein gültiges MDP.")
+    if validate and isinstance(mdp, DiscreteMDP):
+        mdp.validate()
     return mdp
 
 # Mini-Test
@@ -0,0 +1,262 @@
+# mdp_framework/io/trajectory_io.py
+
+import json
+import os
+import numpy as np
+from mdp_framework.utils.sampling import get_rng
+
+# Spalten eines Trajektorien-Speichers: s, a, r, s', done
+COLUMNS = ("s", "a", "r", "s_next", "done")
+INDEX_FILE = "index.json"
+# Länge je angehängtem Block als int64, fortlaufend angehängt (der Index bleibt konstant groß)
+CHUNKS_FILE = "chunks.bin"
+
+def _column_path(path, name):
+    return os.path.join(path, f"{name}.bin")
+
+def _write_index(path, index):
+    # Atomar ersetzen, damit ein Abbruch nie einen halb geschriebenen Index hinterlässt
+    tmp_path = os.path.join(path, INDEX_FILE + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(index, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, os.path.join(path, INDEX_FILE))
+
+def _read_index(path):
+    with open(os.path.join(path, INDEX_FILE), "r") as f:
+        return json.load(f)
+
+def _read_chunks(path, index):
+    """
+    Blöcke als Array (n_chunks, 2) mit Startzeile und Länge; ältere Speicher (Version 1)
+    führen die Blöcke noch als Liste im Index.
+    """
+    if "chunks" in index:
+        return np.array(index["chunks"], dtype=np.int64).reshape(-1, 2)
+    lengths = np.fromfile(os.path.join(path, CHUNKS_FILE), dtype=np.int64, count=index["n_chunks"])
+    return np.column_stack([np.cumsum(lengths) - lengths, lengths])
+
+class TrajectoryWriter:
+    """
+    Append-only Trajektorien-Speicher: ein Verzeichnis mit einer Rohdatei fester dtype je Spalte
+    (s, a, r, s_next, done), einer Datei mit den Längen der angehängten Blöcke und einem
+    kleinen Index (Zeilen- und Blockzahl, Spalten-Layout) fester Größe.
+    append schreibt nur gepuffert; erst sync() (explizit, alle sync_every Zeilen oder in
+    close()) bringt die Daten per flush + fsync auf die Platte und ersetzt danach den Index
+    atomar. Der Index zeigt damit nur synchronisierte Daten; alles dahinter (z.B. nach
+    einem Absturz) wird beim Wiederöffnen verworfen.
+    """
+
+    def __init__(self, path, state_shape=None, action_shape=None, state_dtype=None,
+                 action_dtype=None, mode="w", sync_every=None):
+        """
+        path: Verzeichnis des Speichers
+        state_shape, action_shape: Shape eines einzelnen Zustands bzw. einer Aktion (Standard: ())
+        state_dtype, action_dtype: dtypes der Zustands- und Aktionsspalten (Standard: int64)
+        mode: "w" legt einen neuen Speicher an, "a" hängt an einen bestehenden an; dort
+              müssen angegebene Shapes/dtypes zum gespeicherten Layout passen
+        sync_every: nach so vielen ungesicherten Zeilen automatisch sync() aufrufen
+                    (None: nur bei explizitem sync() und in close())
+        """
+        if sync_every is not None and sync_every < 1:
+            raise ValueError("sync_every muss mindestens 1 sein.")
+        self.path = path
+        self.sync_every = sync_every
+        if mode == "a" and os.path.exists(os.path.join(path, INDEX_FILE)):
+            self.index = _read_index(path)
+            columns = self.index["columns"]
+            requested = {"s": (state_shape, state_dtype), "a": (action_shape, action_dtype)}
+            for name, (shape, dtype) in requested.items():
+                if shape is not None and list(shape) != list(columns[name]["shape"]):
+                    raise ValueError(f"Spalte {name} hat im Speicher Shape {tuple(columns[name]['shape'])}, "
+                                     f"angegeben wurde {tuple(shape)}")
+                if dtype is not None and np.dtype(dtype) != np.dtype(columns[name]["dtype"]):
+                    raise ValueError(f"Spalte {name} hat im Speicher dtype {np.dtype(columns[name]['dtype'])}, "
+                                     f"angegeben wurde {np.dtype(dtype)}")
+            if "chunks" in self.index:
+                # Speicher der Version 1: Blockliste aus dem Index in die Blockdatei übernehmen
+                _read_chunks(path, self.index)[:, 1].tofile(os.path.join(path, CHUNKS_FILE))
+                self.index["n_chunks"] = len(self.index.pop("chunks"))
+                self.index["version"] = 2
+                _write_index(path, self.index)
+            # Unvollständig geschriebene Zeilen und Blöcke hinter dem Index abschneiden
+            for name, info in self.index["columns"].items():
+                row_bytes = np.dtype(info["dtype"]).itemsize * int(np.prod(info["shape"], dtype=np.int64))
+                with open(_column_path(path, name), "r+b") as f:
+                    f.truncate(self.index["n_rows"] * row_bytes)
+            with open(os.path.join(path, CHUNKS_FILE), "r+b") as f:
+                f.truncate(self.index["n_chunks"] * np.dtype(np.int64).itemsize)
+        elif mode in ("w", "a"):
+            os.makedirs(path, exist_ok=True)
+            state_shape = list(state_shape) if state_shape is not None else []
+            action_shape = list(action_shape) if action_shape is not None else []
+            state_dtype = np.int64 if state_dtype is None else state_dtype
+            action_dtype = np.int64 if action_dtype is None else action_dtype
+            self.index = {
+                "version": 2,
+                "n_rows": 0,
+                "n_chunks": 0,
+                "columns": {
+                    "s": {"dtype": np.dtype(state_dtype).str, "shape": state_shape},
+                    "a": {"dtype": np.dtype(action_dtype).str, "shape": action_shape},
+                    "r": {"dtype": np.dtype(np.float64).str, "shape": []},
+                    "s_next": {"dtype": np.dtype(state_dtype).str, "shape": state_shape},
+                    "done": {"dtype": np.dtype(bool).str, "shape": []},
+                }
+            }
+            for name in COLUMNS:
+                open(_column_path(path, name), "wb").close()
+            open(os.path.join(path, CHUNKS_FILE), "wb").close()
+            _write_index(path, self.index)
+        else:
+            raise ValueError(f"Unbekannter Modus: {mode}")
+        self._files = {name: open(_column_path(path, name), "ab") for name in COLUMNS}
+        self._chunks_file = open(os.path.join(path, CHUNKS_FILE), "ab")
+        self._pending_rows = 0
+        self._pending_chunks = 0
+
+    def __len__(self):
+        """Anzahl aller angehängten Zeilen, auch der noch nicht synchronisierten."""
+        return self.index["n_rows"] + self._pending_rows
+
+    def append(self, states, actions, rewards, next_states, dones):
+        """
+        Hängt n Übergänge an; alle Argumente haben n Zeilen (bzw. die Spalten-Shape dahinter).
+        """
+        values = dict(zip(COLUMNS, (states, actions, rewards, next_states, dones)))
+        n = None
+        arrays = {}
+        for name, info in self.index["columns"].items():
+            arr = np.ascontiguousarray(values[name], dtype=np.dtype(info["dtype"]))
+            if arr.shape[1:] != tuple(info["shape"]):
+                raise ValueError(f"Spalte {name} muss Zeilen-Shape {tuple(info['shape'])} haben, hat aber {arr.shape[1:]}")
+            if n is None:
+                n = arr.shape[0]
+            elif arr.shape[0] != n:
+                raise ValueError("Alle Spalten müssen gleich viele Zeilen haben.")
+            arrays[name] = arr
+        if not n:
+            return
+        for name, arr in arrays.items():
+            self._files[name].write(memoryview(arr).cast("B"))
+        self._chunks_file.write(np.int64(n).tobytes())
+        self._pending_rows += n
+        self._pending_chunks += 1
+        if self.sync_every is not None and self._pending_rows >= self.sync_every:
+            self.sync()
+
+    def sync(self):
+        """
+        Schreibt alle gepufferten Daten auf die Platte (flush + fsync) und macht sie danach
+        über den atomar ersetzten Index sichtbar.
+        """
+        if not self._pending_chunks:
+            return
+        # Erst wenn die Daten auf der Platte sind, darf der Index sie sichtbar machen
+        for f in list(self._files.values()) + [self._chunks_file]:
+            f.flush()
+            os.fsync(f.fileno())
+        self.index["n_rows"] += self._pending_rows
+        self.index["n_chunks"] += self._pending_chunks
+        self._pending_rows = 0
+        self._pending_chunks = 0
+        _write_index(self.path, self.index)
+
+    flush = sync
+
+    def append_batch(self, traj):
+        """
+        Hängt ein TrajectoryBatch (aus utils.rollout) an; Episoden werden zeilenweise abgeflacht.
+        """
+        n = traj.n_episodes * traj.horizon
+        self.append(traj.states.reshape((n,) + traj.states.shape[2:]),
+                    traj.actions.reshape((n,) + traj.actions.shape[2:]),
+                    traj.rewards.reshape(n),
+                    traj.next_states.reshape((n,) + traj.next_states.shape[2:]),
+                    traj.dones.reshape(n))
+
+    def close(self):
+        if self._files:
+            self.sync()
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+        if self._chunks_file is not None:
+            self._chunks_file.close()
+            self._chunks_file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class TrajectoryReader:
+    """
+    Liest einen Trajektorien-Speicher per np.memmap: Zugriff ohne Kopie, auch auf
+    Dateien, die größer als der Arbeitsspeicher sind.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.index = _read_index(path)
+        self._chunks = None
+        n_rows = self.index["n_rows"]
+        self.columns = {}
+        for name, info in self.index["columns"].items():
+            shape = (n_rows,) + tuple(info["shape"])
+            dtype = np.dtype(info["dtype"])
+            if n_rows == 0:
+                self.columns[name] = np.zeros(shape, dtype=dtype)
+            else:
+                self.columns[name] = np.memmap(_column_path(path, name), dtype=dtype, mode="r", shape=shape)
+
+    def __len__(self):
+        return self.index["n_rows"]
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    @property
+    def chunks(self):
+        """
+        Liste der angehängten Blöcke als (Startzeile, Länge).
+        """
+        if self._chunks is None:
+            self._chunks = _read_chunks(self.path, self.index)
+        return [(int(start), int(length)) for start, length in self._chunks]
+
+    def sample(self, batch_size, rng=None):
+        """
+        Zieht batch_size zufällige Übergänge (mit Zurücklegen); kopiert werden nur diese Zeilen.
+        """
+        if len(self) == 0:
+            raise ValueError("Trajektorien-Speicher ist leer.")
+        idx = np.sort(get_rng(rng).integers(len(self), size=batch_size))
+        return {name: col[idx] for name, col in self.columns.items()}
+
+    def iter_chunks(self, chunk_size=65536):
+        """
+        Sequentieller Durchlauf in Blöcken von chunk_size Zeilen (Views ohne Kopie).
+        """
+        for start in range(0, len(self), chunk_size):
+            yield {name: col[start:start + chunk_size] for name, col in self.columns.items()}
+
+# Mini-Test
+if __name__ == "__main__":
+    import shutil
+    from mdp_framework.generators.discrete_generator import random_discrete_mdp
+    from mdp_framework.utils.rollout import iter_rollouts
+
+    mdp = random_discrete_mdp(10, 3)
+    store_path = "test_trajectories"
+    with TrajectoryWriter(store_path) as writer:
+        for traj in iter_rollouts(mdp, None, horizon=50, n_episodes=200, batch_size=64):
+            writer.append_batch(traj)
+    reader = TrajectoryReader(store_path)
+    print("Übergänge:", len(reader), "Blöcke:", len(reader.chunks))
+    batch = reader.sample(5)
+    print("Minibatch s:", batch["s"], "r:", np.round(batch["r"], 2))
+    del reader
+    shutil.rmtree(store_path)
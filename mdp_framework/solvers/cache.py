@@ -0,0 +1,254 @@
+# mdp_framework/solvers/cache.py
+
+import hashlib
+import io
+import json
+import os
+from collections import OrderedDict
+import numpy as np
+from mdp_framework import config
+from mdp_framework.core.sparse import SparseTransitions
+
+# Bytes pro Block beim Hashen; begrenzt den Zwischenspeicher auch bei np.memmap
+HASH_CHUNK_BYTES = 1 << 24
+CACHE_SUFFIX = ".npz"
+
+def _update_with_array(h, array):
+    """
+    Hasht dtype, Shape und Inhalt von array blockweise (zeilenweise über die erste Achse).
+    """
+    array = np.asanyarray(array)
+    h.update(f"{array.dtype.str}{array.shape}".encode())
+    if array.ndim == 0 or array.size == 0:
+        h.update(np.ascontiguousarray(array).tobytes())
+        return
+    rows = max(1, HASH_CHUNK_BYTES // max(1, array[0].nbytes))
+    for start in range(0, array.shape[0], rows):
+        h.update(np.ascontiguousarray(array[start:start + rows]).data)
+
+def mdp_fingerprint(mdp):
+    """
+    Inhalts-Hash (blake2b, 128 Bit) über P, R, gamma und die Dimensionen eines diskreten MDPs.
+    Gleicher Inhalt ergibt denselben Hash, unabhängig von Datei, Format oder Objekt;
+    dichtes und dünn besetztes P mit gleichen Werten werden jedoch unterschieden.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"discrete:{mdp.n_states}:{mdp.n_actions}:{float(mdp.gamma)!r}".encode())
+    if isinstance(mdp.P, SparseTransitions):
+        h.update(b"csr")
+        for array in (mdp.P.indptr, mdp.P.indices, mdp.P.data):
+            _update_with_array(h, array)
+    else:
+        h.update(b"dense")
+        _update_with_array(h, mdp.P)
+    _update_with_array(h, mdp.R)
+    return h.hexdigest()
+
+def _hash_param(h, value):
+    if isinstance(value, np.ndarray):
+        _update_with_array(h, value)
+    else:
+        h.update(repr(value).encode())
+
+def solution_key(mdp, method, params=None):
+    """
+    Cache-Schlüssel aus dem Inhalts-Hash des MDPs, dem Verfahren und seinen Parametern.
+    Array-Parameter (z.B. eine Policy) gehen mit ihrem Inhalt ein.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(mdp_fingerprint(mdp).encode())
+    h.update(method.encode())
+    for name, value in sorted((params or {}).items()):
+        h.update(name.encode())
+        _hash_param(h, value)
+    return h.hexdigest()
+
+def _to_bytes(result):
+    buffer = io.BytesIO()
+    meta = {"iterations": result.iterations, "residual": result.residual, "wall_time": result.wall_time,
+            "converged": result.converged, "method": result.method}
+    np.savez(buffer, V=result.V, Q=result.Q, policy=result.policy, meta=np.array(json.dumps(meta)))
+    return buffer.getvalue()
+
+def _from_file(filepath):
+    from mdp_framework.solvers.dynamic_programming import SolverResult
+    with np.load(filepath) as data:
+        meta = json.loads(str(data["meta"]))
+        return SolverResult(data["V"], data["Q"], data["policy"], meta["iterations"], meta["residual"],
+                            meta["wall_time"], meta["converged"], meta["method"])
+
+def _freeze(result):
+    """
+    Kopiert die Arrays des Ergebnisses schreibgeschützt, da Cache-Treffer geteilt werden.
+    """
+    from mdp_framework.solvers.dynamic_programming import SolverResult
+    arrays = []
+    for array in (result.V, result.Q, result.policy):
+        array = np.array(array)
+        array.flags.writeable = False
+        arrays.append(array)
+    return SolverResult(*arrays, result.iterations, result.residual, result.wall_time,
+                        result.converged, result.method)
+
+class SolutionCache:
+    """
+    Zweistufiger Cache für SolverResults (V, Q, Policy und Statistiken):
+    - Speicher: LRU mit höchstens memory_entries Einträgen
+    - Platte: eine .npz-Datei pro Schlüssel unter path, insgesamt höchstens max_bytes;
+      beim Überschreiten werden die am längsten nicht genutzten Dateien (mtime) gelöscht
+    disk=False schaltet die Plattenstufe ab. Zurückgegebene Arrays sind schreibgeschützt.
+    """
+
+    def __init__(self, path=None, max_bytes=None, memory_entries=None, disk=True):
+        """
+        path, max_bytes, memory_entries: None übernimmt beim Anlegen config.CACHE_PATH,
+            config.CACHE_MAX_BYTES bzw. config.CACHE_MEMORY_ENTRIES
+        disk: False hält Ergebnisse nur im Speicher
+        """
+        self.path = (config.CACHE_PATH if path is None else path) if disk else None
+        self.max_bytes = int(config.CACHE_MAX_BYTES if max_bytes is None else max_bytes)
+        self.memory_entries = int(config.CACHE_MEMORY_ENTRIES if memory_entries is None else memory_entries)
+        self._memory = OrderedDict()
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+
+    def _file(self, key):
+        return os.path.join(self.path, key + CACHE_SUFFIX)
+
+    def _remember(self, key, result):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        """
+        Gibt das gespeicherte SolverResult zu key zurück oder None.
+        """
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits["memory"] += 1
+            return self._memory[key]
+        if self.path is not None:
+            filepath = self._file(key)
+            try:
+                result = _freeze(_from_file(filepath))
+                os.utime(filepath)  # für die LRU-Verdrängung auf der Platte
+            except (OSError, ValueError, KeyError):
+                result = None
+            if result is not None:
+                self.hits["disk"] += 1
+                self._remember(key, result)
+                return result
+        self.misses += 1
+        return None
+
+    def put(self, key, result):
+        """
+        Legt result unter key ab (Speicher und, falls aktiviert, Platte) und gibt
+        die schreibgeschützte Kopie zurück.
+        """
+        result = _freeze(result)
+        self._remember(key, result)
+        if self.path is not None:
+            payload = _to_bytes(result)
+            if len(payload) <= self.max_bytes:
+                os.makedirs(self.path, exist_ok=True)
+                tmp_path = f"{self._file(key)}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp_path, self._file(key))
+                self._evict_disk()
+        return result
+
+    def _disk_entries(self):
+        entries = []
+        if self.path is None or not os.path.isdir(self.path):
+            return entries
+        for name in os.listdir(self.path):
+            if name.endswith(CACHE_SUFFIX):
+                try:
+                    st = os.stat(os.path.join(self.path, name))
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, name))
+        return entries
+
+    @property
+    def disk_bytes(self):
+        return sum(size for _, size, _ in self._disk_entries())
+
+    def _evict_disk(self):
+        entries = sorted(self._disk_entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.path, name))
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self, disk=True):
+        """
+        Leert den Speicher und optional die Plattenstufe.
+        """
+        self._memory.clear()
+        if disk:
+            for _, _, name in self._disk_entries():
+                try:
+                    os.remove(os.path.join(self.path, name))
+                except OSError:
+                    pass
+
+    def solve(self, mdp, solver, **params):
+        """
+        Gibt solver(mdp, **params) zurück und rechnet nur, wenn für denselben MDP-Inhalt,
+        dasselbe Verfahren und dieselben Parameter noch kein Ergebnis vorliegt.
+        """
+        key = solution_key(mdp, f"{solver.__module__}.{solver.__name__}", params)
+        result = self.get(key)
+        if result is None:
+            result = self.put(key, solver(mdp, **params))
+        return result
+
+    def __repr__(self):
+        return (f"SolutionCache(path={self.path!r}, memory={len(self._memory)}/{self.memory_entries}, "
+                f"hits={self.hits}, misses={self.misses})")
+
+_default_cache = None
+
+def default_cache():
+    """
+    Prozessweiter SolutionCache unter config.CACHE_PATH (wird beim ersten Aufruf angelegt).
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = SolutionCache()
+    return _default_cache
+
+def cached_solve(mdp, solver, cache=None, **params):
+    """
+    Wie solver(mdp, **params), aber über cache (Standard: default_cache()) zwischengespeichert.
+    """
+    return (cache if cache is not None else default_cache()).solve(mdp, solver, **params)
+
+# Mini-Test
+if __name__ == "__main__":
+    import tempfile
+    import time
+    from mdp_framework.generators.discrete_generator import random_discrete_mdp
+    from mdp_framework.solvers.dynamic_programming import value_iteration
+
+    mdp = random_discrete_mdp(500, 5, gamma=0.95, rng=0)
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SolutionCache(tmp)
+        for label in ("kalt", "Speicher"):
+            start = time.perf_counter()
+            cache.solve(mdp, value_iteration, tol=1e-8)
+            print(f"{label}: {time.perf_counter() - start:.4f}s")
+        start = time.perf_counter()
+        SolutionCache(tmp).solve(mdp, value_iteration, tol=1e-8)
+        print(f"Platte: {time.perf_counter() - start:.4f}s")
+        print(cache, "Plattenbelegung:", cache.disk_bytes, "Bytes")
@@ -0,0 +1,138 @@
+# mdp_framework/solvers/dynamic_programming.py
+
+import time
+import numpy as np
+from mdp_framework.solvers.evaluation import policy_model, policy_backup, evaluate_policy
+
+class SolverResult:
+    """
+    Ergebnis eines Planungsverfahrens: Wertefunktion, Q-Tabelle, greedy Policy
+    und Konvergenzstatistiken.
+    """
+
+    def __init__(self, V, Q, policy, iterations, residual, wall_time, converged, method):
+        self.V = V
+        self.Q = Q
+        self.policy = policy
+        self.iterations = int(iterations)
+        self.residual = float(residual)
+        self.wall_time = float(wall_time)
+        self.converged = bool(converged)
+        self.method = method
+
+    def stats(self):
+        """
+        Gibt die Konvergenzstatistiken als dict zurück.
+        """
+        return {
+            "method": self.method,
+            "iterations": self.iterations,
+            "residual": self.residual,
+            "wall_time": self.wall_time,
+            "converged": self.converged
+        }
+
+    def __repr__(self):
+        return (f"SolverResult(method={self.method!r}, iterations={self.iterations}, "
+                f"residual={self.residual:.3g}, wall_time={self.wall_time:.3f}s, converged={self.converged})")
+
+def expected_values(mdp, V):
+    """
+    Erwartungswert sum_s' P[s, a, s'] * V[s'] für alle (s, a) in einem Matrixprodukt.
+    """
+    if mdp.is_sparse:
+        return mdp.P.dot(V)
+    return (mdp.P.reshape(mdp.n_states * mdp.n_actions, mdp.n_states) @ V).reshape(mdp.n_states, mdp.n_actions)
+
+def q_values(mdp, V):
+    """
+    Bellman-Backup Q[s, a] = R[s, a] + gamma * sum_s' P[s, a, s'] * V[s'].
+    """
+    return mdp.R + mdp.gamma * expected_values(mdp, V)
+
+def value_iteration(mdp, tol=1e-6, max_iter=10000, V0=None):
+    """
+    Wertiteration mit vektorisierten Bellman-Backups über den gesamten Tensor.
+    Abbruch, sobald max |V_k+1 - V_k| < tol oder nach max_iter Iterationen.
+    """
+    start = time.perf_counter()
+    V = np.zeros(mdp.n_states) if V0 is None else np.array(V0, dtype=np.float64)
+    residual = np.inf
+    iterations = 0
+    while iterations < max_iter:
+        Q = q_values(mdp, V)
+        V_new = Q.max(axis=1)
+        residual = np.max(np.abs(V_new - V))
+        V = V_new
+        iterations += 1
+        if residual < tol:
+            break
+    Q = q_values(mdp, V)
+    return SolverResult(V, Q, Q.argmax(axis=1), iterations, residual,
+                        time.perf_counter() - start, residual < tol, "value_iteration")
+
+def policy_iteration(mdp, tol=1e-6, max_iter=1000, policy0=None, max_eval_sweeps=10000):
+    """
+    Policy-Iteration: exakte Policy-Bewertung mit evaluate_policy (direkt bzw. Krylov
+    mit Warmstart vom vorherigen V), danach greedy Verbesserung, bis sich die Policy
+    nicht mehr ändert. max_eval_sweeps begrenzt die Iterationen je Bewertung; ist eine
+    Bewertung nicht konvergiert (RuntimeWarning), gilt auch das Ergebnis als nicht konvergiert.
+    """
+    start = time.perf_counter()
+    policy = np.zeros(mdp.n_states, dtype=np.int64) if policy0 is None else np.array(policy0, dtype=np.int64)
+    states = np.arange(mdp.n_states)
+    V = np.zeros(mdp.n_states)
+    residual = np.inf
+    iterations = 0
+    converged = False
+    evaluations_converged = True
+    while iterations < max_iter:
+        evaluation = evaluate_policy(mdp, policy, tol=min(tol, 1e-8), max_iter=max_eval_sweeps, V0=V)
+        V = evaluation.V
+        evaluations_converged &= bool(evaluation.converged)
+        Q = q_values(mdp, V)
+        residual = np.max(Q.max(axis=1) - V)
+        iterations += 1
+        # Nur wechseln, wenn die neue Aktion echt besser ist (verhindert Zyklen bei Gleichstand)
+        greedy = Q.argmax(axis=1)
+        improve = Q[states, greedy] > Q[states, policy] + tol
+        if not improve.any():
+            converged = evaluations_converged
+            break
+        policy = np.where(improve, greedy, policy)
+    Q = q_values(mdp, V)
+    return SolverResult(V, Q, policy, iterations, residual,
+                        time.perf_counter() - start, converged, "policy_iteration")
+
+def modified_policy_iteration(mdp, tol=1e-6, max_iter=10000, n_eval_sweeps=20, V0=None):
+    """
+    Modifizierte Policy-Iteration: greedy Verbesserung gefolgt von n_eval_sweeps
+    partiellen Bewertungs-Backups mit fester Policy.
+    """
+    start = time.perf_counter()
+    V = np.zeros(mdp.n_states) if V0 is None else np.array(V0, dtype=np.float64)
+    residual = np.inf
+    iterations = 0
+    while iterations < max_iter:
+        Q = q_values(mdp, V)
+        policy = Q.argmax(axis=1)
+        V_new = Q.max(axis=1)
+        residual = np.max(np.abs(V_new - V))
+        V = V_new
+        iterations += 1
+        if residual < tol:
+            break
+        P_pi, R_pi = policy_model(mdp, policy)
+        for _ in range(n_eval_sweeps):
+            V = policy_backup(P_pi, R_pi, mdp.gamma, V)
+    Q = q_values(mdp, V)
+    return SolverResult(V, Q, Q.argmax(axis=1), iterations, residual,
+                        time.perf_counter() - start, residual < tol, "modified_policy_iteration")
+
+# Mini-Test
+if __name__ == "__main__":
+    from mdp_framework.generators.discrete_generator import random_discrete_mdp
+    mdp = random_discrete_mdp(200, 5, gamma=0.95)
+    for solver in (value_iteration, policy_iteration, modified_policy_iteration):
+        result = solver(mdp)
+        print(result, "V[:3] =", np.round(result.V[:3], 4))
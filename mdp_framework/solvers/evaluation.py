@@ -0,0 +1,167 @@
+# mdp_framework/solvers/evaluation.py
+
+import time
+import warnings
+import numpy as np
+from mdp_framework.core.sparse import SparseTransitions
+
+# Bis zu dieser Zustandszahl wählt method="auto" die direkte (dichte) Lösung
+DIRECT_MAX_STATES = 2000
+# Mindestversion von scipy für die Krylov-Verfahren (Parameter rtol)
+SCIPY_MIN_VERSION = (1, 12)
+# Innere Iterationen je GMRES-Neustart (scipy-Standard)
+GMRES_RESTART = 20
+
+def policy_model(mdp, policy):
+    """
+    Gibt (P_pi, R_pi) einer Policy zurück, per vektorisiertem Gather aus P und R.
+    policy: Array (n_states,) deterministisch oder (n_states, n_actions) stochastisch.
+    P_pi ist dicht (n_states, n_states) bzw. SparseTransitions mit einer Aktion.
+    """
+    policy = np.asarray(policy)
+    states = np.arange(mdp.n_states)
+    if policy.ndim == 1:
+        policy = policy.astype(np.int64)
+        if mdp.is_sparse:
+            P_pi = mdp.P.policy_matrix(policy)
+        else:
+            P_pi = mdp.P[states, policy]
+        return P_pi, mdp.R[states, policy]
+    if policy.shape != (mdp.n_states, mdp.n_actions):
+        raise ValueError(f"Stochastische Policy muss Shape {(mdp.n_states, mdp.n_actions)} haben, hat aber {policy.shape}")
+    if mdp.is_sparse:
+        row_ids = mdp.P.row_ids()
+        P_pi = SparseTransitions.from_coo(mdp.n_states, 1, row_ids // mdp.n_actions, mdp.P.indices,
+                                          mdp.P.data * policy.ravel()[row_ids])
+    else:
+        P_pi = np.einsum("sa,sat->st", policy, mdp.P)
+    return P_pi, (policy * mdp.R).sum(axis=1)
+
+def policy_backup(P_pi, R_pi, gamma, V):
+    """
+    Ein Bewertungs-Backup R_pi + gamma * P_pi V.
+    """
+    if isinstance(P_pi, np.ndarray):
+        return R_pi + gamma * (P_pi @ V)
+    return R_pi + gamma * P_pi.dot(V)[:, 0]
+
+def _scipy_version_ok(version):
+    parts = []
+    for part in version.split(".")[:2]:
+        digits = "".join(ch for ch in part if ch.isdigit())
+        parts.append(int(digits) if digits else 0)
+    return tuple(parts) >= SCIPY_MIN_VERSION
+
+def _scipy_available():
+    try:
+        import scipy
+        import scipy.sparse.linalg  # noqa: F401
+    except ImportError:
+        return False
+    return _scipy_version_ok(scipy.__version__)
+
+def _as_scipy_operator(P_pi, gamma):
+    from scipy.sparse import csr_matrix, identity
+
+    n_states = P_pi.shape[0]
+    if isinstance(P_pi, np.ndarray):
+        return np.eye(n_states) - gamma * P_pi
+    P = csr_matrix((P_pi.data, P_pi.indices, P_pi.indptr), shape=(n_states, n_states))
+    return (identity(n_states, format="csr") - gamma * P).tocsr()
+
+def _solve_krylov(method, P_pi, R_pi, gamma, V0, tol, max_iter):
+    """
+    Löst mit GMRES bzw. BiCGSTAB; max_iter zählt (innere) Iterationen. scipy zählt bei
+    GMRES in maxiter dagegen Neustart-Zyklen zu je GMRES_RESTART Iterationen.
+    """
+    if not _scipy_available():
+        raise ImportError(f"method='{method}' benötigt scipy >= {'.'.join(map(str, SCIPY_MIN_VERSION))} "
+                          "(pip install MDPFramework[scipy]).")
+    from scipy.sparse.linalg import gmres, bicgstab
+
+    A = _as_scipy_operator(P_pi, gamma)
+    counter = {"iterations": 0}
+
+    def callback(_):
+        counter["iterations"] += 1
+
+    if method == "gmres":
+        V, info = gmres(A, R_pi, x0=V0, rtol=tol, atol=0.0, restart=GMRES_RESTART,
+                        maxiter=max(1, -(-max_iter // GMRES_RESTART)),
+                        callback=callback, callback_type="pr_norm")
+    else:
+        V, info = bicgstab(A, R_pi, x0=V0, rtol=tol, atol=0.0, maxiter=max_iter, callback=callback)
+    return V, counter["iterations"], info == 0
+
+def _solve_iterative(P_pi, R_pi, gamma, V, tol, max_iter):
+    iterations = 0
+    converged = False
+    while not converged and iterations < max_iter:
+        V_new = policy_backup(P_pi, R_pi, gamma, V)
+        iterations += 1
+        delta = np.max(np.abs(V_new - V))
+        V = V_new
+        converged = delta <= tol * max(np.max(np.abs(V)), 1.0)
+    return V, iterations, converged
+
+def evaluate_policy(mdp, policy, method="auto", tol=1e-8, max_iter=10000, V0=None):
+    """
+    Exakte Policy-Bewertung: löst (I - gamma P_pi) V = R_pi.
+
+    - method: "direct" (dichte LU-Zerlegung), "gmres"/"bicgstab" (Krylov-Verfahren
+      aus scipy, dünn besetzt), "iterative" (Fixpunkt-Iteration ohne scipy) oder "auto"
+      (direkt bis DIRECT_MAX_STATES Zustände, sonst GMRES bzw. iterativ ohne scipy)
+    - tol: relative Toleranz der iterativen Verfahren (Krylov: bezogen auf |R_pi|,
+      iterativ: Änderung pro Sweep bezogen auf max |V|)
+    - max_iter: Höchstzahl Iterationen der iterativen Verfahren (bei GMRES innere
+      Iterationen, nicht Neustart-Zyklen)
+    - V0: Optional, Startwert (Warmstart) für die iterativen Verfahren
+
+    Konvergiert ein Krylov-Verfahren nicht, wird von dessen Ergebnis aus mit der
+    Fixpunkt-Iteration weitergerechnet; bleibt auch diese ohne Konvergenz, wird eine
+    RuntimeWarning ausgegeben (result.converged ist dann False).
+
+    Gibt ein SolverResult mit V, Q^pi, der Policy und dem Residuum
+    max |(I - gamma P_pi) V - R_pi| zurück.
+    """
+    from mdp_framework.solvers.dynamic_programming import SolverResult, q_values
+
+    start = time.perf_counter()
+    if method == "auto":
+        if mdp.n_states <= DIRECT_MAX_STATES:
+            method = "direct"
+        else:
+            method = "gmres" if _scipy_available() else "iterative"
+    P_pi, R_pi = policy_model(mdp, policy)
+    V = np.zeros(mdp.n_states) if V0 is None else np.array(V0, dtype=np.float64)
+    iterations = 1
+    converged = True
+    if method == "direct":
+        P_dense = P_pi if isinstance(P_pi, np.ndarray) else P_pi.to_dense()[:, 0]
+        V = np.linalg.solve(np.eye(mdp.n_states) - mdp.gamma * P_dense, R_pi)
+    elif method in ("gmres", "bicgstab"):
+        V, iterations, converged = _solve_krylov(method, P_pi, R_pi, mdp.gamma, V, tol, max_iter)
+        if not converged:
+            V, extra, converged = _solve_iterative(P_pi, R_pi, mdp.gamma, V, tol, max_iter)
+            iterations += extra
+            method = f"{method}+iterative"
+    elif method == "iterative":
+        V, iterations, converged = _solve_iterative(P_pi, R_pi, mdp.gamma, V, tol, max_iter)
+    else:
+        raise ValueError(f"Unbekannte Methode: {method}")
+    if not converged:
+        warnings.warn(f"evaluate_policy[{method}] nach {iterations} Iterationen nicht konvergiert "
+                      f"(tol={tol}).", RuntimeWarning, stacklevel=2)
+    residual = np.max(np.abs(V - policy_backup(P_pi, R_pi, mdp.gamma, V)))
+    return SolverResult(V, q_values(mdp, V), np.asarray(policy), iterations, residual,
+                        time.perf_counter() - start, converged, f"evaluate_policy[{method}]")
+
+# Mini-Test
+if __name__ == "__main__":
+    from mdp_framework.generators.structured_generator import random_sparse_discrete_mdp
+    mdp = random_sparse_discrete_mdp(20000, 4, n_successors=5, gamma=0.95)
+    policy = np.zeros(mdp.n_states, dtype=np.int64)
+    for method in ("gmres", "bicgstab", "iterative"):
+        print(evaluate_policy(mdp, policy, method=method))
+    uniform = np.full((mdp.n_states, mdp.n_actions), 1.0 / mdp.n_actions)
+    print("Stochastische Policy:", evaluate_policy(mdp, uniform))
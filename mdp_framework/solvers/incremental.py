@@ -0,0 +1,183 @@
+# mdp_framework/solvers/incremental.py
+
+import time
+import numpy as np
+from mdp_framework.solvers.dynamic_programming import SolverResult, q_values, value_iteration
+
+# Zustände pro Block beim Aufbau der Vorgängerliste aus dichtem P
+PREDECESSOR_CHUNK_STATES = 1024
+# Ab diesem Anteil betroffener Zustände ist ein voller Sweep günstiger als die Frontier
+FULL_SWEEP_FRACTION = 0.5
+
+def predecessor_lists(mdp):
+    """
+    Vorgänger jedes Zustands im CSR-Format (indptr, preds): preds[indptr[s']:indptr[s'+1]]
+    sind alle s mit P[s, a, s'] > 0 für irgendein a (ohne Duplikate).
+    """
+    S, A = mdp.n_states, mdp.n_actions
+    if mdp.is_sparse:
+        keys = mdp.P.indices * S + mdp.P.row_ids() // A
+    else:
+        chunks = []
+        for start in range(0, S, PREDECESSOR_CHUNK_STATES):
+            block = np.asarray(mdp.P[start:start + PREDECESSOR_CHUNK_STATES])
+            src, dst = np.nonzero((block != 0).any(axis=1))
+            chunks.append(dst * S + src + start)
+        keys = np.concatenate(chunks)
+    keys = np.unique(keys)
+    indptr = np.zeros(S + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys // S, minlength=S), out=indptr[1:])
+    return indptr, keys % S
+
+def state_q_values(mdp, states, V):
+    """
+    Q-Werte (len(states), n_actions) nur für die Zustände states.
+    """
+    A = mdp.n_actions
+    if mdp.is_sparse:
+        rows = (states[:, None] * A + np.arange(A)).ravel()
+        expected = mdp.P.dot_rows(rows, V).reshape(states.shape[0], A)
+    else:
+        expected = np.asarray(mdp.P[states]) @ V
+    return mdp.R[states] + mdp.gamma * expected
+
+class IncrementalSolver:
+    """
+    Wertiteration mit inkrementellem Neu-Lösen nach Modelländerungen.
+
+    Der erste Aufruf von solve() löst das MDP vollständig. Danach werden nur die seit
+    dem letzten Lösen geänderten (s, a)-Zeilen (siehe DiscreteMDP.set_transitions,
+    set_reward, mark_dirty) berücksichtigt: ausgehend vom bisherigen V werden zuerst
+    die betroffenen Zustände neu bewertet und Änderungen > tol * (1 - gamma) anschließend nur an
+    deren Vorgänger weitergegeben. Zum Schluss prüft ein voller Bellman-Backup das
+    Residuum; liegt es noch über tol oder betrifft die Frontier mehr als
+    FULL_SWEEP_FRACTION aller Zustände, wird mit Wertiteration (Warmstart) weitergelöst.
+
+    Die Änderungsmarkierung gehört zum MDP; pro MDP sollte daher nur ein
+    IncrementalSolver verwendet werden.
+    """
+
+    def __init__(self, mdp, tol=1e-6, max_iter=10000):
+        self.mdp = mdp
+        self.tol = tol
+        self.max_iter = max_iter
+        self.V = None
+        self.result = None
+        self.n_backups = 0  # Zustands-Backups im letzten solve()
+        self._gamma = None
+        self._preds = None
+        # Kanten (Nachfolger, Vorgänger) aus geänderten Zeilen, die in self._preds noch fehlen
+        self._extra_succ = np.zeros(0, dtype=np.int64)
+        self._extra_pred = np.zeros(0, dtype=np.int64)
+
+    def _full_solve(self, start, dirty_all):
+        mdp = self.mdp
+        V0 = self.V if self.V is not None and self.V.shape == (mdp.n_states,) else None
+        result = value_iteration(mdp, tol=self.tol, max_iter=self.max_iter, V0=V0)
+        if dirty_all or self._preds is None:
+            self._preds = None
+            self._extra_succ = self._extra_pred = np.zeros(0, dtype=np.int64)
+        self.n_backups = result.iterations * mdp.n_states
+        return self._finish(result.V, result.Q, result.iterations, result.residual,
+                            result.converged, start, "incremental[full]")
+
+    def _finish(self, V, Q, iterations, residual, converged, start, method):
+        self.V = V
+        self._gamma = self.mdp.gamma
+        self.result = SolverResult(V, Q, Q.argmax(axis=1), iterations, residual,
+                                   time.perf_counter() - start, converged, method)
+        return self.result
+
+    def _add_edges(self, rows):
+        """
+        Nimmt die aktuellen Nachfolger der geänderten Zeilen in die Vorgängersuche auf;
+        entfernte Kanten bleiben erhalten (schadet nur der Effizienz, nicht dem Ergebnis).
+        """
+        mdp = self.mdp
+        states = rows // mdp.n_actions
+        if mdp.is_sparse:
+            succ = [mdp.P.row(s, a)[0] for s, a in zip(states, rows % mdp.n_actions)]
+            counts = [len(x) for x in succ]
+            succ = np.concatenate(succ) if succ else np.zeros(0, dtype=np.int64)
+        else:
+            flat = np.asarray(mdp.P).reshape(mdp.n_states * mdp.n_actions, mdp.n_states)
+            owner, succ = np.nonzero(flat[rows] != 0)
+            counts = np.bincount(owner, minlength=rows.shape[0])
+        self._extra_succ = np.concatenate([self._extra_succ, succ])
+        self._extra_pred = np.concatenate([self._extra_pred, np.repeat(states, counts)])
+        if self._extra_succ.shape[0] > self._preds[1].shape[0] // 4:
+            self._preds = None
+            self._extra_succ = self._extra_pred = np.zeros(0, dtype=np.int64)
+
+    def _predecessors(self, states):
+        indptr, preds = self._preds
+        starts = indptr[states]
+        lengths = indptr[states + 1] - starts
+        offsets = np.cumsum(lengths) - lengths
+        found = preds[np.repeat(starts - offsets, lengths) + np.arange(lengths.sum())]
+        if self._extra_succ.shape[0]:
+            found = np.concatenate([found, self._extra_pred[np.isin(self._extra_succ, states)]])
+        return np.unique(found)
+
+    def solve(self):
+        """
+        Löst das MDP (inkrementell, falls möglich) und gibt ein SolverResult zurück.
+        """
+        start = time.perf_counter()
+        mdp = self.mdp
+        dirty = mdp.pop_dirty_rows()
+        if (dirty is None or self.V is None or self.V.shape != (mdp.n_states,)
+                or mdp.gamma != self._gamma):
+            return self._full_solve(start, dirty_all=dirty is None)
+        if self._preds is None:
+            self._preds = predecessor_lists(mdp)
+        elif dirty.size:
+            self._add_edges(dirty)
+            if self._preds is None:
+                self._preds = predecessor_lists(mdp)
+        V = self.V.copy()
+        frontier = np.unique(dirty // mdp.n_actions)
+        # Kleinere Schwelle als tol, damit sich verworfene Änderungen nicht zu einem
+        # Residuum >= tol aufsummieren
+        threshold = self.tol * (1.0 - mdp.gamma)
+        backups = 0
+        waves = 0
+        while frontier.size and waves < self.max_iter:
+            if frontier.shape[0] > FULL_SWEEP_FRACTION * mdp.n_states:
+                self.V = V
+                result = self._full_solve(start, dirty_all=False)
+                self.n_backups += backups
+                return result
+            V_new = state_q_values(mdp, frontier, V).max(axis=1)
+            delta = np.abs(V_new - V[frontier])
+            V[frontier] = V_new
+            backups += frontier.shape[0]
+            waves += 1
+            frontier = self._predecessors(frontier[delta > threshold])
+        # Abschlussprüfung mit einem vollen Backup
+        Q = q_values(mdp, V)
+        V_check = Q.max(axis=1)
+        residual = np.max(np.abs(V_check - V)) if mdp.n_states else 0.0
+        backups += mdp.n_states
+        if residual >= self.tol:
+            self.V = V_check
+            result = self._full_solve(start, dirty_all=False)
+            self.n_backups += backups
+            return result
+        self.n_backups = backups
+        return self._finish(V_check, Q, waves, residual, True, start, "incremental")
+
+# Mini-Test
+if __name__ == "__main__":
+    from mdp_framework.generators.structured_generator import grid_world_mdp
+
+    mdp = grid_world_mdp(100, 100, gamma=0.95, rng=0)
+    solver = IncrementalSolver(mdp, tol=1e-6)
+    print(solver.solve(), "Backups:", solver.n_backups)
+    # Ein Zustand in der Ecke wird teurer, ein anderer rutscht nach rechts statt nach oben
+    mdp.set_reward(0, 0, mdp.R[0, 0] - 0.5)
+    mdp.set_transitions(5050, 0, [0.8, 0.2], next_states=[5051, 5050])
+    result = solver.solve()
+    print(result, "Backups:", solver.n_backups)
+    reference = value_iteration(mdp, tol=1e-6)
+    print(reference, "Max. Abweichung:", np.max(np.abs(result.V - reference.V)))
@@ -0,0 +1,241 @@
+# mdp_framework/utils/discretizer.py
+
+import inspect
+import numpy as np
+from mdp_framework.core.continuous import apply_batched
+from mdp_framework.core.discrete import DiscreteMDP
+from mdp_framework.core.sparse import SparseTransitions
+from mdp_framework.generators.continuous_generator import RandomLinearDynamics
+from mdp_framework.utils.grid import DEFAULT_CHUNK_SIZE
+from mdp_framework.utils.sampling import get_rng
+
+# Übergangswahrscheinlichkeiten darunter werden im analytischen Pfad verworfen
+ANALYTIC_PROB_TOL = 1e-8
+# Höchstzahl Einträge (Zeilen x Zellen) eines Blocks im analytischen Pfad
+ANALYTIC_BLOCK_ENTRIES = 1 << 22
+
+def _ndtr():
+    """
+    Standardnormal-CDF aus scipy.special, None falls scipy fehlt.
+    """
+    try:
+        from scipy.special import ndtr
+    except ImportError:
+        return None
+    return ndtr
+
+def _linear_dynamics(func):
+    """
+    Gibt func (bzw. die über __wrapped__ umhüllte Funktion, z.B. aus utils.instrumentation) zurück, wenn es genau
+    eine RandomLinearDynamics ist, sonst None. Unterklassen können step anders rechnen
+    und werden daher nicht analytisch behandelt.
+    """
+    func = inspect.unwrap(func)
+    return func if type(func) is RandomLinearDynamics else None
+
+def _per_dim(value, dim, dtype=np.float64):
+    value = np.asarray(value, dtype=dtype)
+    return np.full(dim, value, dtype=dtype) if value.ndim == 0 else value
+
+def action_grid(action_dim, bins=3, low=-1.0, high=1.0):
+    """
+    Alle Kombinationen von bins äquidistanten Werten in [low, high] je Aktionsdimension,
+    Array (n_actions, action_dim).
+    """
+    bins = _per_dim(bins, action_dim, np.int64)
+    low, high = _per_dim(low, action_dim), _per_dim(high, action_dim)
+    axes = [np.linspace(lo, hi, b) for lo, hi, b in zip(low, high, bins)]
+    return np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, action_dim)
+
+class GridDiscretizer:
+    """
+    Bildet ein ContinuousMDP auf ein DiscreteMDP über einem regelmäßigen Zustandsgitter
+    und einer endlichen Aktionsmenge ab.
+
+    Der Quader [low, high] wird je Dimension in bins Zellen geteilt (Zustand s = Zellindex
+    in C-Reihenfolge); Zustände außerhalb zählen zur nächstgelegenen Randzelle.
+    P[s, a, s'] ist der Anteil der Folgezustände in Zelle s', R[s, a] der mittlere Reward,
+    jeweils über n_samples gleichverteilte Punkte je Zelle.
+    """
+
+    def __init__(self, bins, low, high, actions):
+        """
+        bins: Zellen je Zustandsdimension (Sequenz der Länge state_dim)
+        low, high: Grenzen des Gitters je Dimension
+        actions: diskrete Aktionsmenge als Array (n_actions, action_dim)
+        """
+        self.bins = np.asarray(bins, dtype=np.int64)
+        self.state_dim = self.bins.shape[0]
+        self.low = _per_dim(low, self.state_dim)
+        self.high = _per_dim(high, self.state_dim)
+        if np.any(self.bins < 1) or np.any(self.high <= self.low):
+            raise ValueError("bins muss >= 1 und high > low sein.")
+        self.width = (self.high - self.low) / self.bins
+        self.actions = np.atleast_2d(np.asarray(actions, dtype=np.float64))
+
+    @classmethod
+    def for_mdp(cls, mdp, bins=10, action_bins=3, low=-1.0, high=1.0, action_low=-1.0, action_high=1.0):
+        """
+        Gitter passend zu den Dimensionen von mdp; Standardgrenzen [-1, 1] wie bei
+        ContinuousMDP.sample_state/sample_action.
+        """
+        return cls(_per_dim(bins, mdp.state_dim, np.int64), low, high,
+                   action_grid(mdp.action_dim, action_bins, action_low, action_high))
+
+    @property
+    def n_states(self):
+        return int(np.prod(self.bins))
+
+    @property
+    def n_actions(self):
+        return self.actions.shape[0]
+
+    def state_to_index(self, states):
+        """
+        Zellindex für Zustände (state_dim,) oder (N, state_dim).
+        """
+        states = np.asarray(states, dtype=np.float64)
+        cells = np.floor((states - self.low) / self.width)
+        cells = np.clip(np.nan_to_num(cells), 0, self.bins - 1).astype(np.int64)
+        return np.ravel_multi_index(tuple(np.moveaxis(cells, -1, 0)), self.bins)
+
+    def cell_centers(self, indices=None):
+        """
+        Mittelpunkte der Zellen indices (Standard: alle), Array (N, state_dim).
+        """
+        indices = np.arange(self.n_states) if indices is None else np.asarray(indices)
+        cells = np.stack(np.unravel_index(indices, self.bins), axis=-1)
+        return self.low + (cells + 0.5) * self.width
+
+    def sample_points(self, n_samples, rng=None):
+        """
+        n_samples gleichverteilte Punkte je Zelle, Array (n_states, n_samples, state_dim).
+        Bei n_samples = 1 werden die Zellmittelpunkte verwendet.
+        """
+        centers = self.cell_centers()[:, None, :]
+        if n_samples == 1:
+            return centers.copy()
+        offsets = get_rng(rng).uniform(-0.5, 0.5, size=(self.n_states, n_samples, self.state_dim))
+        return centers + offsets * self.width
+
+    def discretize(self, mdp, n_samples=16, method="auto", rng=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Erzeugt das tabellarische DiscreteMDP (dünn besetztes P) zu mdp.
+
+        - n_samples: Stichprobenpunkte je Zelle (je Punkt und Aktion ein Aufruf von Dynamik
+          bzw. Reward)
+        - method: "sample" wertet mdp.evaluate_batch für alle Zellen, Punkte und Aktionen
+          blockweise (höchstens chunk_size Zeilen) aus; "analytic" berechnet P für
+          RandomLinearDynamics ohne Stichproben (siehe _gaussian_transitions, benötigt
+          scipy), Rewards weiterhin über die Stichprobenpunkte; "auto" wählt "analytic",
+          wenn möglich
+        - rng: Seed oder np.random.Generator für die Stichprobenpunkte und das Ergebnis-MDP
+        """
+        rng = get_rng(rng)
+        if mdp.state_dim != self.state_dim or mdp.action_dim != self.actions.shape[1]:
+            raise ValueError("Gitter und MDP haben unterschiedliche Dimensionen.")
+        linear = _linear_dynamics(mdp.dynamics_func)
+        linear_ok = linear is not None
+        if method == "auto":
+            method = "analytic" if linear_ok and _ndtr() is not None else "sample"
+        if method == "analytic" and not linear_ok:
+            raise ValueError("method='analytic' ist nur für RandomLinearDynamics verfügbar.")
+        if method not in ("sample", "analytic"):
+            raise ValueError(f"Unbekannte Methode: {method}")
+
+        n_cells, n_actions = self.n_states, self.n_actions
+        points = self.sample_points(n_samples, rng)
+        # Reihenfolge (Zelle, Aktion, Punkt): die n_samples Zeilen eines (s, a) liegen hintereinander
+        n_total = n_cells * n_actions * n_samples
+        rows, cols, probs = [], [], []
+        reward_sums = np.zeros(n_cells * n_actions)
+        for start in range(0, n_total, chunk_size):
+            flat = np.arange(start, min(start + chunk_size, n_total))
+            row_ids = flat // n_samples
+            cells, action_ids = row_ids // n_actions, row_ids % n_actions
+            states, actions = points[cells, flat % n_samples], self.actions[action_ids]
+            if method == "sample":
+                next_states, rewards = mdp.evaluate_batch(states, actions)
+                # Gleiche (s, a, s') schon im Block zusammenfassen: Speicher wächst mit der
+                # Anzahl verschiedener Übergänge statt mit der Anzahl Stichproben
+                keys, counts = np.unique(row_ids * n_cells + self.state_to_index(next_states),
+                                         return_counts=True)
+                rows.append(keys // n_cells)
+                cols.append(keys % n_cells)
+                probs.append(counts / n_samples)
+            else:
+                rewards = apply_batched(mdp.reward_func, states, actions)
+            reward_sums += np.bincount(row_ids, weights=np.asarray(rewards, dtype=np.float64),
+                                       minlength=n_cells * n_actions)
+        if method == "sample":
+            P = SparseTransitions.from_coo(n_cells, n_actions, np.concatenate(rows),
+                                           np.concatenate(cols), np.concatenate(probs))
+        else:
+            P = self._gaussian_transitions(linear)
+        R = (reward_sums / n_samples).reshape(n_cells, n_actions)
+        return DiscreteMDP(n_cells, n_actions, P, R, mdp.gamma, copy=False, rng=rng)
+
+    def _gaussian_transitions(self, dynamics):
+        """
+        P für s' = A s + B a + N(0, noise_std^2 I) mit s gleichverteilt in der Zelle:
+        s' wird durch eine Normalverteilung mit passendem Mittelwert A c + B a (c = Zellmitte)
+        und diagonaler Kovarianz noise_std^2 + sum_j A[d, j]^2 width_j^2 / 12 genähert.
+        Die Wahrscheinlichkeit einer Zielzelle ist dann das Produkt eindimensionaler
+        Intervallwahrscheinlichkeiten (Randzellen reichen bis +-unendlich); das Rauschen
+        wird exakt, die Streuung innerhalb der Zelle ohne Korrelationen berücksichtigt.
+        Einträge <= ANALYTIC_PROB_TOL werden verworfen und die Zeilen neu normiert.
+        """
+        ndtr = _ndtr()
+        n_cells, n_actions = self.n_states, self.n_actions
+        A, B = np.asarray(dynamics.A), np.asarray(dynamics.B)
+        std = np.sqrt(float(dynamics.noise_std) ** 2 + (A ** 2) @ (self.width ** 2 / 12.0))
+        std = np.maximum(std, np.finfo(np.float64).tiny)
+        step = max(1, ANALYTIC_BLOCK_ENTRIES // n_cells)
+        rows, cols, probs = [], [], []
+        for start in range(0, n_cells * n_actions, step):
+            row_ids = np.arange(start, min(start + step, n_cells * n_actions))
+            mean = self.cell_centers(row_ids // n_actions) @ A.T + self.actions[row_ids % n_actions] @ B.T
+            joint = np.ones((row_ids.shape[0], 1))
+            for d in range(self.state_dim):
+                inner = self.low[d] + self.width[d] * np.arange(1, self.bins[d])
+                cdf = ndtr((inner[None, :] - mean[:, d, None]) / std[d])
+                cell_probs = np.diff(cdf, prepend=0.0, append=1.0, axis=1)
+                joint = (joint[:, :, None] * cell_probs[:, None, :]).reshape(row_ids.shape[0], -1)
+            r, c = np.nonzero(joint > ANALYTIC_PROB_TOL)
+            rows.append(row_ids[r])
+            cols.append(c)
+            probs.append(joint[r, c])
+        P = SparseTransitions.from_coo(n_cells, n_actions, np.concatenate(rows),
+                                       np.concatenate(cols), np.concatenate(probs))
+        P.data /= P.row_sums().ravel()[P.row_ids()]
+        return P
+
+    def continuous_policy(self, policy):
+        """
+        Macht eine tabellarische Policy (n_states,) auf dem stetigen MDP nutzbar:
+        Zustände (state_dim,) oder (N, state_dim) -> Aktionen der jeweiligen Zelle.
+        """
+        policy = np.asarray(policy, dtype=np.int64)
+
+        def act(states):
+            return self.actions[policy[self.state_to_index(states)]]
+        act.batched = True
+        return act
+
+# Mini-Test
+if __name__ == "__main__":
+    import time
+    from mdp_framework.generators.continuous_generator import random_continuous_mdp
+    from mdp_framework.solvers.dynamic_programming import value_iteration
+
+    mdp = random_continuous_mdp(2, 1, gamma=0.9, noise_std=0.1, rng=0)
+    dynamics = mdp.dynamics_func
+    dynamics.A *= 0.5 / np.max(np.abs(np.linalg.eigvals(dynamics.A)))  # stabile Dynamik
+    grid = GridDiscretizer.for_mdp(mdp, bins=30, action_bins=5)
+    for method in ("sample", "analytic"):
+        start = time.perf_counter()
+        dmdp = grid.discretize(mdp, n_samples=32, method=method, rng=1)
+        print(f"{method}: {dmdp.n_states} Zustände, nnz={dmdp.P.nnz}, {time.perf_counter() - start:.3f}s")
+    result = value_iteration(dmdp)
+    policy = grid.continuous_policy(result.policy)
+    print(result, "Aktion in 0:", policy(np.zeros(2)))
@@ -0,0 +1,64 @@
+# mdp_framework/utils/grid.py
+
+import numpy as np
+
+# Zeilen pro Aufruf bzw. pro Schleifenblock; begrenzt den Zwischenspeicher
+DEFAULT_CHUNK_SIZE = 65536
+
+def state_grid(resolution=50, low=-1.0, high=1.0):
+    """
+    Gibt ein 2D-Gitter (X, Y) mit resolution x resolution Punkten in [low, high]^2 zurück.
+    """
+    x = np.linspace(low, high, resolution)
+    y = np.linspace(low, high, resolution)
+    return np.meshgrid(x, y)
+
+def evaluate_points(func, points, *args, batched=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Wertet func auf allen Zeilen von points (N, d) aus und gibt ein Array (N, ...) zurück.
+
+    - args: feste weitere Argumente (z.B. eine Aktion), werden je Zeile mitgegeben
+    - batched: True ruft func blockweise mit gestapelten Eingaben (chunk_size, d) auf,
+      False zeilenweise; None nutzt das Attribut func.batched (fehlt es, zeilenweise)
+    """
+    points = np.asarray(points, dtype=np.float64)
+    n = points.shape[0]
+    if batched is None:
+        batched = getattr(func, "batched", False)
+    out = None
+    for start in range(0, n, chunk_size):
+        chunk = points[start:start + chunk_size]
+        extra = [np.broadcast_to(a, (len(chunk),) + np.shape(a)) for a in args]
+        if batched:
+            values = np.asarray(func(chunk, *extra), dtype=np.float64)
+        else:
+            values = np.array([func(p, *(e[i] for e in extra)) for i, p in enumerate(chunk)], dtype=np.float64)
+        if out is None:
+            out = np.empty((n,) + values.shape[1:])
+        out[start:start + len(chunk)] = values
+    return out if out is not None else np.empty((0,))
+
+def evaluate_grid(func, X, Y, *args, batched=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Wertet func auf dem Gitter (X, Y) aus; Ergebnis hat Shape X.shape bzw. X.shape + (k,)
+    bei vektorwertigen Funktionen (z.B. Policies).
+    """
+    points = np.column_stack([np.ravel(X), np.ravel(Y)])
+    values = evaluate_points(func, points, *args, batched=batched, chunk_size=chunk_size)
+    return values.reshape(np.shape(X) + values.shape[1:])
+
+# Mini-Test
+if __name__ == "__main__":
+    import time
+    from mdp_framework.generators.continuous_generator import random_continuous_mdp
+
+    mdp = random_continuous_mdp(2, 2)
+    X, Y = state_grid(500)
+    for batched in (True, False):
+        start = time.perf_counter()
+        Z = evaluate_grid(mdp.reward_func, X, Y, np.zeros(2), batched=batched)
+        print(f"batched={batched}: {Z.shape} in {time.perf_counter() - start:.3f}s")
+    policy_func = lambda s: -0.1 * s
+    policy_func.batched = True
+    policy = evaluate_grid(policy_func, X, Y)
+    print("Policy-Feld:", policy.shape)
@@ -0,0 +1,276 @@
+# mdp_framework/utils/instrumentation.py
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Anzahl log2-Buckets der Zeit-Histogramme (Bucket k: [2^(k-1), 2^k) Nanosekunden)
+N_BUCKETS = 64
+
+_ENABLED = False
+_LOCK = threading.Lock()
+_TIMERS = {}
+_IO = {}
+# Ursprüngliche Klassenattribute, die enable() ersetzt hat: (Klasse, Name) -> Wert oder None
+_PATCHED = {}
+# Methoden, die in jeder MDP-Klasse (BaseMDP und Unterklassen) gemessen werden
+METHODS = ("step", "reset", "evaluate_batch")
+
+class _Timer:
+    __slots__ = ("count", "total_ns", "max_ns", "hist", "lock")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.hist = [0] * N_BUCKETS
+        self.lock = threading.Lock()
+
+    def add(self, ns):
+        with self.lock:
+            self.count += 1
+            self.total_ns += ns
+            if ns > self.max_ns:
+                self.max_ns = ns
+            self.hist[min(ns.bit_length(), N_BUCKETS - 1)] += 1
+
+    def to_dict(self):
+        with self.lock:
+            return {
+                "count": self.count,
+                "total_s": self.total_ns / 1e9,
+                "mean_s": self.total_ns / 1e9 / self.count if self.count else 0.0,
+                "max_s": self.max_ns / 1e9,
+                # Schlüssel k: Anzahl Aufrufe mit Dauer in [2^(k-1), 2^k) ns
+                "hist_log2_ns": {str(k): c for k, c in enumerate(self.hist) if c}
+            }
+
+def observe(name, ns):
+    """
+    Verbucht eine gemessene Dauer (in Nanosekunden) unter name.
+    """
+    timer = _TIMERS.get(name)
+    if timer is None:
+        with _LOCK:
+            timer = _TIMERS.setdefault(name, _Timer())
+    timer.add(ns)
+
+def _timed_method(name, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            observe(name, time.perf_counter_ns() - start)
+    return wrapper
+
+class _TimedCallable:
+    """
+    Hülle um dynamics_func/reward_func/dynamics_and_reward, die jeden Aufruf misst; alle
+    anderen Attribute (batched, fuse_with, ...) werden an die Funktion durchgereicht.
+    Die gehüllte Funktion liegt wie bei functools.wraps in __wrapped__ (siehe inspect.unwrap).
+    """
+
+    def __init__(self, name, func):
+        self._name = name
+        self.__wrapped__ = func
+
+    def __call__(self, *args, **kwargs):
+        start = time.perf_counter_ns()
+        try:
+            return self.__wrapped__(*args, **kwargs)
+        finally:
+            observe(self._name, time.perf_counter_ns() - start)
+
+    def __getattr__(self, attr):
+        return getattr(self.__wrapped__, attr)
+
+def _timed_attribute(original, name):
+    # Ersetzt die Property original durch eine, die den gelesenen Wert in _TimedCallable hüllt
+    def getter(self):
+        func = original.__get__(self)
+        return None if func is None else _TimedCallable(name, func)
+
+    def setter(self, value):
+        original.__set__(self, value)
+    return property(getter, setter)
+
+def _subclasses(cls):
+    for sub in cls.__subclasses__():
+        yield sub
+        yield from _subclasses(sub)
+
+def _patch_methods(cls):
+    """
+    Ersetzt die in cls selbst definierten (nicht abstrakten) METHODS durch gemessene
+    Varianten; geerbte Methoden werden in der definierenden Klasse gemessen.
+    """
+    for attr in METHODS:
+        original = cls.__dict__.get(attr)
+        if not callable(original) or getattr(original, "__isabstractmethod__", False):
+            continue
+        if (cls, attr) in _PATCHED:
+            continue
+        _PATCHED[(cls, attr)] = original
+        setattr(cls, attr, _timed_method(f"{cls.__name__}.{attr}", original))
+
+def _base_class():
+    from mdp_framework.core.base import BaseMDP
+    return BaseMDP
+
+def _init_subclass(cls, **kwargs):
+    # Während der Instrumentierung definierte MDP-Klassen werden ebenfalls gemessen
+    super(_base_class(), cls).__init_subclass__(**kwargs)
+    _patch_methods(cls)
+
+def _targets():
+    from mdp_framework.core.discrete import DiscreteMDP  # noqa: F401 (registriert die Unterklasse)
+    from mdp_framework.core.continuous import ContinuousMDP
+    attributes = [(ContinuousMDP, "dynamics_func"), (ContinuousMDP, "reward_func"),
+                  (ContinuousMDP, "dynamics_and_reward")]
+    return list(_subclasses(_base_class())), attributes
+
+def enable():
+    """
+    Schaltet die Instrumentierung ein: step/reset (und evaluate_batch) aller MDP-Klassen
+    (jede Unterklasse von BaseMDP, auch während der Instrumentierung neu definierte) sowie
+    Aufrufe von dynamics_func, reward_func und dynamics_and_reward werden gezählt und gemessen,
+    ebenso Lese-/Schreibvorgänge der io-Module. Wirkt auch auf bestehende Instanzen.
+
+    Ist die fusionierte Variante aktiv (Standard bei RandomLinearDynamics), ruft step nur
+    dynamics_and_reward auf; dessen Timer enthält dann die Kosten von Dynamik und Reward
+    zusammen, die Einzel-Timer bleiben leer.
+    """
+    global _ENABLED
+    if _ENABLED:
+        return
+    classes, attributes = _targets()
+    for cls in classes:
+        _patch_methods(cls)
+    base = _base_class()
+    _PATCHED[(base, "__init_subclass__")] = base.__dict__.get("__init_subclass__")
+    base.__init_subclass__ = classmethod(_init_subclass)
+    for cls, attr in attributes:
+        original = cls.__dict__[attr]
+        _PATCHED[(cls, attr)] = original
+        setattr(cls, attr, _timed_attribute(original, f"{cls.__name__}.{attr}"))
+    _ENABLED = True
+
+def disable():
+    """
+    Stellt die ursprünglichen Methoden wieder her; danach entsteht kein Mehraufwand mehr.
+    Die bisher gesammelten Werte bleiben erhalten (siehe reset()).
+    """
+    global _ENABLED
+    for (cls, attr), original in _PATCHED.items():
+        if original is None:
+            delattr(cls, attr)
+        else:
+            setattr(cls, attr, original)
+    _PATCHED.clear()
+    _ENABLED = False
+
+def is_enabled():
+    return _ENABLED
+
+@contextmanager
+def instrumented(reset_metrics=False):
+    """
+    Kontextmanager: Instrumentierung innerhalb des Blocks eingeschaltet.
+    """
+    was_enabled = _ENABLED
+    if reset_metrics:
+        reset()
+    enable()
+    try:
+        yield
+    finally:
+        if not was_enabled:
+            disable()
+
+def reset():
+    """
+    Verwirft alle gesammelten Werte.
+    """
+    with _LOCK:
+        _TIMERS.clear()
+        _IO.clear()
+
+def instrument_io(fmt, op):
+    """
+    Dekorator für Lade-/Speicherfunktionen der io-Module (op: "read" oder "write").
+    Gemessen werden Dauer und Dateigröße; ausgeschaltet kostet er nur eine Flag-Abfrage.
+    """
+    path_pos = 1 if op == "write" else 0
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _ENABLED:
+                return func(*args, **kwargs)
+            start = time.perf_counter_ns()
+            result = func(*args, **kwargs)
+            ns = time.perf_counter_ns() - start
+            filepath = kwargs.get("filepath", args[path_pos] if len(args) > path_pos else None)
+            n_bytes = os.path.getsize(filepath) if filepath is not None and os.path.isfile(filepath) else 0
+            name = f"io.{fmt}.{op}"
+            observe(name, ns)
+            with _LOCK:
+                entry = _IO.setdefault(name, {"count": 0, "bytes": 0})
+                entry["count"] += 1
+                entry["bytes"] += n_bytes
+            return result
+        return wrapper
+    return decorator
+
+def snapshot():
+    """
+    Gibt alle Werte als JSON-serialisierbares dict zurück:
+    {"enabled", "timestamp", "counters": {name: Anzahl}, "timers": {name: {...}},
+     "io": {"io.<format>.read|write": {"count", "bytes"}}}
+    """
+    with _LOCK:
+        timers = {name: timer.to_dict() for name, timer in _TIMERS.items()}
+        io = {name: dict(entry) for name, entry in _IO.items()}
+    return {
+        "enabled": _ENABLED,
+        "timestamp": time.time(),
+        "counters": {name: timer["count"] for name, timer in timers.items()},
+        "timers": timers,
+        "io": io
+    }
+
+def export_jsonl(target, labels=None):
+    """
+    Hängt snapshot() (plus optionale labels) als eine JSON-Zeile an target an
+    (Dateipfad oder geöffnete Textdatei).
+    """
+    record = snapshot()
+    if labels:
+        record["labels"] = dict(labels)
+    line = json.dumps(record) + "\n"
+    if hasattr(target, "write"):
+        target.write(line)
+    else:
+        with open(target, "a") as f:
+            f.write(line)
+
+# Mini-Test
+if __name__ == "__main__":
+    from mdp_framework.generators.discrete_generator import random_discrete_mdp
+    from mdp_framework.generators.continuous_generator import random_continuous_mdp
+
+    mdp_d = random_discrete_mdp(10, 3)
+    mdp_c = random_continuous_mdp(3, 2)
+    with instrumented():
+        for t in range(1000):
+            if t % 100 == 0:
+                mdp_c.reset()
+            mdp_d.step(mdp_d.sample_action())
+            mdp_c.step(mdp_c.sample_action())
+    print(json.dumps(snapshot()["counters"], indent=2))
+    print("Mittlere Dauer DiscreteMDP.step:", snapshot()["timers"]["DiscreteMDP.step"]["mean_s"])
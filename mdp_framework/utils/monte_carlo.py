@@ -0,0 +1,120 @@
+# mdp_framework/utils/monte_carlo.py
+
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+import numpy as np
+from mdp_framework.core.discrete import DiscreteMDP
+from mdp_framework.core.shared import SharedDiscreteMDP, SharedMDPHandle
+from mdp_framework.utils.rollout import iter_rollouts
+from mdp_framework.utils.sampling import get_rng
+
+# Im Worker-Prozess einmalig angehängtes MDP (siehe _init_worker)
+_WORKER_MDP = None
+
+class ReturnEstimate:
+    """
+    Monte-Carlo-Schätzung des erwarteten diskontierten Returns mit Konfidenzintervall.
+    """
+
+    def __init__(self, mean, std, n_episodes, confidence, worker_stats):
+        self.mean = float(mean)
+        self.std = float(std)
+        self.n_episodes = int(n_episodes)
+        self.confidence = float(confidence)
+        self.worker_stats = worker_stats
+        self.stderr = self.std / np.sqrt(self.n_episodes) if self.n_episodes > 0 else np.inf
+        z = NormalDist().inv_cdf(0.5 + self.confidence / 2)
+        self.ci = (self.mean - z * self.stderr, self.mean + z * self.stderr)
+
+    def __repr__(self):
+        return (f"ReturnEstimate(mean={self.mean:.4f}, ci{int(round(self.confidence * 100))}="
+                f"[{self.ci[0]:.4f}, {self.ci[1]:.4f}], n_episodes={self.n_episodes})")
+
+def _combine(stats):
+    """
+    Fasst (n, Mittelwert, M2) mehrerer Teilstichproben zusammen (paarweise Welford/Chan).
+    """
+    n, mean, m2 = 0, 0.0, 0.0
+    for n_b, mean_b, m2_b in stats:
+        if n_b == 0:
+            continue
+        delta = mean_b - mean
+        total = n + n_b
+        mean += delta * n_b / total
+        m2 += m2_b + delta * delta * n * n_b / total
+        n = total
+    return n, mean, m2
+
+def _returns_stats(mdp, policy, horizon, n_episodes, batch_size, rng):
+    stats = []
+    for traj in iter_rollouts(mdp, policy, horizon, n_episodes, batch_size=batch_size, rng=rng):
+        returns = traj.discounted_returns(mdp.gamma)
+        mean = returns.mean()
+        stats.append((len(returns), mean, float(((returns - mean) ** 2).sum())))
+    return _combine(stats)
+
+def _init_worker(source):
+    global _WORKER_MDP
+    _WORKER_MDP = source.attach() if isinstance(source, SharedMDPHandle) else source
+
+def _run_task(task):
+    policy, horizon, n_episodes, batch_size, rng = task
+    return _returns_stats(_WORKER_MDP, policy, horizon, n_episodes, batch_size, rng)
+
+def estimate_returns(mdp, policy, horizon, n_episodes, n_workers=1, batch_size=1024,
+                     confidence=0.95, rng=None):
+    """
+    Schätzt den erwarteten diskontierten Return einer Policy per Monte Carlo.
+
+    - mdp: DiscreteMDP, ContinuousMDP oder SharedMDPHandle
+    - policy: wie bei utils.rollout (None = zufällige Aktionen); bei n_workers > 1 picklebar
+    - n_workers: Anzahl Prozesse; ein DiscreteMDP wird dafür einmal in Shared Memory
+      gelegt, die Worker hängen sich ohne Kopie an
+    - batch_size: Episoden pro Aufgabe; jede Aufgabe erhält einen eigenen, aus rng
+      abgeleiteten Zufallsstrom, das Ergebnis hängt daher nicht von n_workers ab
+
+    Die Teilergebnisse (Anzahl, Mittelwert, Quadratsumme) werden exakt zusammengefasst;
+    das Konfidenzintervall nutzt die Normalapproximation.
+    """
+    sizes = [min(batch_size, n_episodes - start) for start in range(0, n_episodes, batch_size)]
+    rngs = get_rng(rng).spawn(len(sizes))
+    tasks = [(policy, horizon, size, batch_size, task_rng) for size, task_rng in zip(sizes, rngs)]
+
+    shared = None
+    if isinstance(mdp, SharedMDPHandle):
+        source = mdp
+    elif n_workers > 1 and isinstance(mdp, DiscreteMDP):
+        shared = SharedDiscreteMDP(mdp)
+        source = shared.handle
+    else:
+        source = mdp
+    try:
+        if n_workers > 1:
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                     initargs=(source,)) as pool:
+                stats = list(pool.map(_run_task, tasks))
+        else:
+            local = source.attach() if isinstance(source, SharedMDPHandle) else source
+            stats = [_returns_stats(local, *task) for task in tasks]
+    finally:
+        if shared is not None:
+            shared.close()
+
+    n, mean, m2 = _combine(stats)
+    std = np.sqrt(m2 / (n - 1)) if n > 1 else 0.0
+    return ReturnEstimate(mean, std, n, confidence, stats)
+
+# Mini-Test
+if __name__ == "__main__":
+    import time
+    from mdp_framework.generators.discrete_generator import random_discrete_mdp
+    from mdp_framework.solvers.evaluation import evaluate_policy
+
+    mdp = random_discrete_mdp(500, 4, gamma=0.9)
+    policy = np.zeros(mdp.n_states, dtype=np.int64)
+    exact = evaluate_policy(mdp, policy).V.mean()
+    for n_workers in (1, 4):
+        start = time.perf_counter()
+        estimate = estimate_returns(mdp, policy, horizon=100, n_episodes=20000, n_workers=n_workers, rng=0)
+        print(f"{n_workers} Worker: {estimate} ({time.perf_counter() - start:.2f}s)")
+    print("Exakt (Mittel über Startzustände):", round(exact, 4))
@@ -0,0 +1,151 @@
+# mdp_framework/utils/rollout.py
+
+import numpy as np
+from mdp_framework.core.discrete import DiscreteMDP
+from mdp_framework.core.continuous import ContinuousMDP
+from mdp_framework.core.vector import VectorDiscreteMDP, VectorContinuousMDP
+from mdp_framework.utils.sampling import CategoricalTable
+
+class TrajectoryBatch:
+    """
+    Trajektorien als Structure-of-Arrays: jede Größe liegt in einem zusammenhängenden
+    Array mit Shape (n_episodes, horizon, ...).
+    """
+
+    def __init__(self, states, actions, rewards, next_states, dones):
+        self.states = states
+        self.actions = actions
+        self.rewards = rewards
+        self.next_states = next_states
+        self.dones = dones
+
+    @property
+    def n_episodes(self):
+        return self.rewards.shape[0]
+
+    @property
+    def horizon(self):
+        return self.rewards.shape[1]
+
+    def discounted_returns(self, gamma):
+        """
+        Diskontierte Returns je Episode, Shape (n_episodes,).
+        """
+        return self.rewards @ (gamma ** np.arange(self.horizon))
+
+    @classmethod
+    def allocate(cls, mdp, n_episodes, horizon):
+        """
+        Legt leere Arrays passender Shape und dtype für ein MDP an.
+        """
+        if isinstance(mdp, DiscreteMDP):
+            state_shape, action_shape = (), ()
+            state_dtype, action_dtype = np.int64, np.int64
+        else:
+            state_shape, action_shape = (mdp.state_dim,), (mdp.action_dim,)
+            state_dtype, action_dtype = np.float64, np.float64
+        return cls(
+            np.empty((n_episodes, horizon) + state_shape, dtype=state_dtype),
+            np.empty((n_episodes, horizon) + action_shape, dtype=action_dtype),
+            np.empty((n_episodes, horizon)),
+            np.empty((n_episodes, horizon) + state_shape, dtype=state_dtype),
+            np.zeros((n_episodes, horizon), dtype=bool)
+        )
+
+def _vector_env(mdp, rng):
+    if isinstance(mdp, DiscreteMDP):
+        return VectorDiscreteMDP(mdp, rng=rng)
+    if isinstance(mdp, ContinuousMDP):
+        return VectorContinuousMDP(mdp, rng=rng)
+    raise TypeError("Unbekannter MDP-Typ.")
+
+def _action_selector(mdp, policy, venv):
+    """
+    Gibt eine Funktion states -> actions zurück.
+    - None: zufällige Aktionen
+    - diskret: Array (n_states,) deterministisch oder (n_states, n_actions) stochastisch
+    - sonst: gebündelte Funktion states (N, ...) -> actions (N, ...)
+    """
+    if policy is None:
+        return lambda states: venv.sample_actions()
+    if isinstance(mdp, DiscreteMDP) and not callable(policy):
+        policy = np.asarray(policy)
+        if policy.shape == (mdp.n_states,):
+            return lambda states: policy[states]
+        if policy.shape == (mdp.n_states, mdp.n_actions):
+            table = CategoricalTable.from_dense(policy)
+            return lambda states: table.sample(states, rng=venv.rng)
+        raise ValueError(f"Tabellarische Policy muss Shape {(mdp.n_states,)} oder {(mdp.n_states, mdp.n_actions)} haben.")
+    return policy
+
+def _check_sizes(horizon, n_episodes, batch_size):
+    if horizon < 1:
+        raise ValueError(f"horizon muss >= 1 sein, ist aber {horizon}")
+    if n_episodes < 0:
+        raise ValueError(f"n_episodes muss >= 0 sein, ist aber {n_episodes}")
+    if batch_size < 1:
+        raise ValueError(f"batch_size muss >= 1 sein, ist aber {batch_size}")
+
+def _run_batch(venv, select_actions, out, horizon):
+    """
+    Simuliert out.n_episodes Episoden parallel und schreibt direkt in die Arrays von out.
+    """
+    states = venv.reset(out.n_episodes)
+    for t in range(horizon):
+        actions = select_actions(states)
+        next_states, rewards, _ = venv.step(actions)
+        out.states[:, t] = states
+        out.actions[:, t] = actions
+        out.rewards[:, t] = rewards
+        out.next_states[:, t] = next_states
+        states = next_states
+    # Keine terminalen Zustände: Episoden enden am Horizont
+    out.dones[:, horizon - 1] = True
+
+def iter_rollouts(mdp, policy, horizon, n_episodes, batch_size=1024, rng=None):
+    """
+    Erzeugt n_episodes Episoden der Länge horizon in Blöcken von höchstens batch_size
+    Episoden und liefert je Block ein TrajectoryBatch. Der Speicherbedarf ist durch
+    batch_size * horizon begrenzt, unabhängig von n_episodes.
+    horizon und batch_size müssen >= 1 sein (sonst ValueError).
+    """
+    _check_sizes(horizon, n_episodes, batch_size)
+    venv = _vector_env(mdp, rng)
+    select_actions = _action_selector(mdp, policy, venv)
+    for start in range(0, n_episodes, batch_size):
+        out = TrajectoryBatch.allocate(mdp, min(batch_size, n_episodes - start), horizon)
+        _run_batch(venv, select_actions, out, horizon)
+        yield out
+
+def rollout(mdp, policy, horizon, n_episodes, batch_size=1024, rng=None):
+    """
+    Simuliert n_episodes Episoden der Länge horizon und gibt ein TrajectoryBatch zurück.
+    Die Ergebnis-Arrays werden einmal vorab angelegt und blockweise (batch_size Episoden
+    gleichzeitig) befüllt, ohne Python-Objekte pro Schritt.
+    Der Speicherbedarf wächst daher mit n_episodes * horizon; batch_size begrenzt nur
+    die gleichzeitig simulierten Episoden. Für begrenzten Speicher iter_rollouts verwenden.
+    horizon und batch_size müssen >= 1 sein (sonst ValueError).
+    """
+    _check_sizes(horizon, n_episodes, batch_size)
+    venv = _vector_env(mdp, rng)
+    select_actions = _action_selector(mdp, policy, venv)
+    result = TrajectoryBatch.allocate(mdp, n_episodes, horizon)
+    for start in range(0, n_episodes, batch_size):
+        sl = slice(start, min(start + batch_size, n_episodes))
+        view = TrajectoryBatch(result.states[sl], result.actions[sl], result.rewards[sl],
+                               result.next_states[sl], result.dones[sl])
+        _run_batch(venv, select_actions, view, horizon)
+    return result
+
+# Mini-Test
+if __name__ == "__main__":
+    from mdp_framework.generators.discrete_generator import random_discrete_mdp
+    from mdp_framework.generators.continuous_generator import random_continuous_mdp
+
+    mdp_d = random_discrete_mdp(10, 3)
+    traj = rollout(mdp_d, np.zeros(10, dtype=int), horizon=20, n_episodes=1000, batch_size=256)
+    print("Diskret:", traj.states.shape, "mittlerer Return:", traj.discounted_returns(mdp_d.gamma).mean())
+
+    mdp_c = random_continuous_mdp(2, 2)
+    traj = rollout(mdp_c, lambda s: -0.1 * s, horizon=10, n_episodes=100)
+    print("Stetig:", traj.states.shape, traj.actions.shape, "dones am Ende:", traj.dones[:, -1].all())
@@ -2,23 +2,220 @@
 
 import numpy as np
 
-def sample_discrete(probabilities):
+# Dichte P darüber (oder als np.memmap) werden nicht als Tabelle kumuliert, sondern
+# zeilenweise bei Bedarf gezogen (siehe DenseRowSampler)
+DENSE_TABLE_MAX_BYTES = 1 << 28
+# Höchstzahl Einträge (Zeilen x K) eines Blocks beim zeilenweisen Ziehen
+DENSE_SAMPLE_BLOCK_ENTRIES = 1 << 22
+
+# Globaler Generator für alle Aufrufe ohne eigenes rng; config.set_global_seed setzt ihn neu
+_GLOBAL_RNG = np.random.default_rng()
+
+def get_rng(rng=None):
+    """
+    Gibt einen np.random.Generator zurück.
+    - None: globaler Generator (über config.set_global_seed reproduzierbar, nicht thread-sicher)
+    - Generator: wird unverändert verwendet
+    - int/SeedSequence: neuer Generator mit diesem Seed
+    """
+    if rng is None:
+        return _GLOBAL_RNG
+    if isinstance(rng, np.random.Generator):
+        return rng
+    return np.random.default_rng(rng)
+
+def seed_global_rng(seed):
+    """
+    Setzt den globalen Generator in-place neu, sodass bestehende Referenzen den neuen Zustand sehen.
+    """
+    _GLOBAL_RNG.bit_generator.state = np.random.default_rng(seed).bit_generator.state
+
+def spawn_rngs(rng, n):
+    """
+    Erzeugt n unabhängige Kind-Generatoren (z.B. für parallele Worker).
+    """
+    return get_rng(rng).spawn(n)
+
+def _check_rows(totals, rows):
+    """
+    Löst ValueError aus, wenn eine der Zeilen rows kein positives Gesamtgewicht hat
+    (z.B. eine leere CSR-Zeile), statt stillschweigend einen falschen Wert zu ziehen.
+    """
+    empty = ~(totals > 0)
+    if np.any(empty):
+        bad = np.asarray(rows).ravel()[np.asarray(empty).ravel()]
+        raise ValueError(f"Zeile(n) ohne Wahrscheinlichkeitsmasse, z.B. {int(bad[0])}; "
+                         "jede (s, a)-Zeile braucht mindestens einen Folgezustand.")
+
+class CategoricalTable:
+    """
+    Vorberechnete kumulierte Verteilungen (CDF) für viele diskrete Verteilungen.
+    Jede Zeile wird einmal kumuliert und danach per binärer Suche beliebig oft
+    gezogen (O(log K) pro Ziehung statt O(K) mit np.random.choice).
+    Die Zeilen liegen flach hintereinander; Zeile i belegt cdf[starts[i]:starts[i] + lengths[i]].
+    """
+
+    def __init__(self, cdf, starts, lengths, values=None):
+        """
+        cdf: flaches Array der zeilenweise kumulierten Gewichte
+        starts, lengths: Beginn und Länge jeder Zeile in cdf
+        values: Optional, Rückgabewert je Position in cdf (sonst Position innerhalb der Zeile)
+        """
+        self.cdf = np.asarray(cdf, dtype=np.float64)
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.lengths = np.asarray(lengths, dtype=np.int64)
+        self.values = None if values is None else np.asarray(values)
+        # Leere Zeilen (lengths == 0) haben Gesamtgewicht 0 und werden beim Ziehen abgelehnt
+        last = np.maximum(self.starts + self.lengths - 1, 0)
+        self.totals = np.where(self.lengths > 0, self.cdf[last], 0.0) if self.cdf.size else np.zeros(self.n_rows)
+        # Einmal beim Aufbau prüfen; ohne leere Zeilen entfällt die Prüfung beim Ziehen ganz
+        self.has_empty_rows = bool(np.any(~(self.totals > 0)))
+        self._n_iter = int(np.ceil(np.log2(max(int(self.lengths.max(initial=1)), 1)))) + 1
+
+    @property
+    def n_rows(self):
+        return int(self.starts.shape[0])
+
+    @classmethod
+    def from_dense(cls, probabilities):
+        """
+        Baut die Tabelle aus einem Array (..., K); jede Zeile der letzten Achse ist eine Verteilung.
+        """
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        k = probabilities.shape[-1]
+        cdf = np.cumsum(probabilities.reshape(-1, k), axis=1)
+        n_rows = cdf.shape[0]
+        return cls(cdf.ravel(), np.arange(n_rows) * k, np.full(n_rows, k))
+
+    @classmethod
+    def from_csr(cls, indptr, indices, data):
+        """
+        Baut die Tabelle aus CSR-Arrays; gezogen werden die Spaltenindizes (indices).
+        Jede Zeile wird für sich kumuliert (gruppiert nach Zeilenlänge), damit die
+        Genauigkeit nicht von der Position der Zeile im Gesamtarray abhängt.
+        """
+        indptr = np.asarray(indptr, dtype=np.int64)
+        data = np.asarray(data, dtype=np.float64)
+        starts, lengths = indptr[:-1], np.diff(indptr)
+        cdf = np.empty_like(data)
+        for length in np.unique(lengths[lengths > 0]):
+            positions = starts[lengths == length][:, None] + np.arange(length)
+            cdf[positions] = np.cumsum(data[positions], axis=1)
+        return cls(cdf, starts, lengths, values=indices)
+
+    def sample_one(self, row, rng=None):
+        """
+        Zieht einen Wert aus Zeile row.
+        """
+        rng = get_rng(rng)
+        if self.has_empty_rows:
+            _check_rows(self.totals[row], row)
+        start = self.starts[row]
+        end = start + self.lengths[row]
+        pos = start + np.searchsorted(self.cdf[start:end], rng.random() * self.totals[row], side="right")
+        pos = min(pos, end - 1)
+        return self.values[pos] if self.values is not None else pos - start
+
+    def sample(self, rows, rng=None):
+        """
+        Zieht gebündelt je einen Wert pro Eintrag von rows (vektorisierte binäre Suche).
+        """
+        rng = get_rng(rng)
+        rows = np.asarray(rows, dtype=np.int64)
+        if self.has_empty_rows:
+            _check_rows(self.totals[rows], rows)
+        starts = self.starts[rows]
+        lo = starts.copy()
+        hi = starts + self.lengths[rows] - 1
+        target = rng.random(rows.shape) * self.totals[rows]
+        for _ in range(self._n_iter):
+            mid = (lo + hi) // 2
+            right = self.cdf[mid] <= target
+            lo = np.where(right, mid + 1, lo)
+            hi = np.where(right, hi, mid)
+        pos = np.minimum(lo, starts + self.lengths[rows] - 1)
+        return self.values[pos] if self.values is not None else pos - starts
+
+class DenseRowSampler:
+    """
+    Wie CategoricalTable, aber ohne vorberechnete CDF: gezogen wird direkt aus den
+    Zeilen eines dichten Arrays (..., K), die erst beim Ziehen gelesen und kumuliert
+    werden (O(K) pro Ziehung). Für np.memmap und sehr große P, bei denen eine zweite
+    Kopie als CDF zu teuer wäre; gelesen werden nur die tatsächlich gezogenen Zeilen.
+    """
+
+    def __init__(self, probabilities):
+        self.probabilities = probabilities
+        self.k = probabilities.shape[-1]
+
+    @property
+    def n_rows(self):
+        return int(np.prod(self.probabilities.shape[:-1]))
+
+    def _rows(self, rows):
+        index = np.unravel_index(rows, self.probabilities.shape[:-1])
+        return np.asarray(self.probabilities[index], dtype=np.float64)
+
+    def sample_one(self, row, rng=None):
+        """
+        Zieht einen Index aus Zeile row.
+        """
+        cdf = np.cumsum(self._rows(np.array([row]))[0])
+        if not cdf[-1] > 0:
+            _check_rows(cdf[-1:], [row])
+        pos = np.searchsorted(cdf, get_rng(rng).random() * cdf[-1], side="right")
+        return int(min(pos, self.k - 1))
+
+    def sample(self, rows, rng=None):
+        """
+        Zieht gebündelt je einen Index pro Eintrag von rows (blockweise gelesen).
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        u = get_rng(rng).random(rows.shape).ravel()
+        flat_rows = rows.ravel()
+        out = np.empty(flat_rows.shape[0], dtype=np.int64)
+        step = max(1, DENSE_SAMPLE_BLOCK_ENTRIES // max(self.k, 1))
+        for start in range(0, flat_rows.shape[0], step):
+            cdf = np.cumsum(self._rows(flat_rows[start:start + step]), axis=1)
+            _check_rows(cdf[:, -1], flat_rows[start:start + step])
+            target = u[start:start + step] * cdf[:, -1]
+            out[start:start + step] = np.minimum((cdf <= target[:, None]).sum(axis=1), self.k - 1)
+        return out.reshape(rows.shape)
+
+def sampling_table_for(probabilities):
+    """
+    Passende Ziehtabelle für ein dichtes Array (..., K): CategoricalTable für kleine
+    Arrays im Speicher, DenseRowSampler für np.memmap und Arrays über DENSE_TABLE_MAX_BYTES.
+    """
+    if isinstance(probabilities, np.memmap) or probabilities.nbytes > DENSE_TABLE_MAX_BYTES:
+        return DenseRowSampler(probabilities)
+    return CategoricalTable.from_dense(probabilities)
+
+def sample_categorical(probabilities, rng=None):
+    """
+    Zieht gebündelt je einen Index pro Zeile eines Arrays (N, K) von Wahrscheinlichkeiten.
+    """
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    table = CategoricalTable.from_dense(probabilities)
+    return table.sample(np.arange(table.n_rows), rng=rng).reshape(probabilities.shape[:-1])
+
+def sample_discrete(probabilities, size=None, rng=None):
     """
-    Zieht einen Index entsprechend des gegebenen diskreten Wahrscheinlichkeitsvektors.
+    Zieht einen Index (bzw. size Indizes) entsprechend des gegebenen diskreten Wahrscheinlichkeitsvektors.
+    Nicht normierte Gewichte werden anteilig gezogen; ein Vektor ohne Masse löst ValueError aus.
     """
-    probabilities = np.asarray(probabilities)
-    if not np.isclose(probabilities.sum(), 1):
-        raise ValueError("Wahrscheinlichkeiten müssen auf 1 normiert sein.")
-    idx = np.random.choice(len(probabilities), p=probabilities)
-    return idx
+    table = CategoricalTable.from_dense(np.asarray(probabilities, dtype=np.float64)[None])
+    rows = np.zeros(() if size is None else size, dtype=np.int64)
+    return table.sample(rows, rng=rng)[()]
 
-def sample_uniform(low, high, shape=None):
+def sample_uniform(low, high, shape=None, rng=None):
     """
-    Einfaches uniformes Sampling (wrapper für np.random.uniform).
+    Einfaches uniformes Sampling (wrapper für Generator.uniform).
     """
-    return np.random.uniform(low, high, size=shape)
+    return get_rng(rng).uniform(low, high, size=shape)
 
 # Mini-Test
 if __name__ == "__main__":
     print("Diskretes Sample:", sample_discrete([0.1, 0.3, 0.6]))
+    print("Gebündelte Samples:", sample_categorical([[0.5, 0.5, 0.0], [0.0, 0.0, 1.0]]))
     print("Uniformes Sample:", sample_uniform(-5, 5, (3,)))
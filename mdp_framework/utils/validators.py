@@ -1,21 +1,172 @@
 # mdp_framework/utils/validators.py
 
 import numpy as np
+from mdp_framework.core.sparse import SparseTransitions
 
-def is_stochastic_matrix(P):
+# (s, a)-Zeilen pro Block; begrenzt den Speicherbedarf auch bei np.memmap
+VALIDATION_CHUNK_ROWS = 8192
+# Höchstens so viele fehlerhafte (s, a)-Indizes je Prüfung im Bericht
+MAX_REPORTED = 100
+
+class MDPValidationError(ValueError):
+    """
+    Fehler bei der Validierung eines diskreten MDPs; report enthält alle Befunde.
+    """
+
+    def __init__(self, report):
+        super().__init__(report.summary())
+        self.report = report
+
+class ValidationReport:
+    """
+    Ergebnis von validate_discrete_mdp: je Prüfung Anzahl und (die ersten MAX_REPORTED)
+    fehlerhaften (s, a)-Indizes als Array (k, 2).
+    """
+
+    CHECKS = ("row_sum", "negative", "non_finite_P", "non_finite_R")
+
+    def __init__(self, n_actions):
+        self.n_actions = n_actions
+        self.counts = {check: 0 for check in self.CHECKS}
+        self._rows = {check: [] for check in self.CHECKS}
+        self.gamma_error = None
+
+    def add(self, check, rows):
+        if len(rows) == 0:
+            return
+        self.counts[check] += len(rows)
+        stored = sum(len(r) for r in self._rows[check])
+        if stored < MAX_REPORTED:
+            self._rows[check].append(rows[:MAX_REPORTED - stored])
+
+    def indices(self, check):
+        """
+        Fehlerhafte (s, a)-Paare der Prüfung check als Array (k, 2).
+        """
+        rows = np.concatenate(self._rows[check]) if self._rows[check] else np.zeros(0, dtype=np.int64)
+        return np.column_stack([rows // self.n_actions, rows % self.n_actions])
+
+    @property
+    def ok(self):
+        return self.gamma_error is None and not any(self.counts.values())
+
+    def summary(self):
+        if self.ok:
+            return "MDP ist gültig."
+        lines = []
+        if self.gamma_error is not None:
+            lines.append(self.gamma_error)
+        labels = {
+            "row_sum": "Zeilensumme von P ungleich 1",
+            "negative": "negative Einträge in P",
+            "non_finite_P": "NaN/inf in P",
+            "non_finite_R": "NaN/inf in R",
+        }
+        for check in self.CHECKS:
+            if self.counts[check]:
+                pairs = [tuple(int(v) for v in pair) for pair in self.indices(check)[:5]]
+                more = ", ..." if self.counts[check] > len(pairs) else ""
+                lines.append(f"{labels[check]}: {self.counts[check]} (s, a)-Paare, z.B. {pairs}{more}")
+        return "; ".join(lines)
+
+    def __repr__(self):
+        return f"ValidationReport({self.summary()})"
+
+def _dense_row_checks(P, n_states, n_actions, rtol, atol, chunk_rows, report):
+    P2 = P.reshape(n_states * n_actions, n_states)
+    for start in range(0, P2.shape[0], chunk_rows):
+        block = np.asarray(P2[start:start + chunk_rows])
+        rows = np.arange(start, start + block.shape[0])
+        finite = np.isfinite(block).all(axis=1)
+        report.add("non_finite_P", rows[~finite])
+        report.add("negative", rows[(block < 0).any(axis=1)])
+        sums = block.sum(axis=1)
+        report.add("row_sum", rows[finite & ~np.isclose(sums, 1.0, rtol=rtol, atol=atol)])
+
+def _sparse_row_checks(P, rtol, atol, chunk_rows, report):
+    n_rows = P.n_states * P.n_actions
+    for start in range(0, n_rows, chunk_rows):
+        end = min(start + chunk_rows, n_rows)
+        lo, hi = int(P.indptr[start]), int(P.indptr[end])
+        data = np.asarray(P.data[lo:hi], dtype=np.float64)
+        local = np.repeat(np.arange(end - start), np.diff(np.asarray(P.indptr[start:end + 1])))
+        rows = np.arange(start, end)
+        finite_entries = np.isfinite(data)
+        non_finite = np.bincount(local, weights=~finite_entries, minlength=end - start) > 0
+        report.add("non_finite_P", rows[non_finite])
+        negative = np.bincount(local, weights=data < 0, minlength=end - start) > 0
+        report.add("negative", rows[negative])
+        sums = np.bincount(local, weights=np.where(finite_entries, data, 0.0), minlength=end - start)
+        report.add("row_sum", rows[~non_finite & ~np.isclose(sums, 1.0, rtol=rtol, atol=atol)])
+
+def validate_discrete_mdp(P, R, gamma, n_states=None, n_actions=None, atol=1e-8,
+                          chunk_rows=VALIDATION_CHUNK_ROWS, raise_on_error=True, rtol=1e-5):
+    """
+    Vollständige, vektorisierte Prüfung eines diskreten MDPs:
+    Shapes, Zeilensummen von P (|Summe - 1| <= atol + rtol wie bei np.isclose; die
+    Standardwerte entsprechen np.allclose), keine negativen Einträge, keine NaN/inf
+    in P und R sowie 0 <= gamma <= 1. P (dicht, np.memmap oder SparseTransitions) wird
+    in Blöcken von chunk_rows (s, a)-Zeilen gelesen, nie vollständig in den Speicher geladen.
+
+    Gibt einen ValidationReport zurück; bei raise_on_error=True wird bei Befunden
+    MDPValidationError (ein ValueError) mit dem Bericht ausgelöst.
+    """
+    # Verschachtelte Listen erlauben; asanyarray lässt np.memmap ohne Kopie durch
+    if not isinstance(P, SparseTransitions):
+        P = np.asanyarray(P)
+    R = np.asanyarray(R)
+    if n_states is None or n_actions is None:
+        n_states, n_actions = P.shape[0], P.shape[1]
+    validate_discrete_mdp_shapes(P, R, n_states, n_actions)
+    report = ValidationReport(n_actions)
+    if isinstance(P, SparseTransitions):
+        _sparse_row_checks(P, rtol, atol, chunk_rows, report)
+    else:
+        _dense_row_checks(P, n_states, n_actions, rtol, atol, chunk_rows, report)
+    R2 = R.reshape(n_states * n_actions)
+    for start in range(0, R2.shape[0], chunk_rows):
+        block = np.asarray(R2[start:start + chunk_rows])
+        report.add("non_finite_R", start + np.flatnonzero(~np.isfinite(block)))
+    if not (0.0 <= gamma <= 1.0):
+        report.gamma_error = f"gamma muss in [0, 1] liegen, ist aber {gamma}"
+    if raise_on_error and not report.ok:
+        raise MDPValidationError(report)
+    return report
+
+def is_stochastic_matrix(P, atol=1e-8, rtol=1e-5):
     """
-    Prüft, ob P eine stochastische Matrix ist (jede Zeile summiert auf 1).
+    Prüft, ob P stochastisch ist (jede Zeile nicht-negativ, endlich und mit Summe 1
+    bis auf atol + rtol, Standard wie np.allclose).
+    P: 2-D-Matrix, voller Tensor (n_states, n_actions, n_states) oder SparseTransitions;
+    geprüft wird blockweise über alle Zeilen bzw. (s, a)-Paare.
     """
-    P = np.asarray(P)
-    if P.ndim != 2:
+    if isinstance(P, SparseTransitions):
+        report = ValidationReport(P.n_actions)
+        _sparse_row_checks(P, rtol, atol, VALIDATION_CHUNK_ROWS, report)
+        return report.ok
+    if not hasattr(P, "shape"):
+        P = np.asarray(P)
+    if P.ndim not in (2, 3):
         return False
-    return np.allclose(P.sum(axis=1), 1)
+    # Zeilen dürfen hier beliebig viele Spalten haben (nicht zwingend n_states)
+    P2 = P.reshape(-1, P.shape[-1])
+    for start in range(0, P2.shape[0], VALIDATION_CHUNK_ROWS):
+        block = np.asarray(P2[start:start + VALIDATION_CHUNK_ROWS])
+        if not (np.isfinite(block).all() and (block >= 0).all()
+                and np.allclose(block.sum(axis=1), 1.0, rtol=rtol, atol=atol)):
+            return False
+    return True
 
 def validate_discrete_mdp_shapes(P, R, n_states, n_actions):
     """
     Prüft, ob P und R die erwarteten Shapes für ein diskretes MDP haben.
+    P darf dicht oder als SparseTransitions vorliegen.
     """
-    P = np.asarray(P)
+    if isinstance(P, SparseTransitions):
+        if P.indices.size and (P.indices.min() < 0 or P.indices.max() >= n_states):
+            raise ValueError(f"Folgezustände in P müssen im Bereich [0, {n_states}) liegen.")
+    else:
+        P = np.asarray(P)
     R = np.asarray(R)
     if P.shape != (n_states, n_actions, n_states):
         raise ValueError(f"P muss Shape {(n_states, n_actions, n_states)} haben, hat aber {P.shape}")
@@ -29,3 +180,6 @@ if __name__ == "__main__":
     print("Ist stochastisch:", is_stochastic_matrix(P[0, 0]))
     validate_discrete_mdp_shapes(P, R, 2, 3)
     print("Validation erfolgreich.")
+    P[1, 2] = [0.7, 0.7]
+    R[0, 1] = np.nan
+    print(validate_discrete_mdp(P, R, 1.5, raise_on_error=False))
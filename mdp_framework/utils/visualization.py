@@ -1,27 +1,32 @@
 # mdp_framework/utils/visualization.py
 
+import os
 import numpy as np
-import matplotlib.pyplot as plt
+from mdp_framework.utils.grid import evaluate_grid, state_grid as make_state_grid
+from mdp_framework.utils.sampling import get_rng
+
+def _pyplot():
+    # matplotlib erst beim ersten Plot laden, nicht beim Import des Moduls
+    import matplotlib.pyplot as plt
+    return plt
 
 def plot_discrete_mdp(mdp, max_edges_per_node=4, show_rewards=True, figsize=(8, 6)):
     """
     Visualisiert ein diskretes MDP als gerichteten Graphen.
     Zeigt die wichtigsten Übergänge pro Zustand/Aktion.
+    Für große MDPs render_discrete_mdp verwenden (begrenzte Laufzeit, Ausgabe in Datei).
     """
+    plt = _pyplot()
     import networkx as nx
 
     G = nx.MultiDiGraph()
-    for s in range(mdp.n_states):
-        for a in range(mdp.n_actions):
-            probs = mdp.P[s, a]
-            # Zeige nur stärkste Übergänge (max_edges_per_node)
-            idx = np.argsort(probs)[-max_edges_per_node:]
-            for s2 in idx:
-                if probs[s2] > 0.01:  # kleine Kanten ausblenden
-                    label = f"a={a}, p={probs[s2]:.2f}"
-                    if show_rewards:
-                        label += f", r={mdp.R[s,a]:.2f}"
-                    G.add_edge(s, s2, label=label)
+    # Zeige nur stärkste Übergänge (max_edges_per_node), kleine Kanten ausblenden
+    src, act, dst, prob = top_k_edges(mdp, max_edges_per_node, min_prob=0.01)
+    for s, a, s2, p in zip(src, act, dst, prob):
+        label = f"a={a}, p={p:.2f}"
+        if show_rewards:
+            label += f", r={mdp.R[s,a]:.2f}"
+        G.add_edge(s, s2, label=label)
 
     pos = nx.spring_layout(G)
     plt.figure(figsize=figsize)
@@ -32,24 +37,201 @@ def plot_discrete_mdp(mdp, max_edges_per_node=4, show_rewards=True, figsize=(8,
     plt.tight_layout()
     plt.show()
 
+# Zeilen (s, a) pro Block bei der Kantenauswahl aus dichtem P
+EDGE_CHUNK_ROWS = 4096
+# Bis zu dieser Knotenzahl werden Knoten im Bild beschriftet
+MAX_NODE_LABELS = 50
+
+def top_k_edges(mdp, k, min_prob=0.0, states=None):
+    """
+    Wählt für jedes (s, a) die k wahrscheinlichsten Folgezustände, vektorisiert per
+    argpartition (dichtes P, blockweise) bzw. einer Sortierung der CSR-Einträge (dünnes P).
+    states: Optional, nur diese Ausgangszustände betrachten.
+    Gibt (Zustand, Aktion, Folgezustand, Wahrscheinlichkeit) als Arrays zurück,
+    ohne Kanten mit Wahrscheinlichkeit <= min_prob.
+    """
+    n_states, n_actions = mdp.n_states, mdp.n_actions
+    if states is None:
+        rows = np.arange(n_states * n_actions)
+    else:
+        rows = (np.asarray(states)[:, None] * n_actions + np.arange(n_actions)).ravel()
+    if mdp.is_sparse:
+        P = mdp.P
+        row_ids = P.row_ids()
+        selected = np.zeros(n_states * n_actions, dtype=bool)
+        selected[rows] = True
+        entries = np.flatnonzero(selected[row_ids])
+        # Nach Zeile, innerhalb der Zeile absteigend nach Wahrscheinlichkeit sortieren
+        entries = entries[np.lexsort((-P.data[entries], row_ids[entries]))]
+        rank = np.arange(len(entries)) - np.searchsorted(row_ids[entries], row_ids[entries], side="left")
+        entries = entries[rank < k]
+        edge_rows, dst, prob = row_ids[entries], P.indices[entries], P.data[entries]
+    else:
+        k = min(int(k), n_states)
+        P2 = mdp.P.reshape(n_states * n_actions, n_states)
+        parts = []
+        for start in range(0, len(rows), EDGE_CHUNK_ROWS):
+            block_rows = rows[start:start + EDGE_CHUNK_ROWS]
+            block = np.asarray(P2[block_rows])
+            idx = np.argpartition(block, n_states - k, axis=1)[:, n_states - k:]
+            parts.append((np.repeat(block_rows, k), idx.ravel(), np.take_along_axis(block, idx, axis=1).ravel()))
+        edge_rows, dst, prob = (np.concatenate(arrays) for arrays in zip(*parts))
+    keep = prob > min_prob
+    edge_rows = edge_rows[keep]
+    return edge_rows // n_actions, edge_rows % n_actions, dst[keep], prob[keep]
+
+def _aggregate_graph(mdp, n_groups, k):
+    """
+    Fasst die Zustände zu n_groups zusammenhängenden Blöcken zusammen. Kantengewicht
+    (g, h) = mittlere Wahrscheinlichkeit, von einem Zustand in g (über alle Aktionen)
+    nach h zu gelangen; pro Block werden die k stärksten Kanten (Gewicht > 0) behalten.
+    """
+    n_states, n_actions = mdp.n_states, mdp.n_actions
+    group = np.arange(n_states) * n_groups // n_states
+    W = np.zeros((n_groups, n_groups))
+    if mdp.is_sparse:
+        src_group = group[mdp.P.row_ids() // n_actions]
+        W += np.bincount(src_group * n_groups + group[mdp.P.indices], weights=mdp.P.data,
+                         minlength=n_groups * n_groups).reshape(n_groups, n_groups)
+    else:
+        P2 = mdp.P.reshape(n_states * n_actions, n_states)
+        group_starts = np.searchsorted(group, np.arange(n_groups))
+        for start in range(0, n_states * n_actions, EDGE_CHUNK_ROWS):
+            block = np.asarray(P2[start:start + EDGE_CHUNK_ROWS])
+            col_sums = np.add.reduceat(block, group_starts, axis=1)
+            np.add.at(W, group[np.arange(start, start + len(block)) // n_actions], col_sums)
+    sizes = np.bincount(group, minlength=n_groups)
+    W /= (sizes * n_actions)[:, None]
+    k = min(int(k), n_groups)
+    idx = np.argpartition(W, n_groups - k, axis=1)[:, n_groups - k:]
+    src = np.repeat(np.arange(n_groups), k)
+    dst = idx.ravel()
+    prob = np.take_along_axis(W, idx, axis=1).ravel()
+    keep = prob > 0
+    rewards = np.bincount(group, weights=mdp.R.max(axis=1), minlength=n_groups) / sizes
+    return np.arange(n_groups), sizes, rewards, src[keep], np.full(keep.sum(), -1), dst[keep], prob[keep]
+
+def _layout(n_nodes, src, dst, layout, rng):
+    if layout == "spring":
+        import networkx as nx
+        G = nx.DiGraph()
+        G.add_nodes_from(range(n_nodes))
+        G.add_edges_from(zip(src, dst))
+        pos = nx.spring_layout(G, iterations=50, seed=int(rng.integers(2**31)))
+        return np.array([pos[i] for i in range(n_nodes)])
+    angles = 2 * np.pi * np.arange(n_nodes) / max(n_nodes, 1)
+    return np.column_stack([np.cos(angles), np.sin(angles)])
+
+def _write_image(filepath, labels, rewards, pos, src, dst, prob, title, figsize, dpi):
+    # Objektorientierte matplotlib-API ohne pyplot: kein GUI-Backend, kein plt.show()
+    from matplotlib.figure import Figure
+    from matplotlib.collections import LineCollection
+
+    fig = Figure(figsize=figsize)
+    ax = fig.add_subplot()
+    segments = np.stack([pos[src], pos[dst]], axis=1)
+    ax.add_collection(LineCollection(segments, linewidths=0.3 + 2.0 * prob, colors="gray",
+                                     alpha=float(np.clip(200.0 / max(len(src), 1), 0.05, 0.8))))
+    nodes = ax.scatter(pos[:, 0], pos[:, 1], c=rewards, cmap="viridis", s=max(5.0, 3000.0 / max(len(pos), 1)), zorder=2)
+    fig.colorbar(nodes, ax=ax, label="max. Reward")
+    if len(pos) <= MAX_NODE_LABELS:
+        for label, (x, y) in zip(labels, pos):
+            ax.annotate(str(label), (x, y), ha="center", va="center", fontsize=7, zorder=3)
+    ax.set_title(title)
+    ax.set_axis_off()
+    fig.savefig(filepath, dpi=dpi, bbox_inches="tight")
+
+def _write_graphml(filepath, labels, sizes, rewards, src, act, dst, prob):
+    with open(filepath, "w") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+                '  <key id="reward" for="node" attr.name="reward" attr.type="double"/>\n'
+                '  <key id="size" for="node" attr.name="size" attr.type="int"/>\n'
+                '  <key id="action" for="edge" attr.name="action" attr.type="int"/>\n'
+                '  <key id="prob" for="edge" attr.name="prob" attr.type="double"/>\n'
+                '  <graph edgedefault="directed">\n')
+        for label, size, reward in zip(labels, sizes, rewards):
+            f.write(f'    <node id="n{label}"><data key="reward">{reward!r}</data>'
+                    f'<data key="size">{size}</data></node>\n')
+        for s, a, s2, p in zip(labels[src], act, labels[dst], prob):
+            f.write(f'    <edge source="n{s}" target="n{s2}"><data key="action">{a}</data>'
+                    f'<data key="prob">{p!r}</data></edge>\n')
+        f.write("  </graph>\n</graphml>\n")
+
+def _write_dot(filepath, labels, sizes, rewards, src, act, dst, prob):
+    with open(filepath, "w") as f:
+        f.write("digraph MDP {\n")
+        for label, size, reward in zip(labels, sizes, rewards):
+            f.write(f'  {label} [reward={reward:.6g}, size={size}];\n')
+        for s, a, s2, p in zip(labels[src], act, labels[dst], prob):
+            action = f'a={a}, ' if a >= 0 else ""
+            f.write(f'  {s} -> {s2} [weight={p:.6g}, label="{action}p={p:.2f}"];\n')
+        f.write("}\n")
+
+def render_discrete_mdp(mdp, filepath, k=3, max_states=200, reduce="aggregate", min_prob=0.01,
+                        layout="circular", figsize=(10, 10), dpi=150, rng=None):
+    """
+    Rendert auch sehr große diskrete MDPs (dichtes oder dünnes P) direkt in eine Datei,
+    ohne plt.show(). Das Format folgt aus der Endung: .png/.svg/.pdf (Bild), .graphml
+    oder .dot (für externe Werkzeuge wie Gephi oder Graphviz).
+
+    - k: stärkste Folgezustände pro (s, a) (bzw. pro Block bei reduce="aggregate")
+    - min_prob: Übergänge mit kleinerer Wahrscheinlichkeit ausblenden (nicht bei Blöcken)
+    - max_states: höchstens so viele Knoten; größere MDPs werden reduziert durch
+      reduce="aggregate" (zusammenhängende Zustandsblöcke) oder "subsample" (zufällige Zustände,
+      nur Kanten zwischen ihnen)
+    - layout: "circular" (O(n)) oder "spring" (networkx, auf höchstens max_states Knoten)
+
+    Gibt die Anzahl der gezeichneten Knoten und Kanten als dict zurück.
+    """
+    rng = get_rng(rng)
+    n_states = mdp.n_states
+    if n_states > max_states and reduce == "aggregate":
+        labels, sizes, rewards, src, act, dst, prob = _aggregate_graph(mdp, max_states, k)
+        title = f"Diskretes MDP ({n_states} Zustände in {max_states} Blöcken)"
+    elif n_states > max_states and reduce != "subsample":
+        raise ValueError(f"Unbekannte Reduktion: {reduce}")
+    else:
+        if n_states > max_states:
+            labels = np.sort(rng.choice(n_states, size=max_states, replace=False))
+            title = f"Diskretes MDP ({max_states} von {n_states} Zuständen)"
+        else:
+            labels = np.arange(n_states)
+            title = "Diskretes MDP"
+        s, act, s2, prob = top_k_edges(mdp, k, min_prob=min_prob, states=labels)
+        # Zustandsnummern auf Knotenpositionen abbilden, Kanten aus der Auswahl heraus verwerfen
+        node_of = np.full(n_states, -1)
+        node_of[labels] = np.arange(len(labels))
+        src, dst = node_of[s], node_of[s2]
+        keep = dst >= 0
+        src, act, dst, prob = src[keep], act[keep], dst[keep], prob[keep]
+        sizes = np.ones(len(labels), dtype=np.int64)
+        rewards = np.asarray(mdp.R)[labels].max(axis=1)
+
+    ext = os.path.splitext(filepath)[1].lower()
+    if ext == ".graphml":
+        _write_graphml(filepath, labels, sizes, rewards, src, act, dst, prob)
+    elif ext in (".dot", ".gv"):
+        _write_dot(filepath, labels, sizes, rewards, src, act, dst, prob)
+    else:
+        pos = _layout(len(labels), src, dst, layout, rng)
+        _write_image(filepath, labels, rewards, pos, src, dst, prob, title, figsize, dpi)
+    return {"n_nodes": int(len(labels)), "n_edges": int(len(src))}
+
 def plot_continuous_reward(mdp, state_grid=None, action=None, resolution=50, figsize=(7,6)):
     """
     Zeigt die Reward-Landschaft für ein 2D-Continuous-MDP und eine feste Aktion (default: Null-Aktion).
     """
+    plt = _pyplot()
     assert mdp.state_dim == 2, "Nur für 2D-State-Space"
     if action is None:
         action = np.zeros(mdp.action_dim)
     if state_grid is None:
-        x = np.linspace(-1, 1, resolution)
-        y = np.linspace(-1, 1, resolution)
-        X, Y = np.meshgrid(x, y)
+        X, Y = make_state_grid(resolution)
     else:
         X, Y = state_grid
-    Z = np.zeros_like(X)
-    for i in range(X.shape[0]):
-        for j in range(X.shape[1]):
-            s = np.array([X[i, j], Y[i, j]])
-            Z[i, j] = mdp.reward_func(s, action)
+    # Ein Aufruf auf dem gestapelten Gitter, falls reward_func gebündelt rechnen kann
+    Z = evaluate_grid(mdp.reward_func, X, Y, action)
 
     plt.figure(figsize=figsize)
     plt.contourf(X, Y, Z, levels=25, cmap="viridis")
@@ -63,19 +245,14 @@ def plot_continuous_reward(mdp, state_grid=None, action=None, resolution=50, fig
 def plot_continuous_policy(mdp, policy_func, resolution=20, action_scale=0.3, figsize=(7,7)):
     """
     Zeichnet ein Policy-Vektorfeld für 2D-Stetig-Zustand, beliebige Aktionsdim (Pfeile).
+    Mit policy_func.batched = True wird das Gitter in einem Aufruf ausgewertet, sonst zeilenweise.
     """
+    plt = _pyplot()
     assert mdp.state_dim == 2, "Nur für 2D-State-Space"
-    x = np.linspace(-1, 1, resolution)
-    y = np.linspace(-1, 1, resolution)
-    X, Y = np.meshgrid(x, y)
-    U = np.zeros_like(X)
-    V = np.zeros_like(Y)
-    for i in range(X.shape[0]):
-        for j in range(X.shape[1]):
-            s = np.array([X[i, j], Y[i, j]])
-            a = policy_func(s)
-            U[i, j] = a[0]
-            V[i, j] = a[1] if mdp.action_dim > 1 else 0
+    X, Y = make_state_grid(resolution)
+    actions = evaluate_grid(policy_func, X, Y).reshape(X.shape + (-1,))
+    U = actions[..., 0]
+    V = actions[..., 1] if mdp.action_dim > 1 else np.zeros_like(U)
 
     plt.figure(figsize=figsize)
     plt.quiver(X, Y, U, V, angles="xy", scale_units="xy", scale=1/action_scale, color="red")
@@ -89,6 +266,7 @@ def plot_trajectory(mdp, policy_func=None, start_state=None, T=30, action_noise=
     """
     Simuliert und plottet eine Trajektorie (nur für 2D-State-Space sinnvoll!).
     """
+    plt = _pyplot()
     assert mdp.state_dim == 2, "Nur für 2D-State-Space"
     s = mdp.sample_state() if start_state is None else np.array(start_state)
     xs, ys = [s[0]], [s[1]]
@@ -97,7 +275,7 @@ def plot_trajectory(mdp, policy_func=None, start_state=None, T=30, action_noise=
             a = policy_func(s)
         else:
             a = mdp.sample_action()
-        a = a + np.random.randn(*a.shape) * action_noise if action_noise > 0 else a
+        a = a + mdp.rng.standard_normal(a.shape) * action_noise if action_noise > 0 else a
         s, _ = mdp.step(a)
         xs.append(s[0])
         ys.append(s[1])
@@ -129,6 +307,9 @@ if __name__ == "__main__":
     mdp_d = random_discrete_mdp(5, 2)
     plot_discrete_mdp(mdp_d)
 
+    from mdp_framework.generators.structured_generator import grid_world_mdp
+    print("Große Grid-World als Datei:", render_discrete_mdp(grid_world_mdp(100, 100), "grid_world.png", k=2))
+
     print("Stetiges 2D-MDP-Beispiel:")
     mdp_c = random_continuous_mdp(2, 2)
     plot_continuous_reward(mdp_c)
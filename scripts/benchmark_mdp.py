@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from mdp_framework.generators.discrete_generator import random_discrete_mdp
+from mdp_framework.generators.continuous_generator import random_continuous_mdp
+from mdp_framework.generators.structured_generator import random_sparse_discrete_mdp
+from mdp_framework.io.json_io import save_mdp_to_json, load_mdp_from_json
+from mdp_framework.io.pickle_io import save_mdp_to_pickle, load_mdp_from_pickle
+from mdp_framework.io.binary_io import save_mdp_to_binary, load_mdp_from_binary
+from mdp_framework.solvers.dynamic_programming import value_iteration, policy_iteration
+from mdp_framework.solvers.evaluation import evaluate_policy
+
+CATEGORIES = ("step", "generate", "io", "solve")
+# Stepping-Benchmarks setzen nach so vielen Schritten zurück (instabile lineare Dynamiken)
+EPISODE_LENGTH = 100
+
+def parse_pairs(text):
+    """
+    "10x2,100x4" -> [(10, 2), (100, 4)]
+    """
+    return [tuple(int(v) for v in item.split("x")) for item in text.split(",") if item]
+
+def measure(func, repeat, trace_memory=False):
+    """
+    Führt func nach einem ungemessenen Aufwärmlauf (Lazy Imports, Caches) repeat-mal aus und
+    gibt (beste Zeit in s, Spitzenspeicher in Bytes oder None) zurück. Der Speicher wird in
+    einem zusätzlichen Lauf mit tracemalloc gemessen, damit die Zeiten nicht verfälscht werden.
+    """
+    func()
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    peak = None
+    if trace_memory:
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return best, peak
+
+def record(results, name, params, seconds, peak=None, units=None):
+    # seconds_per_op: Zeit je Einheit (z.B. je Schritt), unabhängig von --steps vergleichbar
+    entry = {"name": name, "params": params, "seconds": seconds,
+             "seconds_per_op": seconds / (units if units is not None else 1)}
+    if units is not None:
+        entry["per_second"] = units / seconds if seconds > 0 else None
+    if peak is not None:
+        entry["peak_bytes"] = int(peak)
+    results.append(entry)
+    rate = f", {entry['per_second']:.0f}/s" if units is not None else ""
+    mem = f", Spitze {peak / 1e6:.2f} MB" if peak is not None else ""
+    print(f"{name:24s} {json.dumps(params):40s} {seconds * 1e3:10.2f} ms{rate}{mem}")
+
+def bench_step(results, args):
+    for n_states, n_actions in args.sizes:
+        mdp = random_discrete_mdp(n_states, n_actions, rng=args.seed)
+        actions = mdp.rng.integers(n_actions, size=args.steps)
+        mdp.sampling_table  # Tabelle vorab bauen, gemessen wird nur das Stepping
+
+        def run():
+            for t, a in enumerate(actions):
+                if t % EPISODE_LENGTH == 0:
+                    mdp.reset()
+                mdp.step(int(a))
+        record(results, "discrete_step", {"n_states": n_states, "n_actions": n_actions},
+               measure(run, args.repeat)[0], units=args.steps)
+    for state_dim, action_dim in args.dims:
+        mdp = random_continuous_mdp(state_dim, action_dim, rng=args.seed)
+        actions = mdp.rng.uniform(-1, 1, size=(args.steps, action_dim))
+
+        def run():
+            for t, a in enumerate(actions):
+                if t % EPISODE_LENGTH == 0:
+                    mdp.reset()
+                mdp.step(a)
+        record(results, "continuous_step", {"state_dim": state_dim, "action_dim": action_dim},
+               measure(run, args.repeat)[0], units=args.steps)
+
+def bench_generate(results, args):
+    for n_states, n_actions in args.sizes:
+        seconds, peak = measure(lambda: random_discrete_mdp(n_states, n_actions, rng=args.seed),
+                                args.repeat, trace_memory=True)
+        record(results, "generate_discrete", {"n_states": n_states, "n_actions": n_actions}, seconds, peak)
+    for state_dim, action_dim in args.dims:
+        seconds, _ = measure(lambda: random_continuous_mdp(state_dim, action_dim, rng=args.seed), args.repeat)
+        record(results, "generate_continuous", {"state_dim": state_dim, "action_dim": action_dim}, seconds)
+
+def bench_io(results, args):
+    formats = {
+        "json": (save_mdp_to_json, load_mdp_from_json, ".json"),
+        "pickle": (save_mdp_to_pickle, load_mdp_from_pickle, ".pkl"),
+        "binary": (save_mdp_to_binary, lambda path: load_mdp_from_binary(path, mmap_mode=None), ".mdp"),
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_states, n_actions in args.sizes:
+            mdp = random_discrete_mdp(n_states, n_actions, rng=args.seed)
+            params = {"n_states": n_states, "n_actions": n_actions}
+            for fmt, (save, load, ext) in formats.items():
+                path = os.path.join(tmp, f"bench{ext}")
+                seconds, peak = measure(lambda: save(mdp, path), args.repeat, trace_memory=True)
+                record(results, f"{fmt}_save", params, seconds, peak)
+                size = os.path.getsize(path)
+                seconds, peak = measure(lambda: load(path), args.repeat, trace_memory=True)
+                record(results, f"{fmt}_load", dict(params, file_bytes=size), seconds, peak)
+
+def bench_solve(results, args):
+    for n_states, n_actions in args.sizes:
+        mdp = random_discrete_mdp(n_states, n_actions, gamma=0.95, rng=args.seed)
+        params = {"n_states": n_states, "n_actions": n_actions}
+        policy = np.zeros(n_states, dtype=np.int64)
+        record(results, "value_iteration", params, measure(lambda: value_iteration(mdp), args.repeat)[0])
+        record(results, "policy_iteration", params, measure(lambda: policy_iteration(mdp), args.repeat)[0])
+        record(results, "evaluate_policy", params, measure(lambda: evaluate_policy(mdp, policy), args.repeat)[0])
+    for n_states in args.sparse_states:
+        mdp = random_sparse_discrete_mdp(n_states, 4, n_successors=5, gamma=0.95, rng=args.seed)
+        params = {"n_states": n_states, "n_actions": 4, "n_successors": 5}
+        policy = np.zeros(n_states, dtype=np.int64)
+        record(results, "sparse_evaluate_policy", params,
+               measure(lambda: evaluate_policy(mdp, policy, method="gmres"), args.repeat)[0])
+        record(results, "sparse_value_iteration", params, measure(lambda: value_iteration(mdp), args.repeat)[0])
+
+def result_key(entry):
+    params = {k: v for k, v in entry["params"].items() if k != "file_bytes"}
+    return entry["name"], json.dumps(params, sort_keys=True)
+
+def seconds_per_op(entry, meta):
+    """
+    Zeit je Einheit eines Ergebnisses; ältere Baselines ohne seconds_per_op werden über
+    per_second bzw. die dort verwendete Schrittzahl umgerechnet.
+    """
+    if "seconds_per_op" in entry:
+        return entry["seconds_per_op"]
+    if entry.get("per_second"):
+        return 1.0 / entry["per_second"]
+    if entry["name"].endswith("_step"):
+        return entry["seconds"] / meta.get("steps", 1)
+    return entry["seconds"]
+
+def environment_differences(meta, baseline_meta):
+    """
+    Namen der Umgebungsangaben (Python, NumPy, Plattform), in denen sich zwei Läufe unterscheiden.
+    """
+    return [key for key in ("python", "numpy", "platform") if meta.get(key) != baseline_meta.get(key)]
+
+def compare(results, baseline, threshold, meta=None):
+    """
+    Vergleicht die Zeiten je Einheit (seconds_per_op) mit einer gespeicherten Baseline,
+    sodass Läufe mit unterschiedlichem --steps vergleichbar bleiben. Gibt die Liste der
+    Regressionen (Zeit > (1 + threshold) * Baseline) zurück. Mit meta (Metadaten des
+    aktuellen Laufs) werden abweichende Umgebungen bzw. Wiederholungszahlen gemeldet.
+    """
+    baseline_meta = baseline.get("meta", {})
+    if meta is not None:
+        differences = environment_differences(meta, baseline_meta)
+        if meta.get("repeat") != baseline_meta.get("repeat"):
+            differences.append("repeat")
+        if differences:
+            print(f"Warnung: Baseline weicht ab in {', '.join(differences)}; Verhältnisse nur bedingt vergleichbar.")
+    reference = {result_key(entry): entry for entry in baseline["results"]}
+    regressions = []
+    print("\nVergleich mit Baseline (Verhältnis aktuell / Baseline, Zeit je Einheit):")
+    for entry in results:
+        base = reference.get(result_key(entry))
+        if base is None:
+            continue
+        base_per_op = seconds_per_op(base, baseline_meta)
+        if base_per_op <= 0:
+            continue
+        ratio = seconds_per_op(entry, meta or {}) / base_per_op
+        marker = ""
+        if ratio > 1 + threshold:
+            marker = "  <-- Regression"
+            regressions.append((entry, ratio))
+        print(f"{entry['name']:24s} {json.dumps(entry['params']):40s} {ratio:6.2f}x{marker}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmarks für Stepping, Generierung, I/O und Lösungsverfahren."
+    )
+    parser.add_argument("--sizes", type=parse_pairs, default=parse_pairs("10x2,100x4,500x8"),
+                        help="Diskrete Größen als n_states x n_actions, kommagetrennt")
+    parser.add_argument("--dims", type=parse_pairs, default=parse_pairs("3x2,32x8"),
+                        help="Stetige Dimensionen als state_dim x action_dim, kommagetrennt")
+    parser.add_argument("--sparse_states", type=lambda s: [int(v) for v in s.split(",") if v], default=[10000],
+                        help="Zustandszahlen für dünn besetzte Lösungs-Benchmarks, kommagetrennt")
+    parser.add_argument("--steps", type=int, default=10000, help="Schritte pro Stepping-Benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Wiederholungen, gemeldet wird die beste Zeit")
+    parser.add_argument("--only", nargs="+", choices=CATEGORIES, default=list(CATEGORIES), help="Nur diese Kategorien")
+    parser.add_argument("--seed", type=int, default=0, help="Seed für die erzeugten MDPs")
+    parser.add_argument("--output", type=str, default=None, help="Ergebnisse als JSON in diese Datei schreiben")
+    parser.add_argument("--baseline", type=str, default=None, help="JSON-Datei eines früheren Laufs zum Vergleich")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Relative Verlangsamung, ab der eine Regression gemeldet wird")
+
+    args = parser.parse_args()
+
+    benchmarks = {"step": bench_step, "generate": bench_generate, "io": bench_io, "solve": bench_solve}
+    results = []
+    for category in CATEGORIES:
+        if category in args.only:
+            benchmarks[category](results, args)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "steps": args.steps,
+        },
+        "results": results
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Ergebnisse gespeichert: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, meta=report["meta"])
+        if regressions:
+            print(f"{len(regressions)} Regression(en) über {args.threshold:.0%}.")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
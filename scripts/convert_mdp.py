@@ -1,22 +1,45 @@
 #!/usr/bin/env python3
 
 import argparse
+import importlib
 import os
-from mdp_framework.io.json_io import load_mdp_from_json, save_mdp_to_json
-from mdp_framework.io.pickle_io import load_mdp_from_pickle, save_mdp_to_pickle
-from mdp_framework.core.discrete import DiscreteMDP
-from mdp_framework.core.continuous import ContinuousMDP
+
+# Format -> (Modul, Ladefunktion, Speicherfunktion, Dateiendung); Module werden erst bei Bedarf
+# importiert, damit jeder Aufruf nur das Nötige lädt
+FORMATS = {
+    "json": ("mdp_framework.io.json_io", "load_mdp_from_json", "save_mdp_to_json", ".json"),
+    "pickle": ("mdp_framework.io.pickle_io", "load_mdp_from_pickle", "save_mdp_to_pickle", ".pkl"),
+    "binary": ("mdp_framework.io.binary_io", "load_mdp_from_binary", "save_mdp_to_binary", ".mdp"),
+}
+
+def io_function(fmt, kind):
+    """
+    Gibt die Lade- (kind="load") bzw. Speicherfunktion (kind="save") des Formats zurück.
+    """
+    module_name, load_name, save_name, _ = FORMATS[fmt]
+    return getattr(importlib.import_module(module_name), load_name if kind == "load" else save_name)
+
+def split_format(path):
+    """
+    Zerlegt einen Pfad in (Pfad ohne Endung, Format); gzip-komprimiertes JSON (".json.gz")
+    zählt als JSON, beide Endungen werden entfernt. Unbekannte Endungen liefern Format None.
+    """
+    stem, ext = os.path.splitext(path)
+    if ext.lower() == ".gz":
+        stem, ext = os.path.splitext(stem)
+        return stem, "json" if ext.lower() == ".json" else None
+    return stem, {info[3]: fmt for fmt, info in FORMATS.items()}.get(ext.lower())
 
 def main():
     parser = argparse.ArgumentParser(
-        description="Konvertiert MDP-Dateien zwischen Pickle und JSON (nur diskrete MDPs)."
+        description="Konvertiert MDP-Dateien zwischen Pickle, JSON und Binärformat (stetige MDPs nur mit registrierten Dynamik-/Reward-Funktionen)."
     )
-    parser.add_argument("input", type=str, help="Eingabedatei (.json oder .pkl)")
+    parser.add_argument("input", type=str, help="Eingabedatei (.json, .json.gz, .pkl oder .mdp)")
     parser.add_argument(
         "--to",
-        choices=["json", "pickle"],
+        choices=["json", "pickle", "binary"],
         required=True,
-        help="Zielformat (json oder pickle)"
+        help="Zielformat (json, pickle oder binary)"
     )
     parser.add_argument(
         "--output",
@@ -34,29 +57,33 @@ def main():
         raise FileNotFoundError(f"Eingabedatei nicht gefunden: {in_path}")
 
     # Bestimme Typ der Eingabedatei
-    _, ext = os.path.splitext(in_path)
-    ext = ext.lower()
+    stem, in_format = split_format(in_path)
 
     # Laden
-    if ext == ".json":
-        mdp = load_mdp_from_json(in_path)
-    elif ext == ".pkl":
-        mdp = load_mdp_from_pickle(in_path)
-    else:
-        raise ValueError("Eingabedatei muss .json oder .pkl sein.")
+    if in_format is None:
+        raise ValueError("Eingabedatei muss .json, .json.gz, .pkl oder .mdp sein.")
+    mdp = io_function(in_format, "load")(in_path)
+    from mdp_framework.core.discrete import DiscreteMDP
 
     # Typprüfung/Fehlermeldung
     if to_format == "json":
-        if not isinstance(mdp, DiscreteMDP):
-            raise TypeError("Nur diskrete MDPs können als JSON gespeichert werden.")
-        out_path = out_path or os.path.splitext(in_path)[0] + ".json"
-        save_mdp_to_json(mdp, out_path)
+        if not (isinstance(mdp, DiscreteMDP) or mdp.is_serializable):
+            raise TypeError("Nur diskrete MDPs und stetige MDPs mit registrierten Funktionen können als JSON gespeichert werden.")
+        out_path = out_path or stem + ".json"
+        io_function("json", "save")(mdp, out_path)
         print(f"MDP als JSON gespeichert: {out_path}")
 
     elif to_format == "pickle":
-        out_path = out_path or os.path.splitext(in_path)[0] + ".pkl"
-        save_mdp_to_pickle(mdp, out_path)
+        out_path = out_path or stem + ".pkl"
+        io_function("pickle", "save")(mdp, out_path)
         print(f"MDP als Pickle gespeichert: {out_path}")
 
+    elif to_format == "binary":
+        if not (isinstance(mdp, DiscreteMDP) or mdp.is_serializable):
+            raise TypeError("Nur diskrete MDPs und stetige MDPs mit registrierten Funktionen können im Binärformat gespeichert werden.")
+        out_path = out_path or stem + ".mdp"
+        io_function("binary", "save")(mdp, out_path)
+        print(f"MDP im Binärformat gespeichert: {out_path}")
+
 if __name__ == "__main__":
     main()
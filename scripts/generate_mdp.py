@@ -2,6 +2,9 @@
 
 import argparse
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 from mdp_framework.config import (
     DISCRETE_DATA_PATH,
     CONTINUOUS_DATA_PATH,
@@ -12,15 +15,65 @@ from mdp_framework.config import (
     DEFAULT_GAMMA,
     set_global_seed,
 )
-from mdp_framework.generators.discrete_generator import random_discrete_mdp
-from mdp_framework.generators.continuous_generator import random_continuous_mdp
-from mdp_framework.io.json_io import save_mdp_to_json
-from mdp_framework.io.pickle_io import save_mdp_to_pickle
 
 def ensure_dir_exists(path):
     if not os.path.exists(path):
         os.makedirs(path, exist_ok=True)
 
+def base_filename(args, i):
+    if args.name is None:
+        if args.type == "discrete":
+            return f"discrete_{args.n_states}_{args.n_actions}_mdp_{i+1}"
+        return f"continuous_{args.state_dim}_{args.action_dim}_mdp_{i+1}"
+    # Bei mehreren MDPs den Index anhängen, damit parallele Worker nicht dieselbe Datei schreiben
+    return args.name if args.count == 1 else f"{args.name}_{i+1}"
+
+def output_dir(args):
+    if args.output_dir is not None:
+        return args.output_dir
+    return DISCRETE_DATA_PATH if args.type == "discrete" else CONTINUOUS_DATA_PATH
+
+def generate_and_save(task):
+    """
+    Erzeugt und speichert das i-te MDP mit eigenem, aus SeedSequence abgeleitetem Zufallsstrom.
+    Gibt die Liste der (Meldung, Pfad) der geschriebenen Dateien zurück.
+    """
+    i, seed_seq, args = task
+    # Generatoren und io-Module erst hier laden: --help und Argumentfehler bleiben schnell
+    from mdp_framework.generators.discrete_generator import random_discrete_mdp
+    from mdp_framework.generators.continuous_generator import random_continuous_mdp
+    from mdp_framework.io.json_io import save_mdp_to_json
+    from mdp_framework.io.pickle_io import save_mdp_to_pickle
+    from mdp_framework.io.binary_io import save_mdp_to_binary
+    rng = np.random.default_rng(seed_seq)
+    name = base_filename(args, i)
+    out_dir = output_dir(args)
+    written = []
+    if args.type == "discrete":
+        mdp = random_discrete_mdp(args.n_states, args.n_actions, gamma=args.gamma, rng=rng)
+        if not args.no_json:
+            json_path = os.path.join(out_dir, f"{name}.json")
+            save_mdp_to_json(mdp, json_path)
+            written.append(("Diskretes MDP gespeichert", json_path))
+        if args.binary:
+            bin_path = os.path.join(out_dir, f"{name}.mdp")
+            save_mdp_to_binary(mdp, bin_path)
+            written.append(("Im Binärformat gespeichert", bin_path))
+        if not args.no_pickle:
+            pkl_path = os.path.join(out_dir, f"{name}.pkl")
+            save_mdp_to_pickle(mdp, pkl_path)
+            written.append(("Auch als Pickle gespeichert", pkl_path))
+    elif args.type == "continuous":
+        mdp = random_continuous_mdp(args.state_dim, args.action_dim, gamma=args.gamma, rng=rng)
+        pkl_path = os.path.join(out_dir, f"{name}.pkl")
+        save_mdp_to_pickle(mdp, pkl_path)
+        written.append(("Stetiges MDP gespeichert", pkl_path))
+        if args.binary:
+            bin_path = os.path.join(out_dir, f"{name}.mdp")
+            save_mdp_to_binary(mdp, bin_path)
+            written.append(("Im Binärformat gespeichert", bin_path))
+    return written
+
 def main():
     parser = argparse.ArgumentParser(
         description="Erzeugt zufällige MDPs (diskret oder stetig) und speichert sie ab."
@@ -35,33 +88,44 @@ def main():
     parser.add_argument("--count", type=int, default=1, help="Wieviele MDPs erzeugen?")
     parser.add_argument("--name", type=str, default=None, help="Basisname für MDP-Datei(en)")
     parser.add_argument("--no_pickle", action="store_true", help="Diskrete MDPs NICHT zusätzlich als Pickle speichern")
+    parser.add_argument("--no_json", action="store_true", help="Diskrete MDPs NICHT als JSON speichern")
+    parser.add_argument("--binary", action="store_true", help="MDPs zusätzlich im Binärformat (.mdp) speichern")
+    parser.add_argument("--output_dir", type=str, default=None,
+                        help="Zielverzeichnis (Standard: Datenverzeichnis des MDP-Typs aus config)")
+    parser.add_argument("--workers", type=int, default=1, help="Anzahl paralleler Prozesse (Ergebnis unabhängig davon)")
 
     args = parser.parse_args()
 
     if args.seed is not None:
         set_global_seed(args.seed)
 
-    if args.type == "discrete":
-        ensure_dir_exists(DISCRETE_DATA_PATH)
-        for i in range(args.count):
-            mdp = random_discrete_mdp(args.n_states, args.n_actions, gamma=args.gamma)
-            base_filename = args.name or f"discrete_{args.n_states}_{args.n_actions}_mdp_{i+1}"
-            json_path = os.path.join(DISCRETE_DATA_PATH, f"{base_filename}.json")
-            save_mdp_to_json(mdp, json_path)
-            print(f"Diskretes MDP gespeichert: {json_path}")
-            if not args.no_pickle:
-                pkl_path = os.path.join(DISCRETE_DATA_PATH, f"{base_filename}.pkl")
-                save_mdp_to_pickle(mdp, pkl_path)
-                print(f"Auch als Pickle gespeichert: {pkl_path}")
+    ensure_dir_exists(output_dir(args))
+    # Jedes MDP bekommt einen eigenen Zufallsstrom, damit die Ausgabe nicht von --workers abhängt
+    seed_seqs = np.random.SeedSequence(args.seed).spawn(args.count)
+    tasks = [(i, seed_seqs[i], args) for i in range(args.count)]
 
-    elif args.type == "continuous":
-        ensure_dir_exists(CONTINUOUS_DATA_PATH)
-        for i in range(args.count):
-            mdp = random_continuous_mdp(args.state_dim, args.action_dim, gamma=args.gamma)
-            base_filename = args.name or f"continuous_{args.state_dim}_{args.action_dim}_mdp_{i+1}"
-            pkl_path = os.path.join(CONTINUOUS_DATA_PATH, f"{base_filename}.pkl")
-            save_mdp_to_pickle(mdp, pkl_path)
-            print(f"Stetiges MDP gespeichert: {pkl_path}")
+    start = time.perf_counter()
+    n_files = 0
+    n_bytes = 0
+    if args.workers > 1:
+        executor = ProcessPoolExecutor(max_workers=args.workers)
+        results = executor.map(generate_and_save, tasks, chunksize=max(1, args.count // (4 * args.workers)))
+    else:
+        executor = None
+        results = map(generate_and_save, tasks)
+    try:
+        for written in results:
+            for message, path in written:
+                print(f"{message}: {path}")
+                n_files += 1
+                n_bytes += os.path.getsize(path)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.count} MDPs ({n_files} Dateien, {n_bytes / 1e6:.2f} MB) in {elapsed:.2f}s mit {args.workers} Worker(n): "
+          f"{args.count / elapsed:.1f} MDPs/s, {n_bytes / 1e6 / elapsed:.2f} MB/s")
 
 if __name__ == "__main__":
     main()
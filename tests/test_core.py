@@ -4,6 +4,10 @@ import numpy as np
 import pytest
 from mdp_framework.core.discrete import DiscreteMDP
 from mdp_framework.core.continuous import ContinuousMDP
+from mdp_framework.core.sparse import SparseTransitions
+from mdp_framework.core.vector import VectorDiscreteMDP, VectorContinuousMDP
+from mdp_framework.utils.validators import (MDPValidationError, is_stochastic_matrix, validate_discrete_mdp,
+                                           validate_discrete_mdp_shapes)
 
 
 def test_discrete_mdp_step_and_reset():
@@ -41,3 +45,174 @@ def test_continuous_mdp_step_and_reset():
         s1, r = mdp.step(a)
         assert s1.shape == (state_dim,)
         assert r == 42.0
+
+
+def test_discrete_mdp_sparse_transitions():
+    n_states, n_actions = 5, 2
+    P = np.zeros((n_states, n_actions, n_states))
+    P[:, 0, 0] = 1.0
+    P[:, 1, 1] = 0.5
+    P[:, 1, 4] = 0.5
+    R = np.ones((n_states, n_actions))
+    sparse_P = SparseTransitions.from_dense(P)
+    assert sparse_P.nnz == n_states * 3
+    assert np.allclose(sparse_P.to_dense(), P)
+    assert is_stochastic_matrix(sparse_P)
+    validate_discrete_mdp_shapes(sparse_P, R, n_states, n_actions)
+
+    mdp = DiscreteMDP(n_states, n_actions, sparse_P, R, 0.9)
+    assert mdp.is_sparse
+    for _ in range(10):
+        s1, r = mdp.step(1)
+        assert s1 in (1, 4)
+        assert r == 1.0
+    restored = DiscreteMDP.from_dict(mdp.to_dict())
+    assert restored.is_sparse
+    assert np.allclose(restored.P.to_dense(), P)
+
+
+def test_empty_sparse_row_is_rejected_instead_of_sampling_previous_row():
+    P = np.zeros((3, 1, 3))
+    P[0, 0, 2] = 1.0
+    P[2, 0, 0] = 1.0
+    sparse_P = SparseTransitions.from_dense(P)  # Zeile (1, 0) ist leer
+    mdp = DiscreteMDP(3, 1, sparse_P, np.zeros((3, 1)), 0.9, rng=0)
+    mdp.state = 1
+    with pytest.raises(ValueError):
+        mdp.step(0)
+    with pytest.raises(ValueError):
+        mdp.sampling_table.sample(np.array([0, 1, 2]))
+    assert mdp.sampling_table.sample(np.array([0, 2])).tolist() == [2, 0]
+    assert mdp.validate(raise_on_error=False).indices("row_sum").tolist() == [[1, 0]]
+
+
+def test_validate_discrete_mdp_reports_offending_pairs():
+    n_states, n_actions = 6, 3
+    P = np.full((n_states, n_actions, n_states), 1.0 / n_states)
+    R = np.zeros((n_states, n_actions))
+    P[1, 2, 0] += 0.1
+    sparse_P = SparseTransitions.from_dense(P)
+    P[4, 0, :2] = [-0.5, 1.5 - 4.0 / n_states]
+    start = sparse_P.indptr[4 * n_actions]
+    sparse_P.data[start:start + 2] = P[4, 0, :2]
+    R[3, 1] = np.inf
+    for P_variant in (P, sparse_P):
+        report = validate_discrete_mdp(P_variant, R, 1.2, chunk_rows=4, raise_on_error=False)
+        assert not report.ok and report.gamma_error is not None
+        assert report.indices("row_sum").tolist() == [[1, 2]]
+        assert report.indices("negative").tolist() == [[4, 0]]
+        assert report.indices("non_finite_R").tolist() == [[3, 1]]
+    assert not is_stochastic_matrix(P)
+    with pytest.raises(MDPValidationError):
+        DiscreteMDP(n_states, n_actions, P, R, 0.9, validate=True)
+
+    P_ok = np.full((n_states, n_actions, n_states), 1.0 / n_states)
+    assert is_stochastic_matrix(P_ok)
+    assert DiscreteMDP(n_states, n_actions, P_ok, np.zeros((n_states, n_actions)), 0.9, validate=True).validate().ok
+    # Verschachtelte Listen werden wie Arrays geprüft
+    assert validate_discrete_mdp(P_ok.tolist(), np.zeros((n_states, n_actions)).tolist(), 0.9).ok
+    report = validate_discrete_mdp(P.tolist(), R.tolist(), 0.9, raise_on_error=False)
+    assert report.indices("negative").tolist() == [[4, 0]]
+
+
+def test_vector_discrete_mdp_step_and_auto_reset():
+    n_states, n_actions = 4, 2
+    P = np.zeros((n_states, n_actions, n_states))
+    P[:, 0, 1] = 1.0
+    P[:, 1, 2] = 0.5
+    P[:, 1, 3] = 0.5
+    R = np.arange(n_states * n_actions, dtype=float).reshape(n_states, n_actions)
+    for mdp in (DiscreteMDP(n_states, n_actions, P, R, 0.9),
+                DiscreteMDP(n_states, n_actions, SparseTransitions.from_dense(P), R, 0.9)):
+        venv = VectorDiscreteMDP(mdp, horizon=2)
+        states = venv.reset(8)
+        actions = np.array([0, 1] * 4)
+        s1, r, done = venv.step(actions)
+        assert np.array_equal(r, R[states, actions])
+        assert np.all(s1[actions == 0] == 1)
+        assert np.all(np.isin(s1[actions == 1], [2, 3]))
+        assert not done.any()
+        _, _, done = venv.step(actions)
+        assert done.all()
+        assert np.all(venv.t == 0)
+
+
+def test_vector_continuous_mdp_step():
+    state_dim, action_dim = 3, 2
+
+    def dyn(s, a):
+        return s + a.sum()
+
+    def rew(s, a):
+        return float(s.sum())
+
+    venv = VectorContinuousMDP(ContinuousMDP(state_dim, action_dim, dyn, rew, 0.99))
+    states = venv.reset(5)
+    actions = venv.sample_actions()
+    s1, r, done = venv.step(actions)
+    assert s1.shape == (5, state_dim)
+    assert np.allclose(s1, states + actions.sum(axis=1, keepdims=True))
+    assert np.allclose(r, states.sum(axis=1))
+    assert not done.any()
+
+
+def test_env_pool_backends_keep_per_env_order():
+    from mdp_framework.core.pool import EnvPool
+    from mdp_framework.generators.continuous_generator import random_continuous_mdp
+
+    def make_env(rng):
+        return random_continuous_mdp(3, 2, noise_std=0.0, gamma=0.9, rng=rng)
+
+    actions = np.random.default_rng(0).uniform(-0.1, 0.1, size=(5, 4, 2))
+    reference = [make_env(rng) for rng in np.random.default_rng(1).spawn(4)]
+    start = np.array([env.reset() for env in reference])
+    expected = [[env.step(a) for a in actions[:, i]] for i, env in enumerate(reference)]
+
+    for backend in ("thread", "process", "asyncio"):
+        with EnvPool.from_factory(make_env, 4, rng=1, backend=backend, max_workers=2, max_pending=3) as pool:
+            assert np.allclose(pool.reset(), start)
+            # Alle Schritte ohne Warten einreichen: die Reihenfolge pro Umgebung muss erhalten bleiben
+            futures = [[pool.submit(i, actions[t, i]) for i in range(4)] for t in range(5)]
+            for t in range(5):
+                for i in range(4):
+                    next_state, reward = futures[t][i].result()
+                    assert np.allclose(next_state, expected[i][t][0])
+                    assert np.isclose(reward, expected[i][t][1])
+            states, rewards = pool.step(np.zeros((2, 2)), env_ids=[3, 0])
+            assert states.shape == (2, 3) and rewards.shape == (2,)
+
+
+def test_env_pool_astep_waits_for_slots_without_blocking_the_loop():
+    import asyncio
+    import time
+    from mdp_framework.core.continuous import ContinuousMDP
+    from mdp_framework.core.pool import EnvPool
+
+    def slow_dynamics(state, action):
+        time.sleep(0.1)
+        return state + 1.0
+
+    def make_env(rng):
+        return ContinuousMDP(1, 1, slow_dynamics, lambda s, a: 0.0, 0.9, rng=rng)
+
+    async def run(pool):
+        ticks = []
+
+        async def heartbeat():
+            while True:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.005)
+
+        beat = asyncio.ensure_future(heartbeat())
+        await asyncio.sleep(0)
+        results = await asyncio.gather(*(pool.astep(i % 4, np.zeros(1)) for i in range(8)))
+        beat.cancel()
+        return results, np.diff(ticks)
+
+    for backend in ("thread", "asyncio"):
+        with EnvPool.from_factory(make_env, 4, rng=0, backend=backend, max_workers=2, max_pending=2) as pool:
+            pool.reset()
+            results, gaps = asyncio.run(run(pool))
+            assert len(results) == 8
+            # 8 Schritte à 0.1 s bei 2 Slots: der Herzschlag darf nie einen Schritt lang stehen
+            assert gaps.max() < 0.08
@@ -3,6 +3,9 @@
 import numpy as np
 from mdp_framework.generators.discrete_generator import random_discrete_mdp
 from mdp_framework.generators.continuous_generator import random_continuous_mdp
+from mdp_framework.generators.structured_generator import (
+    random_sparse_discrete_mdp, grid_world_mdp, chain_mdp, block_mdp
+)
 
 def test_random_discrete_mdp_shapes():
     n_states, n_actions = 6, 4
@@ -20,3 +23,53 @@ def test_random_continuous_mdp_shapes():
     assert s_next.shape == (state_dim,)
     assert isinstance(r, float)
 
+
+def test_random_discrete_mdp_rows_are_distributions():
+    mdp = random_discrete_mdp(8, 3)
+    assert np.allclose(mdp.P.sum(axis=2), 1)
+    assert np.all(mdp.P >= 0)
+
+def test_structured_generators_are_sparse_and_stochastic():
+    mdps = [
+        random_sparse_discrete_mdp(50, 3, n_successors=4),
+        grid_world_mdp(4, 3, slip=0.2),
+        chain_mdp(6, ring=True),
+        block_mdp(3, 5, 2, n_successors=2),
+    ]
+    for mdp in mdps:
+        assert mdp.is_sparse
+        assert np.allclose(mdp.P.row_sums(), 1)
+    assert np.all(np.diff(mdps[0].P.indptr) == 4)
+    # In der Grid-World bleibt "hoch" in der obersten Zeile mit Wahrscheinlichkeit >= 1 - slip stehen
+    successors, probs = mdps[1].P.row(0, 0)
+    assert probs[successors == 0].sum() >= 0.8
+    # Im Ring führt "links" aus Zustand 0 in den letzten Zustand
+    successors, probs = mdps[2].P.row(0, 0)
+    assert probs[successors == 5].item() == 0.9
+
+def test_linear_continuous_mdp_batched_and_fused_paths_agree():
+    mdp = random_continuous_mdp(4, 2, noise_std=0.0, rng=0)
+    assert mdp.dynamics_and_reward is not None
+    states = np.random.uniform(-1, 1, size=(16, 4))
+    actions = np.random.uniform(-1, 1, size=(16, 2))
+    next_states, rewards = mdp.evaluate_batch(states, actions)
+    assert next_states.shape == (16, 4)
+    assert rewards.shape == (16,)
+    assert np.allclose(next_states, mdp.dynamics_func(states, actions))
+    assert np.allclose(rewards, mdp.reward_func(states, actions))
+    assert np.allclose(next_states[3], mdp.dynamics_func(states[3], actions[3]))
+    assert np.isclose(rewards[3], mdp.reward_func(states[3], actions[3]))
+
+def test_fused_path_follows_parameter_and_function_changes():
+    import pickle
+    mdp = random_continuous_mdp(2, 1, noise_std=0.0, rng=0)
+    mdp.dynamics_func.A = np.zeros((2, 2))
+    mdp.reward_func.w_s = np.zeros(2)
+    mdp.state = np.ones(2)
+    next_state, reward = mdp.step(np.zeros(1))
+    assert np.allclose(next_state, 0.0) and reward == 0.0
+    mdp.dynamics_func = lambda s, a: s + 42.0
+    assert mdp.dynamics_and_reward is None
+    assert np.allclose(mdp.step(np.zeros(1))[0], 42.0)
+    restored = pickle.loads(pickle.dumps(random_continuous_mdp(2, 1, rng=0)))
+    assert restored.dynamics_and_reward is not None
@@ -1,11 +1,15 @@
 # tests/test_io.py
 
+import json
 import os
 import tempfile
+import numpy as np
+import pytest
 from mdp_framework.generators.discrete_generator import random_discrete_mdp
 from mdp_framework.generators.continuous_generator import random_continuous_mdp
 from mdp_framework.io.json_io import save_mdp_to_json, load_mdp_from_json
 from mdp_framework.io.pickle_io import save_mdp_to_pickle, load_mdp_from_pickle
+from mdp_framework.io.binary_io import save_mdp_to_binary, load_mdp_from_binary
 
 def test_json_save_load_discrete():
     mdp = random_discrete_mdp(4, 3)
@@ -30,3 +34,155 @@ def test_pickle_save_load_continuous():
     assert mdp_loaded.state_dim == mdp.state_dim
     assert mdp_loaded.action_dim == mdp.action_dim
 
+
+def test_json_save_load_sparse_discrete():
+    mdp = random_discrete_mdp(5, 2).to_sparse()
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".json") as tmp:
+        save_mdp_to_json(mdp, tmp.name)
+        mdp_loaded = load_mdp_from_json(tmp.name)
+    assert mdp_loaded.is_sparse
+    assert np.allclose(mdp_loaded.P.to_dense(), mdp.P.to_dense())
+
+def test_binary_save_load_memory_mapped():
+    for mdp in (random_discrete_mdp(5, 3), random_discrete_mdp(5, 3).to_sparse()):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "mdp.mdp")
+            save_mdp_to_binary(mdp, path)
+            mdp_loaded = load_mdp_from_binary(path)
+            assert mdp_loaded.is_sparse == mdp.is_sparse
+            if mdp.is_sparse:
+                assert np.allclose(mdp_loaded.P.to_dense(), mdp.P.to_dense())
+            else:
+                assert isinstance(mdp_loaded.P, np.memmap)
+                assert np.array_equal(mdp_loaded.P, mdp.P)
+            assert np.array_equal(mdp_loaded.R, mdp.R)
+            assert mdp_loaded.gamma == mdp.gamma
+            mdp_loaded.step(0)
+            del mdp_loaded
+
+def test_json_streaming_gzip_precision_and_legacy_format():
+    mdp = random_discrete_mdp(6, 2)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        gz_path = os.path.join(tmpdir, "mdp.json.gz")
+        save_mdp_to_json(mdp, gz_path, indent=None, precision=3)
+        with open(gz_path, "rb") as f:
+            assert f.read(2) == b"\x1f\x8b"
+        mdp_loaded = load_mdp_from_json(gz_path)
+        assert np.allclose(mdp_loaded.P, mdp.P, atol=1e-3)
+
+        # Dateien im alten Format (json.dump von to_dict) bleiben lesbar
+        legacy_path = os.path.join(tmpdir, "legacy.json")
+        with open(legacy_path, "w") as f:
+            json.dump(mdp.to_dict(), f, indent=2)
+        mdp_loaded = load_mdp_from_json(legacy_path)
+        assert np.array_equal(mdp_loaded.P, mdp.P)
+        assert np.array_equal(mdp_loaded.R, mdp.R)
+
+def test_json_precision_roundtrip_passes_validation():
+    from mdp_framework.utils.validators import is_stochastic_matrix
+    mdp = random_discrete_mdp(40, 3, rng=0)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for variant in (mdp, mdp.to_sparse()):
+            path = os.path.join(tmpdir, "rounded.json")
+            save_mdp_to_json(variant, path, precision=3)
+            loaded = load_mdp_from_json(path, validate=True)
+            # Die Rundung verschiebt die Zeilensummen über die Standardtoleranz hinaus
+            assert not loaded.validate(raise_on_error=False).ok
+    # Standardtoleranz wie np.allclose (rtol=1e-5, atol=1e-8)
+    P = np.full((4, 1, 4), 0.25)
+    P[0, 0, 0] += 5e-6
+    assert is_stochastic_matrix(P) and not is_stochastic_matrix(P, rtol=0.0)
+
+
+def test_trajectory_store_append_reopen_and_sample():
+    from mdp_framework.io.trajectory_io import TrajectoryWriter, TrajectoryReader
+    from mdp_framework.utils.rollout import rollout
+
+    mdp = random_discrete_mdp(5, 2)
+    traj = rollout(mdp, None, horizon=4, n_episodes=3)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "traj")
+        with TrajectoryWriter(path) as writer:
+            writer.append_batch(traj)
+        with TrajectoryWriter(path, mode="a") as writer:
+            writer.append([0], [1], [2.5], [3], [True])
+        reader = TrajectoryReader(path)
+        assert len(reader) == 13
+        assert reader.chunks == [(0, 12), (12, 1)]
+        assert isinstance(reader["s"], np.memmap)
+        assert np.array_equal(reader["s"][:12], traj.states.ravel())
+        assert reader["r"][12] == 2.5 and reader["done"][12]
+        batch = reader.sample(7, rng=0)
+        assert batch["s_next"].shape == (7,)
+        assert sum(len(chunk["a"]) for chunk in reader.iter_chunks(chunk_size=5)) == 13
+        del reader, batch
+
+def test_trajectory_index_stays_small_and_drops_unindexed_data():
+    from mdp_framework.io.trajectory_io import TrajectoryWriter, TrajectoryReader, INDEX_FILE, CHUNKS_FILE
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "traj")
+        sizes = []
+        with TrajectoryWriter(path, sync_every=1) as writer:
+            for i in range(50):
+                writer.append([i], [0], [0.0], [i], [False])
+                sizes.append(os.path.getsize(os.path.join(path, INDEX_FILE)))
+        assert max(sizes) - min(sizes) <= 2  # nur die Zähler wachsen, keine Blockliste
+        # Abgebrochenes append: Daten und Blocklänge geschrieben, Index nicht mehr
+        with open(os.path.join(path, "s.bin"), "ab") as f:
+            f.write(np.int64(99).tobytes())
+        with open(os.path.join(path, CHUNKS_FILE), "ab") as f:
+            f.write(np.int64(1).tobytes())
+        with TrajectoryWriter(path, mode="a") as writer:
+            writer.append([7, 8], [1, 1], [1.0, 1.0], [8, 9], [False, True])
+        reader = TrajectoryReader(path)
+        assert len(reader) == 52 and reader.chunks[-2:] == [(49, 1), (50, 2)]
+        assert reader["s"][-3:].tolist() == [49, 7, 8]
+        del reader
+
+
+def test_trajectory_writer_buffers_until_sync_and_checks_layout_on_append():
+    from mdp_framework.io.trajectory_io import TrajectoryWriter, TrajectoryReader
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "traj")
+        writer = TrajectoryWriter(path, state_shape=(2,), state_dtype=np.float32, sync_every=3)
+        for i in range(2):
+            writer.append([[i, i]], [0], [0.0], [[i, i]], [False])
+        assert len(writer) == 2 and len(TrajectoryReader(path)) == 0  # noch nicht synchronisiert
+        writer.sync()
+        assert TrajectoryReader(path).chunks == [(0, 1), (1, 1)]
+        writer.append(np.zeros((3, 2)), [0] * 3, [0.0] * 3, np.zeros((3, 2)), [False] * 3)
+        assert len(TrajectoryReader(path)) == 5  # sync_every erreicht
+        writer.append([[9, 9]], [0], [0.0], [[9, 9]], [True])
+        writer.close()
+        assert len(TrajectoryReader(path)) == 6
+        for kwargs in ({"state_shape": (3,)}, {"state_dtype": np.int64}, {"action_shape": (1,)}):
+            with pytest.raises(ValueError):
+                TrajectoryWriter(path, mode="a", **kwargs)
+        with TrajectoryWriter(path, state_shape=(2,), state_dtype=np.float32, mode="a") as writer:
+            assert len(writer) == 6
+
+
+def test_continuous_linear_mdp_roundtrip_json_binary_and_dict():
+    from mdp_framework.core.continuous import ContinuousMDP
+    mdp = random_continuous_mdp(3, 2, noise_std=0.0, rng=0)
+    states, actions = np.ones((4, 3)), np.ones((4, 2))
+    expected = mdp.evaluate_batch(states, actions)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        loaded = [ContinuousMDP.from_dict(json.loads(json.dumps(mdp.to_dict())))]
+        for name, save, load in (("mdp.json.gz", save_mdp_to_json, load_mdp_from_json),
+                                 ("mdp.mdp", save_mdp_to_binary, load_mdp_from_binary)):
+            path = os.path.join(tmpdir, name)
+            save(mdp, path)
+            loaded.append(load(path))
+    for mdp_loaded in loaded:
+        assert mdp_loaded.dynamics_and_reward is not None
+        assert np.array_equal(mdp_loaded.dynamics_func.A, mdp.dynamics_func.A)
+        for got, want in zip(mdp_loaded.evaluate_batch(states, actions), expected):
+            assert np.allclose(got, want)
+    custom = ContinuousMDP(2, 1, lambda s, a: s, lambda s, a: 0.0, 0.9)
+    with pytest.raises(NotImplementedError):
+        save_mdp_to_json(custom, os.path.join(tempfile.gettempdir(), "custom.json"))
+    with pytest.raises(NotImplementedError):
+        ContinuousMDP.from_dict(custom.to_dict())
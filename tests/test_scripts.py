@@ -0,0 +1,86 @@
+# tests/test_scripts.py
+
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run_script(name, args):
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    return subprocess.run([sys.executable, os.path.join(REPO_ROOT, "scripts", name)] + args,
+                          cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+
+
+def _load_script(name):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(REPO_ROOT, "scripts", f"{name}.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_benchmark_script_writes_results_and_compares_with_baseline(tmp_path):
+    baseline = str(tmp_path / "baseline.json")
+    args = ["--only", "step", "--sizes", "5x2", "--dims", "2x1", "--repeat", "1"]
+    proc = _run_script("benchmark_mdp.py", args + ["--steps", "50", "--output", baseline])
+    assert proc.returncode == 0, proc.stderr
+    with open(baseline) as f:
+        report = json.load(f)
+    assert report["meta"]["steps"] == 50
+    assert {entry["name"] for entry in report["results"]} == {"discrete_step", "continuous_step"}
+    # Andere Schrittzahl, großzügige Schwelle: der Vergleich läuft über die Zeit je Schritt
+    proc = _run_script("benchmark_mdp.py", args + ["--steps", "200", "--baseline", baseline, "--threshold", "50"])
+    assert proc.returncode == 0, proc.stderr + proc.stdout
+    assert "Vergleich mit Baseline" in proc.stdout
+
+
+def test_benchmark_compare_uses_time_per_op():
+    bench = _load_script("benchmark_mdp")
+    params = {"n_states": 5, "n_actions": 2}
+    baseline = {"meta": {"steps": 100, "repeat": 3},
+                "results": [{"name": "discrete_step", "params": params, "seconds": 1.0, "per_second": 100.0},
+                            {"name": "value_iteration", "params": params, "seconds": 1.0}]}
+    # Doppelte Schrittzahl in doppelter Zeit ist keine Regression
+    results = []
+    bench.record(results, "discrete_step", params, 2.0, units=200)
+    bench.record(results, "value_iteration", params, 1.1)
+    meta = {"steps": 200, "repeat": 3}
+    assert bench.compare(results, baseline, threshold=0.2, meta=meta) == []
+    results = []
+    bench.record(results, "discrete_step", params, 2.0, units=100)
+    bench.record(results, "value_iteration", params, 1.5)
+    regressions = bench.compare(results, baseline, threshold=0.2, meta=meta)
+    assert [(entry["name"], round(ratio, 2)) for entry, ratio in regressions] == [
+        ("discrete_step", 2.0), ("value_iteration", 1.5)]
+
+
+def test_generate_script_output_does_not_depend_on_workers(tmp_path):
+    outputs = {}
+    for workers in (1, 2):
+        out_dir = tmp_path / f"workers_{workers}"
+        for mdp_type in ("discrete", "continuous"):
+            proc = _run_script("generate_mdp.py", ["--type", mdp_type, "--count", "4", "--seed", "7", "--binary",
+                                                   "--n_states", "6", "--workers", str(workers),
+                                                   "--output_dir", str(out_dir / mdp_type)])
+            assert proc.returncode == 0, proc.stderr
+        outputs[workers] = {str(path.relative_to(out_dir)): path.read_bytes()
+                            for path in sorted(out_dir.rglob("*")) if path.is_file()}
+    assert len(outputs[1]) == 4 * 3 + 4 * 2
+    assert outputs[1] == outputs[2]
+
+
+def test_convert_script_reads_gzipped_json(tmp_path):
+    from mdp_framework.generators.discrete_generator import random_discrete_mdp
+    from mdp_framework.io.binary_io import load_mdp_from_binary
+    from mdp_framework.io.json_io import save_mdp_to_json
+
+    mdp = random_discrete_mdp(4, 2, rng=0)
+    save_mdp_to_json(mdp, str(tmp_path / "m.json.gz"))
+    proc = _run_script("convert_mdp.py", [str(tmp_path / "m.json.gz"), "--to", "binary"])
+    assert proc.returncode == 0, proc.stderr
+    loaded = load_mdp_from_binary(str(tmp_path / "m.mdp"))
+    assert np.allclose(loaded.P, mdp.P) and np.allclose(loaded.R, mdp.R)
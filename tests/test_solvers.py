@@ -0,0 +1,150 @@
+# tests/test_solvers.py
+
+import numpy as np
+from mdp_framework.core.discrete import DiscreteMDP
+from mdp_framework.generators.discrete_generator import random_discrete_mdp
+from mdp_framework.solvers.dynamic_programming import (
+    value_iteration, policy_iteration, modified_policy_iteration
+)
+
+
+def test_solvers_agree_on_random_mdp():
+    mdp = random_discrete_mdp(30, 4, gamma=0.9)
+    results = [value_iteration(mdp, tol=1e-10), policy_iteration(mdp), modified_policy_iteration(mdp, tol=1e-10)]
+    for result in results:
+        assert result.converged
+        assert result.Q.shape == (30, 4)
+        assert np.allclose(result.V, results[0].V, atol=1e-6)
+        assert np.array_equal(result.policy, results[0].policy)
+    sparse_result = policy_iteration(mdp.to_sparse())
+    assert np.allclose(sparse_result.V, results[0].V, atol=1e-5)
+
+
+def test_value_iteration_two_state_chain():
+    # Aktion 1 führt in den belohnten Zustand 1, der absorbierend ist
+    P = np.zeros((2, 2, 2))
+    P[:, 0, 0] = 1.0
+    P[:, 1, 1] = 1.0
+    R = np.array([[0.0, 0.0], [1.0, 1.0]])
+    result = value_iteration(DiscreteMDP(2, 2, P, R, 0.5), tol=1e-12)
+    assert np.allclose(result.V, [1.0, 2.0])
+    assert result.policy[0] == 1
+
+
+def test_evaluate_policy_methods_agree():
+    from mdp_framework.generators.structured_generator import random_sparse_discrete_mdp
+    from mdp_framework.solvers.evaluation import evaluate_policy
+    mdp = random_sparse_discrete_mdp(300, 3, n_successors=4, gamma=0.9, rng=0)
+    policy = np.arange(300) % 3
+    exact = evaluate_policy(mdp, policy, method="direct")
+    assert exact.converged and exact.residual < 1e-10
+    assert np.allclose(exact.V, evaluate_policy(mdp.to_dense(), policy).V)
+    for method in ("gmres", "bicgstab", "iterative"):
+        result = evaluate_policy(mdp, policy, method=method, tol=1e-10)
+        assert result.converged
+        assert np.allclose(result.V, exact.V, atol=1e-6)
+    # Warmstart mit der exakten Lösung braucht (fast) keine Iterationen
+    assert evaluate_policy(mdp, policy, method="gmres", V0=exact.V).iterations <= 1
+
+
+def test_krylov_budget_counts_iterations_and_non_convergence_warns():
+    import pytest
+    from mdp_framework.generators.structured_generator import random_sparse_discrete_mdp
+    from mdp_framework.solvers.evaluation import GMRES_RESTART, evaluate_policy
+    mdp = random_sparse_discrete_mdp(2500, 2, n_successors=5, gamma=0.99, rng=0)
+    policy = np.zeros(2500, dtype=np.int64)
+    # max_iter zählt innere GMRES-Iterationen, nicht Neustart-Zyklen
+    result = evaluate_policy(mdp, policy, method="gmres", tol=1e-10, max_iter=10 * GMRES_RESTART)
+    assert result.converged and result.method == "evaluate_policy[gmres]"
+    assert result.iterations <= 10 * GMRES_RESTART and result.residual < 1e-6
+    # Ohne Konvergenz: Fixpunkt-Iteration als Rückfall, danach RuntimeWarning
+    with pytest.warns(RuntimeWarning):
+        result = evaluate_policy(mdp, policy, method="gmres", tol=1e-12, max_iter=3)
+    assert not result.converged and result.method == "evaluate_policy[gmres+iterative]"
+    assert result.iterations <= GMRES_RESTART + 3
+    # Bewertung über GMRES (mehr als DIRECT_MAX_STATES Zustände)
+    with pytest.warns(RuntimeWarning):
+        assert not policy_iteration(mdp, max_eval_sweeps=2).converged
+
+
+def test_evaluate_stochastic_policy_matches_mixture():
+    from mdp_framework.solvers.evaluation import evaluate_policy, policy_model
+    mdp = random_discrete_mdp(20, 3, gamma=0.8, rng=1)
+    one_hot = np.eye(3)[np.arange(20) % 3]
+    assert np.allclose(evaluate_policy(mdp, one_hot).V, evaluate_policy(mdp, np.arange(20) % 3).V)
+    uniform = np.full((20, 3), 1.0 / 3)
+    P_dense, R_dense = policy_model(mdp, uniform)
+    P_sparse, R_sparse = policy_model(mdp.to_sparse(), uniform)
+    assert np.allclose(P_sparse.to_dense()[:, 0], P_dense)
+    assert np.allclose(R_sparse, R_dense)
+    assert np.allclose(P_dense.sum(axis=1), 1.0)
+
+
+def test_solution_cache_memory_and_disk_tiers(tmp_path):
+    from mdp_framework.solvers.cache import SolutionCache, mdp_fingerprint
+    from mdp_framework.solvers.evaluation import evaluate_policy
+    mdp = random_discrete_mdp(25, 3, gamma=0.9, rng=2)
+    copy = DiscreteMDP(mdp.n_states, mdp.n_actions, mdp.P, mdp.R, mdp.gamma)
+    assert mdp_fingerprint(mdp) == mdp_fingerprint(copy)
+    assert mdp_fingerprint(mdp) != mdp_fingerprint(mdp.to_sparse())
+
+    cache = SolutionCache(tmp_path, memory_entries=1)
+    first = cache.solve(mdp, value_iteration, tol=1e-8)
+    assert cache.solve(copy, value_iteration, tol=1e-8) is first
+    assert cache.hits["memory"] == 1 and cache.misses == 1
+    assert not first.V.flags.writeable
+    cache.solve(mdp, value_iteration, tol=1e-4)
+    policy = np.arange(25) % 3
+    cache.solve(mdp, evaluate_policy, policy=policy)
+    assert cache.solve(mdp, evaluate_policy, policy=(policy + 1) % 3) is not None
+    assert cache.misses == 4
+
+    # Neue Instanz: Treffer aus der Plattenstufe
+    again = SolutionCache(tmp_path).solve(mdp, value_iteration, tol=1e-8)
+    assert np.array_equal(again.V, first.V) and again.method == first.method
+
+    size = max(f.stat().st_size for f in tmp_path.iterdir())
+    small = SolutionCache(tmp_path, max_bytes=2 * size)
+    small.solve(mdp, policy_iteration)
+    assert small.disk_bytes <= 2 * size
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_solution_cache_defaults_follow_config_at_construction(tmp_path, monkeypatch):
+    from mdp_framework import config
+    from mdp_framework.solvers.cache import SolutionCache
+    monkeypatch.setattr(config, "CACHE_PATH", str(tmp_path / "cache"))
+    monkeypatch.setattr(config, "CACHE_MEMORY_ENTRIES", 3)
+    cache = SolutionCache()
+    assert cache.path == str(tmp_path / "cache") and cache.memory_entries == 3
+    memory_only = SolutionCache(disk=False)
+    memory_only.solve(random_discrete_mdp(5, 2, rng=0), value_iteration)
+    assert memory_only.path is None and not (tmp_path / "cache").exists()
+
+
+def test_incremental_solver_after_edits():
+    from mdp_framework.generators.structured_generator import grid_world_mdp
+    from mdp_framework.solvers.incremental import IncrementalSolver
+    for sparse in (True, False):
+        mdp = grid_world_mdp(20, 20, gamma=0.9, rng=0)
+        mdp = mdp.to_sparse() if sparse else mdp.to_dense()
+        mdp.sampling_table
+        solver = IncrementalSolver(mdp, tol=1e-8)
+        assert solver.solve().method == "incremental[full]"
+        full_backups = solver.n_backups
+        assert mdp.pop_dirty_rows().size == 0
+
+        mdp.set_reward(0, 1, -3.0)
+        mdp.set_transitions(210, 0, [0.5, 0.5], next_states=[211, 190])
+        assert mdp.pop_dirty_rows().tolist() == [1, 840]
+        mdp.mark_dirty([0, 210], [1, 0])
+        result = solver.solve()
+        assert result.method == "incremental" and result.converged
+        assert solver.n_backups < full_backups / 10
+        reference = value_iteration(mdp, tol=1e-10)
+        assert np.allclose(result.V, reference.V, atol=1e-6)
+        # Gleichstände zwischen Aktionen sind möglich, daher über Q vergleichen
+        assert np.allclose(reference.Q[np.arange(mdp.n_states), result.policy], reference.V, atol=1e-6)
+        for _ in range(10):
+            mdp.state = 210
+            assert mdp.step(0)[0] in (211, 190)
@@ -0,0 +1,45 @@
+# tests/test_startup.py
+
+import os
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Großzügige Obergrenzen (Sekunden) für einen kalten Start inkl. Interpreter
+IMPORT_BUDGET = 1.5
+CLI_BUDGET = 3.0
+
+
+def _run(args):
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable] + args, cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    assert proc.returncode == 0, proc.stderr
+    return proc.stdout, elapsed
+
+
+def _loaded_modules(statement):
+    code = f"import sys; {statement}; print(' '.join(sorted(sys.modules)))"
+    return set(_run(["-c", code])[0].split())
+
+
+def test_package_import_is_lazy_and_fast():
+    _, elapsed = _run(["-c", "import mdp_framework"])
+    assert elapsed < IMPORT_BUDGET
+    assert "numpy" not in _loaded_modules("import mdp_framework")
+    modules = _loaded_modules("import mdp_framework; mdp_framework.DiscreteMDP")
+    assert "mdp_framework.core.discrete" in modules and "mdp_framework.io.json_io" not in modules
+
+
+def test_heavy_dependencies_are_not_imported_eagerly():
+    modules = _loaded_modules("import mdp_framework.utils.visualization, mdp_framework.io.json_io, "
+                              "mdp_framework.solvers.dynamic_programming")
+    assert not {"matplotlib", "networkx", "scipy"} & modules
+
+
+def test_cli_cold_start_budget():
+    for script in ("convert_mdp.py", "generate_mdp.py"):
+        _, elapsed = _run([os.path.join("scripts", script), "--help"])
+        assert elapsed < CLI_BUDGET
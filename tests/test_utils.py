@@ -0,0 +1,311 @@
+# tests/test_utils.py
+
+import json
+import threading
+import numpy as np
+import pytest
+from mdp_framework.core.discrete import DiscreteMDP
+from mdp_framework.utils.sampling import (
+    CategoricalTable, sample_categorical, sample_discrete, get_rng, spawn_rngs
+)
+
+
+def test_categorical_table_respects_zero_probabilities():
+    probs = np.array([[0.0, 1.0, 0.0], [0.5, 0.0, 0.5]])
+    table = CategoricalTable.from_dense(probs)
+    draws = table.sample(np.repeat([0, 1], 500))
+    assert np.all(draws[:500] == 1)
+    assert set(np.unique(draws[500:])) <= {0, 2}
+    assert np.all(sample_categorical(probs[[0, 0]]) == 1)
+    # Gewichte werden anteilig gezogen, nur ein Vektor ohne Masse wird abgelehnt
+    draws = sample_discrete([1.0, 0.0, 3.0], size=2000, rng=0)
+    assert set(np.unique(draws)) == {0, 2} and 0.7 < np.mean(draws == 2) < 0.8
+    assert sample_discrete([0.0, 1.0], rng=0) == 1
+    with pytest.raises(ValueError):
+        sample_discrete([0.0, 0.0])
+
+
+def test_csr_table_cumulates_each_row_separately_and_memmap_is_sampled_lazily(tmp_path):
+    from mdp_framework.utils.sampling import DenseRowSampler
+
+    # Viele Zeilen davor dürfen die Genauigkeit einer kleinen Wahrscheinlichkeit nicht verschlechtern
+    lengths = np.array([1] * 100000 + [2])
+    indptr = np.concatenate([[0], np.cumsum(lengths)])
+    data = np.concatenate([np.ones(100000), [1e-12, 1.0 - 1e-12]])
+    table = CategoricalTable.from_csr(indptr, np.zeros(indptr[-1], dtype=np.int64), data)
+    assert table.cdf[-2] == 1e-12
+    assert table.totals[-1] == 1.0
+
+    P = np.memmap(tmp_path / "P.bin", dtype=np.float64, mode="w+", shape=(3, 2, 3))
+    P[...] = 0.0
+    P[:, :, 2] = 1.0
+    P[1, 0] = [0.5, 0.5, 0.0]
+    mdp = DiscreteMDP(3, 2, P, np.zeros((3, 2)), 0.9, copy=False, rng=0)
+    assert isinstance(mdp.sampling_table, DenseRowSampler)
+    draws = mdp.sampling_table.sample(np.array([[2, 2], [0, 5]]), rng=1)
+    assert draws.shape == (2, 2) and draws[1, 0] == 2 and draws[1, 1] == 2
+    assert set(np.unique(draws[0])) <= {0, 1}
+    assert mdp.sampling_table.sample_one(1, rng=1) == 2
+
+
+def test_discrete_mdp_rebuilds_sampling_table_on_new_P():
+    P = np.zeros((2, 1, 2))
+    P[:, 0, 0] = 1.0
+    mdp = DiscreteMDP(2, 1, P, np.zeros((2, 1)), 0.9)
+    assert mdp.step(0)[0] == 0
+    P_new = np.zeros((2, 1, 2))
+    P_new[:, 0, 1] = 1.0
+    mdp.P = P_new
+    assert mdp.step(0)[0] == 1
+    mdp.P[:, 0] = [1.0, 0.0]
+    mdp.invalidate_sampling_table()
+    assert mdp.step(0)[0] == 0
+    table = CategoricalTable.from_dense([[0.0, 1.0], [0.0, 1.0]])  # weicht bewusst von P ab
+    mdp.set_sampling_table(table)
+    assert mdp.sampling_table is table and mdp.step(0)[0] == 1
+    with pytest.raises(ValueError):
+        mdp.set_sampling_table(CategoricalTable.from_dense(np.ones((3, 2)) / 2))
+
+
+def test_rng_plumbing_is_reproducible_and_spawns_independent_streams():
+    from mdp_framework.config import set_global_seed
+    from mdp_framework.generators.discrete_generator import random_discrete_mdp
+    from mdp_framework.generators.continuous_generator import random_continuous_mdp
+
+    mdp_a = random_discrete_mdp(6, 2, rng=123)
+    mdp_b = random_discrete_mdp(6, 2, rng=123)
+    assert np.array_equal(mdp_a.P, mdp_b.P)
+    assert [mdp_a.step(1)[0] for _ in range(20)] == [mdp_b.step(1)[0] for _ in range(20)]
+
+    cont_a = random_continuous_mdp(3, 2, rng=np.random.default_rng(7))
+    cont_b = random_continuous_mdp(3, 2, rng=np.random.default_rng(7))
+    assert np.array_equal(cont_a.dynamics_func.A, cont_b.dynamics_func.A)
+    assert np.array_equal(cont_a.step(np.ones(2))[0], cont_b.step(np.ones(2))[0])
+
+    set_global_seed(5)
+    first = random_discrete_mdp(4, 2).P
+    set_global_seed(5)
+    assert np.array_equal(random_discrete_mdp(4, 2).P, first)
+
+    children = spawn_rngs(0, 2)
+    assert children[0].random() != children[1].random()
+    assert get_rng(children[0]) is children[0]
+
+
+def test_rollout_discrete_and_continuous():
+    from mdp_framework.generators.discrete_generator import random_discrete_mdp
+    from mdp_framework.generators.continuous_generator import random_continuous_mdp
+    from mdp_framework.utils.rollout import rollout, iter_rollouts
+
+    mdp = random_discrete_mdp(6, 3, rng=0)
+    policy = np.arange(6) % 3
+    traj = rollout(mdp, policy, horizon=5, n_episodes=10, batch_size=4)
+    assert traj.states.shape == (10, 5)
+    assert np.array_equal(traj.actions, policy[traj.states])
+    assert np.array_equal(traj.rewards, mdp.R[traj.states, traj.actions])
+    assert np.array_equal(traj.states[:, 1:], traj.next_states[:, :-1])
+    assert traj.dones[:, -1].all() and not traj.dones[:, :-1].any()
+
+    stochastic = np.zeros((6, 3))
+    stochastic[:, 2] = 1.0
+    assert np.all(rollout(mdp, stochastic, horizon=3, n_episodes=4).actions == 2)
+
+    cont = random_continuous_mdp(3, 2, rng=0)
+    batches = list(iter_rollouts(cont, lambda s: np.zeros((s.shape[0], 2)), horizon=4, n_episodes=5, batch_size=2))
+    assert [b.n_episodes for b in batches] == [2, 2, 1]
+    assert batches[0].states.shape == (2, 4, 3)
+    assert batches[0].actions.shape == (2, 4, 2)
+
+    for kwargs in ({"horizon": 0}, {"batch_size": 0}):
+        with pytest.raises(ValueError):
+            rollout(mdp, policy, **{"horizon": 3, "n_episodes": 4, **kwargs})
+        with pytest.raises(ValueError):
+            list(iter_rollouts(mdp, policy, **{"horizon": 3, "n_episodes": 4, **kwargs}))
+
+
+def test_shared_mdp_attach_and_parallel_monte_carlo():
+    from mdp_framework.core.shared import SharedDiscreteMDP
+    from mdp_framework.generators.discrete_generator import random_discrete_mdp
+    from mdp_framework.utils.monte_carlo import estimate_returns
+    mdp = random_discrete_mdp(20, 3, gamma=0.8, rng=0)
+    with SharedDiscreteMDP(mdp.to_sparse()) as shared:
+        attached = shared.handle.attach()
+        assert attached.is_sparse and not attached.R.flags.writeable
+        assert np.array_equal(attached.P.to_dense(), mdp.P)
+        del attached
+    policy = np.zeros(20, dtype=np.int64)
+    serial = estimate_returns(mdp, policy, horizon=30, n_episodes=600, batch_size=100, rng=3)
+    parallel = estimate_returns(mdp, policy, horizon=30, n_episodes=600, n_workers=2, batch_size=100, rng=3)
+    assert serial.n_episodes == parallel.n_episodes == 600
+    assert np.isclose(serial.mean, parallel.mean) and np.isclose(serial.std, parallel.std)
+    assert serial.ci[0] < serial.mean < serial.ci[1]
+
+
+def test_shared_mdp_workers_use_the_shared_sampling_table(monkeypatch):
+    from mdp_framework.core.shared import SharedDiscreteMDP
+    from mdp_framework.generators.discrete_generator import random_discrete_mdp
+    from mdp_framework.utils import monte_carlo
+    mdp = random_discrete_mdp(20, 3, gamma=0.8, rng=0)
+    for source in (mdp, mdp.to_sparse()):
+        with SharedDiscreteMDP(source) as shared:
+            # Der Worker darf die Tabelle nicht selbst bauen
+            def fail(*args, **kwargs):
+                raise AssertionError("Worker baut eine eigene CDF-Tabelle")
+            with monkeypatch.context() as m:
+                m.setattr(CategoricalTable, "from_dense", fail)
+                m.setattr(CategoricalTable, "from_csr", fail)
+                monte_carlo._init_worker(shared.handle)
+                table = monte_carlo._WORKER_MDP.sampling_table
+                assert not table.cdf.flags.writeable and np.array_equal(table.cdf, source.sampling_table.cdf)
+                n, mean, _ = monte_carlo._run_task((None, 10, 50, 50, 0))
+                assert n == 50 and np.isfinite(mean)
+            monte_carlo._WORKER_MDP = None
+            del table
+
+
+def test_instrumentation_counts_steps_and_io_and_restores_methods(tmp_path):
+    from mdp_framework.core.continuous import ContinuousMDP
+    from mdp_framework.generators.continuous_generator import random_continuous_mdp
+    from mdp_framework.generators.discrete_generator import random_discrete_mdp
+    from mdp_framework.io.pickle_io import save_mdp_to_pickle, load_mdp_from_pickle
+    from mdp_framework.utils import instrumentation
+    from mdp_framework.core.base import BaseMDP
+    original_step = DiscreteMDP.step
+    original_dynamics = ContinuousMDP.__dict__["dynamics_func"]
+    mdp_d = random_discrete_mdp(5, 2, rng=0)
+    mdp_c = random_continuous_mdp(2, 2, rng=0)
+    linear = mdp_c.dynamics_func
+    mdp_split = ContinuousMDP(2, 2, lambda s, a: linear(s, a), mdp_c.reward_func, 0.9, rng=0)
+    path = str(tmp_path / "mdp.pkl")
+    with instrumentation.instrumented(reset_metrics=True):
+        class CountingMDP(DiscreteMDP):
+            def step(self, action):
+                return super().step(action)
+
+        sub = CountingMDP(5, 2, mdp_d.P, mdp_d.R, 0.9, rng=0)
+        for _ in range(10):
+            mdp_d.step(0)
+            mdp_c.step(np.zeros(2))
+            mdp_split.step(np.zeros(2))
+            sub.step(1)
+        threads = [threading.Thread(target=lambda: [mdp_d.step(1) for _ in range(500)]) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        save_mdp_to_pickle(mdp_d, path)
+        load_mdp_from_pickle(path)
+    assert DiscreteMDP.step is original_step and ContinuousMDP.__dict__["dynamics_func"] is original_dynamics
+    assert "__init_subclass__" not in BaseMDP.__dict__
+    mdp_d.step(0)
+    snap = instrumentation.snapshot()
+    assert snap["counters"]["DiscreteMDP.step"] == 10 + 10 + 4 * 500
+    assert snap["counters"]["CountingMDP.step"] == 10
+    # Fusionierter Standardpfad: ein Timer für Dynamik und Reward zusammen
+    assert snap["counters"]["ContinuousMDP.dynamics_and_reward"] == 10
+    assert snap["counters"]["ContinuousMDP.dynamics_func"] == snap["counters"]["ContinuousMDP.reward_func"] == 10
+    assert sum(snap["timers"]["DiscreteMDP.step"]["hist_log2_ns"].values()) == 2020
+    assert snap["io"]["io.pickle.write"]["bytes"] == snap["io"]["io.pickle.read"]["bytes"] > 0
+    instrumentation.export_jsonl(str(tmp_path / "metrics.jsonl"), labels={"run": "test"})
+    with open(tmp_path / "metrics.jsonl") as f:
+        assert json.loads(f.readline())["labels"] == {"run": "test"}
+
+
+def test_evaluate_grid_batched_and_per_point_paths_agree():
+    from mdp_framework.generators.continuous_generator import random_continuous_mdp
+    from mdp_framework.utils.grid import state_grid, evaluate_grid
+    mdp = random_continuous_mdp(2, 2, rng=0)
+    X, Y = state_grid(7)
+    action = np.array([0.5, -0.5])
+    expected = np.array([[mdp.reward_func(np.array([x, y]), action) for x, y in zip(rx, ry)] for rx, ry in zip(X, Y)])
+    assert np.allclose(evaluate_grid(mdp.reward_func, X, Y, action, chunk_size=10), expected)
+    assert np.allclose(evaluate_grid(mdp.reward_func, X, Y, action, batched=False), expected)
+    # Ohne batched-Attribut wird zeilenweise ausgewertet, ohne die Funktion probeweise aufzurufen
+    calls = []
+
+    def first(s):
+        calls.append(np.shape(s))
+        return np.array([s[0]])
+    assert np.allclose(evaluate_grid(first, X, Y)[..., 0], X)
+    assert calls == [(2,)] * 49
+    # Quadratische Eingabe (2 Punkte x 2 Dimensionen) darf nicht als gebündelt gelten
+    X2, Y2 = state_grid(2)
+    assert np.allclose(evaluate_grid(first, X2, Y2)[..., 0], X2)
+    negated = lambda s: -0.1 * s
+    negated.batched = True
+    assert evaluate_grid(negated, X, Y).shape == (7, 7, 2)
+
+
+def test_top_k_edges_and_render_large_discrete_mdp(tmp_path):
+    from mdp_framework.generators.discrete_generator import random_discrete_mdp
+    from mdp_framework.generators.structured_generator import grid_world_mdp
+    from mdp_framework.utils.visualization import top_k_edges, render_discrete_mdp
+    mdp = random_discrete_mdp(12, 2, rng=0)
+    edges = sorted(zip(*[arr.tolist() for arr in top_k_edges(mdp, 3)]))
+    assert edges == sorted(zip(*[arr.tolist() for arr in top_k_edges(mdp.to_sparse(), 3)]))
+    expected = [(s, a, int(s2), mdp.P[s, a, s2]) for s in range(12) for a in range(2)
+                for s2 in np.argsort(mdp.P[s, a])[-3:]]
+    assert edges == sorted(expected)
+    big = grid_world_mdp(60, 60)
+    for name in ("grid.png", "grid.svg", "grid.graphml", "grid.dot"):
+        summary = render_discrete_mdp(big, str(tmp_path / name), k=2, max_states=50)
+        assert summary["n_nodes"] == 50 and summary["n_edges"] > 0
+        assert (tmp_path / name).stat().st_size > 0
+    summary = render_discrete_mdp(big, str(tmp_path / "sub.dot"), max_states=40, reduce="subsample", rng=0)
+    assert summary["n_nodes"] == 40
+
+
+def test_grid_discretizer_sample_and_analytic_paths():
+    from mdp_framework.core.continuous import ContinuousMDP
+    from mdp_framework.generators.continuous_generator import random_continuous_mdp
+    from mdp_framework.solvers.dynamic_programming import value_iteration
+    from mdp_framework.utils.discretizer import GridDiscretizer
+
+    mdp = random_continuous_mdp(2, 1, gamma=0.9, noise_std=0.2, rng=0)
+    mdp.dynamics_func.A = np.array([[0.6, 0.1], [-0.2, 0.5]])
+    mdp.dynamics_func.B = np.array([[0.3], [0.1]])
+    grid = GridDiscretizer.for_mdp(mdp, bins=8, action_bins=3)
+    assert (grid.n_states, grid.n_actions) == (64, 3)
+    centers = grid.cell_centers()
+    assert np.array_equal(grid.state_to_index(centers), np.arange(64))
+    assert grid.state_to_index([5.0, -5.0]) == 7 * 8
+
+    sampled = grid.discretize(mdp, n_samples=2000, method="sample", rng=1)
+    analytic = grid.discretize(mdp, n_samples=1, rng=1)
+    for dmdp in (sampled, analytic):
+        assert dmdp.is_sparse and dmdp.validate().ok
+    assert np.abs(sampled.P.to_dense() - analytic.P.to_dense()).sum(axis=2).max() < 0.15
+    assert np.allclose(sampled.R, analytic.R, atol=0.05)
+
+    policy = grid.continuous_policy(value_iteration(analytic).policy)
+    assert policy(np.zeros((5, 2))).shape == (5, 1)
+
+    # Analytisch nur für genau RandomLinearDynamics (auch hinter der Instrumentierung)
+    from mdp_framework.generators.continuous_generator import RandomLinearDynamics
+    from mdp_framework.utils import instrumentation
+    with instrumentation.instrumented():
+        assert mdp.dynamics_func.__wrapped__ is mdp._dynamics_func
+        assert np.array_equal(grid.discretize(mdp, n_samples=1, rng=1).P.data, analytic.P.data)
+
+    class ShiftedDynamics(RandomLinearDynamics):
+        def __call__(self, state, action):
+            return super().__call__(state, action) + 0.5
+
+    shifted = ShiftedDynamics(2, 1, noise_std=0.2, rng=0)
+    shifted.A, shifted.B = mdp.dynamics_func.A, mdp.dynamics_func.B
+    shifted_mdp = ContinuousMDP(2, 1, shifted, mdp.reward_func, 0.9, rng=0)
+    with pytest.raises(ValueError):
+        grid.discretize(shifted_mdp, n_samples=1, method="analytic")
+    assert not np.allclose(grid.discretize(shifted_mdp, n_samples=200, rng=1).P.to_dense(),
+                           sampled.P.to_dense(), atol=0.05)
+
+    # Beliebige (nicht gebündelte) Funktionen laufen über den Stichprobenpfad
+    plain = ContinuousMDP(2, 1, lambda s, a: 0.5 * s, lambda s, a: float(-s @ s), 0.9)
+    dmdp = grid.discretize(plain, n_samples=1)
+    assert np.allclose(dmdp.P.row_sums(), 1.0)
+    assert np.allclose(dmdp.R[:, 0], -(centers ** 2).sum(axis=1))
+    # Blockweise zusammengefasste Stichproben: Ergebnis unabhängig von chunk_size
+    full = grid.discretize(plain, n_samples=20, rng=2)
+    chunked = grid.discretize(plain, n_samples=20, rng=2, chunk_size=77)
+    assert np.array_equal(chunked.P.indptr, full.P.indptr) and np.allclose(chunked.P.data, full.P.data)
+    assert full.P.nnz < grid.n_states * grid.n_actions * 20